@@ -0,0 +1,121 @@
+"""
+Benchmark ekstraksi JSON dari completion LLM.
+
+Membandingkan implementasi lama `parse_json_response` (regex greedy DOTALL
+lalu dua substitusi regex sebelum `json.loads`) dengan `extract_json`
+(jalur cepat raw_decode + pemindai perbaikan satu kali jalan), baik dari
+sisi waktu per completion maupun jumlah completion yang berhasil diparsing.
+
+Korpus default (`benchmarks/data/llm_completions.jsonl`) berisi completion
+dengan bentuk yang biasa dihasilkan agent: JSON bersih, code fence, teks
+pembuka/penutup, trailing comma, output terpotong, dan sebagainya. Gunakan
+--from-cache untuk memakai completion asli yang tersimpan di koleksi
+`llm_cache` MongoDB.
+
+Jalankan dari direktori backend:
+    python -m benchmarks.json_extraction_benchmark --repeat 2000
+    python -m benchmarks.json_extraction_benchmark --from-cache 500
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from src.services.llm.json_extractor import extract_json, JSONExtractionError
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "data", "llm_completions.jsonl")
+
+
+def legacy_parse(response: str):
+    """Salinan logika `parse_json_response` sebelum extractor baru (tanpa print/cache)."""
+    try:
+        match = re.search(r'\{.*\}', response, re.DOTALL)
+        if match:
+            json_str = match.group(0)
+            json_str = re.sub(r',\s*}', '}', json_str)
+            json_str = re.sub(r',\s*]', ']', json_str)
+            return json.loads(json_str)
+    except json.JSONDecodeError:
+        pass
+    return None
+
+
+def new_parse(response: str):
+    try:
+        # Kemampuan perbaikan penuh, seperti yang dipakai agent dengan validasi skema
+        return extract_json(response, start_chars="{", allow_truncated=True)
+    except JSONExtractionError:
+        return None
+
+
+def _load_corpus(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _load_from_cache(limit: int) -> list:
+    from src.database import connect_to_mongo
+    docs = connect_to_mongo()["llm_cache"].find({}, {"_id": 0, "service_name": 1, "response": 1}).limit(limit)
+    return [{"service_name": doc.get("service_name", "LLM"), "shape": "recorded", "response": doc["response"]}
+            for doc in docs if isinstance(doc.get("response"), str)]
+
+
+def _time_per_call(parse, responses: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for response in responses:
+            parse(response)
+    return (time.perf_counter() - start) / (repeat * len(responses)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ekstraksi JSON completion LLM")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="File JSONL berisi field 'response'")
+    parser.add_argument("--from-cache", type=int, default=0, metavar="N",
+                        help="Pakai N completion yang tersimpan di koleksi llm_cache")
+    parser.add_argument("--repeat", type=int, default=1000, help="Jumlah pengulangan seluruh korpus")
+    args = parser.parse_args()
+
+    corpus = _load_from_cache(args.from_cache) if args.from_cache else _load_corpus(args.corpus)
+    responses = [entry["response"] for entry in corpus]
+    print(f"Corpus: {len(responses)} completions, {sum(map(len, responses)):,} chars")
+
+    print(f"\n{'shape':<24} {'service':<32} {'chars':>6}  {'legacy':>14}  {'extract_json':>14}")
+    per_shape_repeat = max(1, args.repeat // 10)
+    for entry in corpus:
+        response = entry["response"]
+        cells = []
+        for parse in (legacy_parse, new_parse):
+            status = "ok" if parse(response) is not None else "FAIL"
+            cells.append(f"{status:>4} {_time_per_call(parse, [response], per_shape_repeat):7.1f}us")
+        print(f"{entry['shape']:<24} {entry['service_name']:<32} {len(response):>6}  {cells[0]:>14}  {cells[1]:>14}")
+
+    # Completion tanpa cacat diselesaikan jalur cepat; sisanya lewat pemindai perbaikan
+    def _needs_repair(response):
+        repairs = []
+        try:
+            extract_json(response, start_chars="{", repairs=repairs, allow_truncated=True)
+        except JSONExtractionError:
+            return True
+        return bool(repairs)
+
+    groups = [("all", responses)]
+    groups.append(("well-formed", [r for r in responses if not _needs_repair(r)]))
+    groups.append(("needs repair", [r for r in responses if _needs_repair(r)]))
+
+    print()
+    for label, group in groups:
+        if not group:
+            continue
+        legacy_success = sum(legacy_parse(r) is not None for r in group)
+        new_success = sum(new_parse(r) is not None for r in group)
+        legacy_us = _time_per_call(legacy_parse, group, args.repeat)
+        new_us = _time_per_call(new_parse, group, args.repeat)
+        print(f"[{label}] {len(group)} completions")
+        print(f"  legacy regex   parsed={legacy_success}/{len(group)}  mean={legacy_us:8.1f} us/completion")
+        print(f"  extract_json   parsed={new_success}/{len(group)}  mean={new_us:8.1f} us/completion"
+              f"  ({legacy_us / new_us:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark connection pool LLMClient.
+
+Membandingkan latensi per panggilan antara `requests.post` biasa (koneksi
+baru setiap panggilan, termasuk TCP + TLS handshake) dengan transport pool
+keep-alive yang dipakai `llm_client`.
+
+Secara default benchmark mengirim HEAD ke endpoint OpenRouter sehingga tidak
+memakai token; gunakan --url untuk host lain.
+
+Jalankan dari direktori backend:
+    python -m benchmarks.llm_pool_benchmark --calls 20
+"""
+
+import argparse
+import statistics
+import time
+import requests
+from src.config import OPENROUTER_API_URL
+from src.services.llm.http_pool import PooledHTTPTransport
+
+
+def _measure(send, calls: int) -> list:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        send()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _summary(label: str, timings: list) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (f"{label:<18} mean={statistics.mean(timings):8.1f} ms  "
+            f"median={statistics.median(timings):8.1f} ms  p95={p95:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM HTTP connection pool")
+    parser.add_argument("--url", default=OPENROUTER_API_URL, help="URL target")
+    parser.add_argument("--calls", type=int, default=20, help="Jumlah panggilan per mode")
+    parser.add_argument("--timeout", type=float, default=10, help="Timeout per panggilan (detik)")
+    args = parser.parse_args()
+
+    transport = PooledHTTPTransport()
+
+    fresh = _measure(lambda: requests.head(args.url, timeout=args.timeout), args.calls)
+
+    transport.warm_up(args.url, timeout=args.timeout)
+    pooled = _measure(lambda: transport.request("HEAD", args.url, timeout=args.timeout), args.calls)
+    transport.close()
+
+    print(f"Target: {args.url} ({args.calls} calls per mode)")
+    print(_summary("fresh connection", fresh))
+    print(_summary("pooled keep-alive", pooled))
+    saved = statistics.median(fresh) - statistics.median(pooled)
+    print(f"Median latency saved per call: {saved:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark ranking profesi.
+
+Membandingkan implementasi lama `ProfessionSelector.select` (skor per baris
+lewat `df["vector"].apply`, `sort_values` penuh, lalu `iterrows`) dengan
+ranking di snapshot katalog, baik yang dihitung langsung (matriks vektor
+kontigu x mask profil, `argpartition`, dan konversi dict hanya untuk
+pemenang) maupun lookup tabel top-N yang dihitung saat katalog dimuat,
+pada katalog sintetis berukuran besar. Semua implementasi juga dicek
+menghasilkan skor top-N yang sama.
+
+Tidak membutuhkan MongoDB. Jalankan dari direktori backend:
+    python -m benchmarks.profession_ranking_benchmark --professions 100000
+    python -m benchmarks.profession_ranking_benchmark --professions 500000 --top-n 5 --repeat 3
+"""
+
+import argparse
+import random
+import statistics
+import time
+from src.models.profession import ProfessionCatalogSnapshot, RIASEC_INDEX_MAP
+
+PROFILES = ["R", "I", "A", "S", "E", "C", "RI", "AS", "EC", "SA", "RIA", "SEC", "IAS", "CER"]
+
+
+def synthetic_documents(count: int, seed: int = 42) -> list:
+    """Dokumen profesi dengan bentuk yang sama seperti koleksi `professions`."""
+    rng = random.Random(seed)
+    documents = []
+    for i in range(count):
+        vector = " ".join(f"{code}:{rng.random():.3f}" for code in RIASEC_INDEX_MAP)
+        documents.append({
+            "_id": i,
+            "reasoning_hc": f"Profession {i}",
+            "RIASEC Vector": vector,
+            "vector_explanation": f"Penjelasan profesi {i}"
+        })
+    return documents
+
+
+def legacy_select(df, user_profile: str, top_n: int) -> dict:
+    """Salinan logika `ProfessionSelector.select` lama (tanpa menulis ke DataFrame bersama)."""
+    top_codes = list(user_profile.upper())
+    top_indices = [RIASEC_INDEX_MAP[c] for c in top_codes if c in RIASEC_INDEX_MAP]
+
+    def sum_top_codes(vec):
+        return sum(vec[i] for i in top_indices) if len(vec) == 6 else 0
+
+    df = df.assign(score_profile=df["vector"].apply(sum_top_codes))
+    top_n = min(top_n, len(df))
+    top_df = df.sort_values("score_profile", ascending=False).head(top_n)
+    return {row["reasoning_hc"]: row.to_dict() for _, row in top_df.iterrows()}
+
+
+def _measure(rank, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        for profile in PROFILES:
+            start = time.perf_counter()
+            rank(profile)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _summary(label: str, timings: list) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (f"{label:<10} mean={statistics.mean(timings):9.2f} ms  "
+            f"median={statistics.median(timings):9.2f} ms  p95={p95:9.2f} ms")
+
+
+def _scores(ranked: dict) -> list:
+    return [round(float(row["score_profile"]), 9) for row in ranked.values()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--professions", type=int, default=100000, help="Ukuran katalog sintetis")
+    parser.add_argument("--top-n", type=int, default=5, help="Jumlah profesi yang dipilih per profil")
+    parser.add_argument("--repeat", type=int, default=5, help="Pengulangan per profil")
+    args = parser.parse_args()
+
+    documents = synthetic_documents(args.professions)
+    start = time.perf_counter()
+    snapshot = ProfessionCatalogSnapshot.from_documents(documents, "benchmark", top_n_depth=args.top_n)
+    print(f"Catalog: {len(snapshot)} professions, loaded in {time.perf_counter() - start:.2f} s "
+          f"(including top-{args.top_n} table), {snapshot.memory_bytes / 1024 / 1024:.1f} MiB")
+    # Tanpa tabel top-N: setiap rank dihitung langsung dari matriks
+    live = ProfessionCatalogSnapshot.from_documents(documents, "benchmark", top_n_depth=0)
+
+    mismatches = [profile for profile in PROFILES
+                  if not (_scores(legacy_select(snapshot.df, profile, args.top_n))
+                          == _scores(live.rank(profile, args.top_n))
+                          == _scores(snapshot.rank(profile, args.top_n)))]
+    print(f"Top-{args.top_n} scores identical for {len(PROFILES) - len(mismatches)}/{len(PROFILES)} profiles"
+          + (f" (mismatch: {', '.join(mismatches)})" if mismatches else ""))
+
+    legacy = _measure(lambda profile: legacy_select(snapshot.df, profile, args.top_n), args.repeat)
+    vectorized = _measure(lambda profile: live.rank(profile, args.top_n), args.repeat)
+    table = _measure(lambda profile: snapshot.rank(profile, args.top_n), args.repeat)
+    print(_summary("legacy", legacy))
+    print(_summary("numpy", vectorized))
+    print(_summary("table", table))
+    print(f"Speedup vs legacy (median): numpy {statistics.median(legacy) / statistics.median(vectorized):.1f}x, "
+          f"table {statistics.median(legacy) / statistics.median(table):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Stress test konkurensi ProfessionSelector.
+
+Satu selector (satu snapshot katalog) dipakai bersama oleh banyak thread
+yang memanggil `select` dengan profil dan `top_n` acak, termasuk `top_n`
+di luar kedalaman tabel top-N sehingga jalur ranking langsung ikut teruji.
+Setiap hasil dibandingkan dengan ranking yang dihitung serial sebelum
+thread dijalankan; skornya juga dicek sama dengan implementasi pandas lama.
+Thread sengaja mengubah dict hasil yang diterimanya untuk memastikan
+perubahan itu tidak bocor ke request lain.
+
+Tidak membutuhkan MongoDB. Keluar dengan kode 1 jika ada hasil yang salah.
+Jalankan dari direktori backend:
+    python -m benchmarks.profession_selector_stress --threads 32 --iterations 500
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.profession_ranking_benchmark import synthetic_documents, legacy_select
+from src.models.profession import ProfessionCatalogSnapshot, ProfessionSelector, RIASEC_INDEX_MAP
+
+
+def all_profiles():
+    """Semua kode yang bisa dihasilkan `determine_profile` (1-3 huruf berbeda, urutan berpengaruh), plus N/A."""
+    profiles = ["N/A"]
+    for length in range(1, 4):
+        profiles.extend("".join(letters) for letters in itertools.permutations(RIASEC_INDEX_MAP, length))
+    return profiles
+
+
+def _ranking(result: dict) -> list:
+    return [(name, round(row["score_profile"], 9)) for name, row in result.items()]
+
+
+def _worker(selector, expected: dict, top_ns: list, iterations: int, seed: int) -> list:
+    rng = random.Random(seed)
+    errors = []
+    for _ in range(iterations):
+        profile, top_n = rng.choice(list(expected)), rng.choice(top_ns)
+        result = selector.select(profile, top_n)
+        if _ranking(result) != expected[profile][:top_n]:
+            errors.append(f"{profile} top-{top_n}: {_ranking(result)[:3]}... != {expected[profile][:3]}...")
+        # Pemanggil boleh mengubah hasilnya tanpa mempengaruhi request lain
+        for row in result.values():
+            row["score_profile"] = -1.0
+            row["reasoning_hc"] = "mutated"
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--professions", type=int, default=20000, help="Ukuran katalog sintetis")
+    parser.add_argument("--threads", type=int, default=32, help="Jumlah thread yang memanggil select bersamaan")
+    parser.add_argument("--iterations", type=int, default=500, help="Panggilan select per thread")
+    parser.add_argument("--top-n-depth", type=int, default=10, help="Kedalaman tabel top-N snapshot")
+    args = parser.parse_args()
+
+    documents = synthetic_documents(args.professions)
+    snapshot = ProfessionCatalogSnapshot.from_documents(documents, "stress", top_n_depth=args.top_n_depth)
+    selector = ProfessionSelector(snapshot)
+    top_ns = [1, 3, 5, args.top_n_depth, args.top_n_depth + 15]
+    max_top_n = max(top_ns)
+
+    expected = {}
+    for profile in all_profiles():
+        expected[profile] = _ranking(selector.select(profile, max_top_n))
+        legacy_scores = [score for _, score in _ranking(legacy_select(snapshot.df, profile, max_top_n))]
+        if [score for _, score in expected[profile]] != legacy_scores:
+            print(f"FAIL: {profile} scores differ from the legacy pandas ranking")
+            sys.exit(1)
+    print(f"Reference rankings for {len(expected)} profiles computed serially "
+          f"({len(snapshot)} professions, top-N depth {args.top_n_depth}).")
+
+    # Semua thread mulai bersamaan agar panggilan benar-benar tumpang tindih
+    barrier = threading.Barrier(args.threads)
+
+    def run(seed):
+        barrier.wait()
+        return _worker(selector, expected, top_ns, args.iterations, seed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        errors = list(itertools.chain.from_iterable(executor.map(run, range(args.threads))))
+    elapsed = time.perf_counter() - start
+
+    calls = args.threads * args.iterations
+    print(f"{calls} concurrent select() calls on {args.threads} threads in {elapsed:.2f} s "
+          f"({calls / elapsed:.0f} calls/s), {len(errors)} wrong results.")
+    for error in errors[:10]:
+        print(f"  {error}")
+
+    # Snapshot bersama harus tetap utuh setelah semua thread selesai
+    intact = all(_ranking(selector.select(profile, max_top_n)) == ranking for profile, ranking in expected.items())
+    print(f"Shared snapshot intact after run: {intact}")
+    if errors or not intact:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from flask import Flask
 from flask_cors import CORS
 from flasgger import Swagger
-from .config import SECRET_KEY
+from .config import SECRET_KEY, LLM_WARMUP_ON_BOOT
 from .database import connect_to_mongo
 from .seed_db import seed_database
 import yaml
@@ -47,7 +47,12 @@ def create_app():
         except Exception as e:
             app.logger.error(f"Failed to initialize database connection or seeding: {e}")
 
-        from .web import register_blueprints
+        from .web import register_blueprints, register_request_deadline
         register_blueprints(app)
+        register_request_deadline(app)
+
+        if LLM_WARMUP_ON_BOOT:
+            from .services.llm.llm_client import llm_client
+            llm_client.warm_up()
 
     return app
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import json
 from dotenv import load_dotenv
 
 # Muat variabel dari file .env di root direktori
@@ -10,9 +11,143 @@ load_dotenv(dotenv_path=dotenv_path)
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
 OPENROUTER_API_URL = 'https://openrouter.ai/api/v1/chat/completions'
 
+# LLM Model Routing Configuration
+# LLM_ROUTING_FILE: file JSON yang memetakan service_name ke model/max_tokens/temperature/timeout
+# (beserta harga dan batas rate per model), dimuat ulang otomatis jika berubah (dicek setiap LLM_ROUTING_CHECK_INTERVAL detik)
+LLM_DEFAULT_MODEL = os.getenv('LLM_DEFAULT_MODEL', 'google/gemini-2.0-flash-001')
+LLM_DEFAULT_TIMEOUT = float(os.getenv('LLM_DEFAULT_TIMEOUT', '30'))
+LLM_ROUTING_FILE = os.getenv('LLM_ROUTING_FILE', os.path.join(os.path.dirname(__file__), 'data', 'llm_routing.json'))
+LLM_ROUTING_CHECK_INTERVAL = float(os.getenv('LLM_ROUTING_CHECK_INTERVAL', '5'))
+
+# LLM Structured Output Configuration
+# Jika aktif, agent yang outputnya JSON mengirim skema lewat response_format (mode json_schema).
+# Matikan untuk model/provider yang tidak mendukung structured output; validasi skema tetap berjalan
+# tetapi longgar (properti tambahan dan properti yang tidak dibaca pemanggil diterima).
+LLM_STRUCTURED_OUTPUT_ENABLED = os.getenv('LLM_STRUCTURED_OUTPUT_ENABLED', 'true').lower() == 'true'
+
+# LLM HTTP Connection Pool Configuration
+# LLM_POOL_CONNECTIONS: jumlah pool host yang disimpan (satu pool per host)
+# LLM_POOL_MAXSIZE: jumlah koneksi keep-alive maksimal per host
+# LLM_POOL_BLOCK: jika true, request menunggu koneksi kosong alih-alih membuka koneksi ekstra
+# LLM_KEEPALIVE_EXPIRY: detik idle sebelum koneksi di pool dianggap basi dan dibuang
+LLM_POOL_CONNECTIONS = int(os.getenv('LLM_POOL_CONNECTIONS', '4'))
+LLM_POOL_MAXSIZE = int(os.getenv('LLM_POOL_MAXSIZE', '16'))
+LLM_POOL_BLOCK = os.getenv('LLM_POOL_BLOCK', 'false').lower() == 'true'
+LLM_KEEPALIVE_EXPIRY = float(os.getenv('LLM_KEEPALIVE_EXPIRY', '60'))
+LLM_WARMUP_ON_BOOT = os.getenv('LLM_WARMUP_ON_BOOT', 'true').lower() == 'true'
+
+# LLM Response Cache Configuration
+# LLM_CACHE_SERVICES: daftar service_name (dipisah koma) yang memakai cache, '*' untuk semua
+# LLM_CACHE_EXCLUDE_SERVICES: service_name yang tidak pernah di-cache
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '1024'))
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', '604800'))
+LLM_CACHE_PERSISTENT = os.getenv('LLM_CACHE_PERSISTENT', 'true').lower() == 'true'
+LLM_CACHE_SERVICES = [s.strip() for s in os.getenv('LLM_CACHE_SERVICES', '*').split(',') if s.strip()]
+LLM_CACHE_EXCLUDE_SERVICES = [s.strip() for s in os.getenv('LLM_CACHE_EXCLUDE_SERVICES', 'Final Analyzer').split(',') if s.strip()]
+
+# LLM Request Coalescing: gabungkan prompt identik yang sedang in-flight menjadi satu request
+LLM_SINGLE_FLIGHT_ENABLED = os.getenv('LLM_SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+
+# LLM Resilience Configuration
+# LLM_RETRY_*: retry untuk 429/5xx dan kegagalan koneksi (exponential backoff + jitter, menghormati Retry-After)
+# LLM_BREAKER_*: circuit breaker per model; terbuka setelah N kegagalan beruntun, probe ulang setelah timeout
+LLM_RETRY_MAX = int(os.getenv('LLM_RETRY_MAX', '2'))
+LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', '0.5'))
+LLM_RETRY_MAX_DELAY = float(os.getenv('LLM_RETRY_MAX_DELAY', '8'))
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv('LLM_BREAKER_FAILURE_THRESHOLD', '5'))
+LLM_BREAKER_RECOVERY_TIMEOUT = float(os.getenv('LLM_BREAKER_RECOVERY_TIMEOUT', '30'))
+
+# LLM Rate Limit Configuration
+# Token bucket client-side per model (request/menit dan token/menit) dari `rate_limits` di LLM_ROUTING_FILE.
+# LLM_RATE_LIMIT_MAX_QUEUE: maksimal panggilan yang menunggu slot; selebihnya langsung ditolak
+# LLM_RATE_LIMIT_MAX_WAIT: waktu tunggu maksimum (detik) untuk panggilan tanpa deadline request yang lebih pendek
+LLM_RATE_LIMIT_ENABLED = os.getenv('LLM_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+LLM_RATE_LIMIT_MAX_QUEUE = int(os.getenv('LLM_RATE_LIMIT_MAX_QUEUE', '200'))
+LLM_RATE_LIMIT_MAX_WAIT = float(os.getenv('LLM_RATE_LIMIT_MAX_WAIT', '60'))
+
+# LLM Hedging Configuration (opsional, default nonaktif)
+# LLM_HEDGE_SERVICES: JSON per service_name, contoh:
+#   {"Final Analyzer": {"secondary_model": "openai/gpt-4o-mini", "percentile": 95, "min_delay": 4, "default_delay": 10}}
+LLM_HEDGE_SERVICES = json.loads(os.getenv('LLM_HEDGE_SERVICES', '{}'))
+LLM_HEDGE_DEFAULT_SECONDARY_MODEL = os.getenv('LLM_HEDGE_DEFAULT_SECONDARY_MODEL', 'openai/gpt-4o-mini')
+
+# Request Deadline Configuration
+# REQUEST_DEADLINE: anggaran waktu (detik) per request API, di bawah timeout nginx/frontend;
+#   timeout LLM dan MongoDB diturunkan dari sisa anggaran ini
+# REQUEST_DEADLINE_ENDPOINTS: JSON override per endpoint Flask, contoh: {"assessment.submit_assessment": 90}
+REQUEST_DEADLINE = float(os.getenv('REQUEST_DEADLINE', '55'))
+REQUEST_DEADLINE_ENDPOINTS = json.loads(os.getenv('REQUEST_DEADLINE_ENDPOINTS', '{}'))
+
+# Client Disconnect Configuration
+# CLIENT_DISCONNECT_WATCH: pantau koneksi klien selama route LLM berjalan; jika klien
+#   menutup tab, panggilan LLM upstream dibatalkan agar worker dan token tidak terbuang
+# CLIENT_DISCONNECT_ENDPOINTS: endpoint Flask yang dipantau, dipisah koma
+# CLIENT_DISCONNECT_POLL_INTERVAL: interval (detik) pengecekan socket klien
+CLIENT_DISCONNECT_WATCH = os.getenv('CLIENT_DISCONNECT_WATCH', 'true').lower() == 'true'
+CLIENT_DISCONNECT_ENDPOINTS = [s.strip() for s in os.getenv(
+    'CLIENT_DISCONNECT_ENDPOINTS',
+    'assessment.start_assessment,assessment.submit_assessment,'
+    'skill_roadmap.generate_roadmap,campus_activities.recommend_campus_activities,'
+    'dominant_type.explain_dominant_type,dominant_type.stream_dominant_type,'
+    'strengths_weaknesses.analyze_strengths_weaknesses,strengths_weaknesses.stream_strengths_weaknesses,'
+    'report.generate_report'
+).split(',') if s.strip()]
+CLIENT_DISCONNECT_POLL_INTERVAL = float(os.getenv('CLIENT_DISCONNECT_POLL_INTERVAL', '0.5'))
+
 # Flask Configuration
 SECRET_KEY = os.getenv('SECRET_KEY', 'default-secret-key-for-development')
 
 # MongoDB Configuration
 MONGO_URI = os.getenv('MONGO_URI')
-MONGO_DB_NAME = os.getenv('MONGO_DB_NAME')
\ No newline at end of file
+MONGO_DB_NAME = os.getenv('MONGO_DB_NAME')
+
+# Explanation Table Configuration
+# EXPLANATION_TABLE_REFRESH: interval (detik) memuat ulang tabel dari MongoDB
+EXPLANATION_TABLE_REFRESH = float(os.getenv('EXPLANATION_TABLE_REFRESH', '300'))
+EXPLANATION_PRECOMPUTE_CONCURRENCY = int(os.getenv('EXPLANATION_PRECOMPUTE_CONCURRENCY', '4'))
+
+# Profession Catalog Configuration
+# Katalog profesi dimuat sekali per worker dan dibagi lintas request.
+# PROFESSION_CATALOG_CHECK_INTERVAL: interval (detik) pengecekan stempel versi di `catalog_meta`
+# PROFESSION_CATALOG_CHANGE_STREAM: pakai change stream MongoDB (replica set) untuk invalidasi langsung
+# PROFESSION_TOP_N_TABLE_DEPTH: jumlah profesi teratas yang dihitung di muka untuk setiap kode profil
+PROFESSION_CATALOG_CHECK_INTERVAL = float(os.getenv('PROFESSION_CATALOG_CHECK_INTERVAL', '30'))
+PROFESSION_CATALOG_CHANGE_STREAM = os.getenv('PROFESSION_CATALOG_CHANGE_STREAM', 'true').lower() == 'true'
+PROFESSION_TOP_N_TABLE_DEPTH = int(os.getenv('PROFESSION_TOP_N_TABLE_DEPTH', '10'))
+
+# Assessment Prefetch Configuration
+# Pemilihan profesi dan pertanyaan IKIGAI dibuat di background setelah /api/riasec/submit.
+# ASSESSMENT_PREFETCH_TTL: lama (detik) hasil spekulatif disimpan untuk /api/assessment/start
+# ASSESSMENT_PREFETCH_DEADLINE: anggaran waktu (detik) satu job prefetch, seperti JOB_DEADLINE
+ASSESSMENT_PREFETCH_ENABLED = os.getenv('ASSESSMENT_PREFETCH_ENABLED', 'true').lower() == 'true'
+ASSESSMENT_PREFETCH_WORKERS = int(os.getenv('ASSESSMENT_PREFETCH_WORKERS', '4'))
+ASSESSMENT_PREFETCH_TTL = float(os.getenv('ASSESSMENT_PREFETCH_TTL', '600'))
+ASSESSMENT_PREFETCH_DEADLINE = float(os.getenv('ASSESSMENT_PREFETCH_DEADLINE', '120'))
+
+# Speculative RIASEC Explanation Configuration
+# Penjelasan RIASEC untuk semua kandidat profesi dijalankan bersamaan dengan analisis final
+# di /api/assessment/submit; hanya yang cocok dengan profesi teratas yang dipakai.
+ASSESSMENT_SPECULATIVE_EXPLANATION = os.getenv('ASSESSMENT_SPECULATIVE_EXPLANATION', 'true').lower() == 'true'
+ASSESSMENT_SPECULATIVE_WORKERS = int(os.getenv('ASSESSMENT_SPECULATIVE_WORKERS', '8'))
+
+# Full Report Configuration
+# REPORT_SECTION_WORKERS: jumlah bagian /api/report yang boleh berjalan bersamaan (4 bagian per request)
+REPORT_SECTION_WORKERS = int(os.getenv('REPORT_SECTION_WORKERS', '16'))
+# REPORT_PREFETCH_*: laporan dibuat di background saat asesmen selesai dan disimpan ke additional_data
+REPORT_PREFETCH_ENABLED = os.getenv('REPORT_PREFETCH_ENABLED', 'true').lower() == 'true'
+REPORT_PREFETCH_WORKERS = int(os.getenv('REPORT_PREFETCH_WORKERS', '2'))
+
+# Job Queue Configuration
+# Endpoint LLM berat (.../async) dijalankan di background; hasilnya dipoll lewat /api/jobs/<job_id>.
+# JOB_QUEUE_MAX_PENDING: batas job queued+running sebelum submit baru ditolak (503)
+# JOB_RESULT_TTL: lama (detik) status dan hasil job disimpan
+# JOB_LEASE: batas waktu (detik) job queued/running sebelum dianggap terhenti (proses mati/restart)
+JOB_QUEUE_WORKERS = int(os.getenv('JOB_QUEUE_WORKERS', '4'))
+JOB_QUEUE_MAX_PENDING = int(os.getenv('JOB_QUEUE_MAX_PENDING', '100'))
+JOB_RESULT_TTL = float(os.getenv('JOB_RESULT_TTL', '86400'))
+JOB_LEASE = float(os.getenv('JOB_LEASE', '600'))
+# JOB_DEADLINE: anggaran waktu (detik) satu job background, seperti REQUEST_DEADLINE untuk request
+JOB_DEADLINE = float(os.getenv('JOB_DEADLINE', '300'))
+# JOB_CANCEL_CHECK_INTERVAL: interval (detik) pemegang job mengecek permintaan batal dari worker lain
+JOB_CANCEL_CHECK_INTERVAL = float(os.getenv('JOB_CANCEL_CHECK_INTERVAL', '2'))
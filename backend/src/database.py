@@ -3,6 +3,7 @@ import time
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
 from .config import MONGO_URI, MONGO_DB_NAME
+from .services.request_deadline import mongo_budget
 import uuid
 from bson.objectid import ObjectId 
 
@@ -57,12 +58,13 @@ def validate_hash(user_hash):
     Memvalidasi apakah hash ada dan masih berstatus 'pending'.
     """
     try:
-        db = connect_to_mongo()
-        assessment = db.assessments.find_one({"hash": user_hash})
+        with mongo_budget():
+            db = connect_to_mongo()
+            assessment = db.assessments.find_one({"hash": user_hash})
         
-        if assessment and assessment.get("status") == "pending":
-            return True
-        return False
+            if assessment and assessment.get("status") == "pending":
+                return True
+            return False
     except Exception as e:
         print(f"Error validating hash: {e}")
         return False
@@ -72,48 +74,76 @@ def save_assessment_results(user_hash, result_data):
     Menyimpan hasil asesmen ke dokumen yang cocok dengan hash.
     """
     try:
-        db = connect_to_mongo()
-        db.assessments.update_one(
-            {"hash": user_hash},
-            {
-                "$set": {
-                    "results": result_data,
-                    "status": "completed",
-                    "completed_at": time.time()
+        with mongo_budget():
+            db = connect_to_mongo()
+            db.assessments.update_one(
+                {"hash": user_hash},
+                {
+                    "$set": {
+                        "results": result_data,
+                        "status": "completed",
+                        "completed_at": time.time()
+                    }
                 }
-            }
-        )
-        print(f"Assessment results saved for hash: {user_hash}")
+            )
+            print(f"Assessment results saved for hash: {user_hash}")
     except Exception as e:
         print(f"Failed to save assessment results: {e}")
 
-def save_assessment_additional_data(user_hash, additional_data):
+def save_assessment_additional_data(user_hash, additional_data, inputs=None):
     """
     Menyimpan data tambahan asesmen ke dokumen yang cocok dengan hash.
+    `inputs` (misalnya riasec_code dan target_jobs laporan) disimpan di sampingnya
+    agar data hanya dipakai ulang untuk input yang sama; tanpa `inputs`, input
+    lama dihapus.
     """
+    update = {
+        "$set": {
+            "additional_data": additional_data,
+            "additional_completed_at": time.time()
+        }
+    }
+    if inputs is not None:
+        update["$set"]["additional_data_inputs"] = inputs
+    else:
+        update["$unset"] = {"additional_data_inputs": ""}
     try:
-        db = connect_to_mongo()
-        db.assessments.update_one(
-            {"hash": user_hash},
-            {
-                "$set": {
-                    "additional_data": additional_data,
-                    "additional_completed_at": time.time()
-                }
-            }
-        )
-        print(f"Additional assessment data saved for hash: {user_hash}")
+        with mongo_budget():
+            db = connect_to_mongo()
+            db.assessments.update_one({"hash": user_hash}, update)
+            print(f"Additional assessment data saved for hash: {user_hash}")
     except Exception as e:
         print(f"Failed to save additional assessment data: {e}")
 
+def get_assessment_additional_data(user_hash, inputs=None):
+    """
+    Mengambil data tambahan asesmen (bagian laporan hasil) berdasarkan hash.
+    Jika `inputs` diberikan, data hanya dikembalikan bila disimpan dengan input yang sama.
+    """
+    try:
+        with mongo_budget():
+            db = connect_to_mongo()
+            assessment = db.assessments.find_one(
+                {"hash": user_hash}, {"additional_data": 1, "additional_data_inputs": 1}
+            )
+    except Exception as e:
+        print(f"Failed to retrieve additional assessment data: {e}")
+        return None
+    if not assessment:
+        return None
+    if inputs is not None and assessment.get("additional_data_inputs") != inputs:
+        return None
+    return assessment.get("additional_data")
+
 def get_assessment_by_hash(user_hash):
     """
     Mengambil hasil asesmen berdasarkan hash.
     """
     try:
-        db = connect_to_mongo()
-        assessment = db.assessments.find_one({"hash": user_hash})
-        return assessment.get("results") if assessment else None
+        with mongo_budget():
+            db = connect_to_mongo()
+            assessment = db.assessments.find_one({"hash": user_hash})
+            return assessment.get("results") if assessment else None
     except Exception as e:
         print(f"Failed to retrieve assessment data: {e}")
         return None
@@ -121,9 +151,10 @@ def get_assessment_by_hash(user_hash):
 def save_feedback(feedback_data):
     """Menyimpan data feedback ke dalam koleksi 'feedback'."""
     try:
-        db = connect_to_mongo()
-        feedback_collection = db.feedback
-        feedback_collection.insert_one(feedback_data)
-        print("Feedback data saved successfully.")
+        with mongo_budget():
+            db = connect_to_mongo()
+            feedback_collection = db.feedback
+            feedback_collection.insert_one(feedback_data)
+            print("Feedback data saved successfully.")
     except Exception as e:
         print(f"Failed to save feedback data: {e}")
\ No newline at end of file
@@ -1,53 +1,352 @@
+import itertools
+import os
+import sys
+import numpy as np
 import pandas as pd
 import re
+import threading
+import time
+from datetime import datetime
 from typing import Dict, Any
+from src.config import (
+    PROFESSION_CATALOG_CHECK_INTERVAL, PROFESSION_CATALOG_CHANGE_STREAM, PROFESSION_TOP_N_TABLE_DEPTH
+)
 from src.database import connect_to_mongo
+from src.services.request_deadline import mongo_budget
 
 RIASEC_INDEX_MAP = {'R': 0, 'I': 1, 'A': 2, 'S': 3, 'E': 4, 'C': 5}
 
+# `RiasecTest.determine_profile` menghasilkan kode 1 sampai 3 huruf berbeda
+PROFILE_MAX_LETTERS = 3
+
+# Dokumen stempel versi katalog di koleksi `catalog_meta`
+CATALOG_META_COLLECTION = "catalog_meta"
+CATALOG_META_ID = "professions"
+
+
+def bump_catalog_version(db):
+    """
+    Menaikkan stempel versi katalog profesi. Harus dipanggil setiap kali
+    koleksi `professions` diubah agar semua worker memuat ulang snapshot-nya.
+    """
+    db[CATALOG_META_COLLECTION].update_one(
+        {"_id": CATALOG_META_ID},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+def catalog_version(db) -> str:
+    """
+    Versi katalog saat ini: stempel di `catalog_meta`, atau jika belum ada,
+    jumlah dokumen + `_id` terakhir (hanya mendeteksi insert/delete).
+    """
+    with mongo_budget("mongo:catalog_version"):
+        meta = db[CATALOG_META_COLLECTION].find_one({"_id": CATALOG_META_ID}, {"version": 1})
+        if meta is not None:
+            return f"v{meta['version']}"
+        last = db.professions.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        return f"n{db.professions.estimated_document_count()}:{last['_id'] if last else '-'}"
+
+
+def profile_mask(user_profile: str) -> tuple:
+    """Jumlah kemunculan tiap huruf RIASEC di profil; ranking hanya bergantung pada mask ini."""
+    mask = [0] * len(RIASEC_INDEX_MAP)
+    for code in user_profile.upper():
+        if code in RIASEC_INDEX_MAP:
+            mask[RIASEC_INDEX_MAP[code]] += 1
+    return tuple(mask)
+
+
+def reachable_masks(max_letters: int = PROFILE_MAX_LETTERS):
+    """Mask untuk semua kode profil yang mungkin (urutan huruf tidak mempengaruhi skor)."""
+    for length in range(1, max_letters + 1):
+        for letters in itertools.combinations(RIASEC_INDEX_MAP, length):
+            yield profile_mask("".join(letters))
+
+
+def parse_vector(vec_str):
+    vals = []
+    for k in ['R', 'I', 'A', 'S', 'E', 'C']:
+        v_str = re.search(f"{k}:([\d\.]+)", vec_str)
+        vals.append(float(v_str.group(1)) if v_str else 0.0)
+    return vals
+
+
+class ProfessionCatalogSnapshot:
+    """
+    Snapshot katalog profesi yang sudah diparse, dibagi oleh semua request di worker ini.
+    Snapshot tidak pernah diubah setelah dibuat (katalog baru = snapshot baru),
+    jadi pemakai tidak boleh memodifikasi `df` secara in-place.
+
+    Top-N untuk setiap kode profil yang mungkin dihitung sekali saat snapshot
+    dibuat, sehingga `rank` untuk profil biasa hanya berupa lookup dict.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: str, top_n_depth: int = 10):
+        self.df = df
+        self.version = version
+        self.loaded_at = datetime.utcnow()
+        # Baris sebagai dict (dibuat sekali) dan index reasoning_hc -> baris pertama,
+        # pengganti filter DataFrame + to_dict per lookup
+        self._records = df.to_dict('records')
+        self._index = {}
+        for record in self._records:
+            self._index.setdefault(record["reasoning_hc"], record)
+        # Matriks vektor RIASEC (n x 6) yang kontigu untuk skoring dengan satu perkalian matriks
+        self.vectors = np.array(df["vector"].tolist(), dtype=np.float64).reshape(len(df), len(RIASEC_INDEX_MAP))
+        self.vectors.setflags(write=False)
+        # mask profil -> (posisi pemenang terurut, skornya), sedalam `top_n_depth`
+        self._top_n = {mask: self._top_positions(mask, top_n_depth) for mask in reachable_masks()}
+        self.top_n_depth = top_n_depth
+        # Nilai di dict baris adalah objek yang sama dengan isi DataFrame; yang dihitung hanya dict-nya
+        self.memory_bytes = (int(df.memory_usage(deep=True).sum()) + self.vectors.nbytes
+                             + sum(sys.getsizeof(record) for record in self._records) + sys.getsizeof(self._index)
+                             + sum(positions.nbytes + scores.nbytes for positions, scores in self._top_n.values()))
+
+    @classmethod
+    def from_documents(cls, documents: list, version: str, top_n_depth: int = 10):
+        if not documents:
+            print("WARNING: Professions collection is empty. Please ensure database seeding is completed.")
+            raise ValueError("Database collection 'professions' is empty. Please run database seeding first.")
+
+        df = pd.DataFrame(documents)
+        if '_id' in df.columns:
+            df.drop('_id', axis=1, inplace=True)
+
+        df = df.dropna(subset=["RIASEC Vector"])
+        # Tuple agar vektor di hasil select tidak bisa mengubah snapshot bersama
+        df["vector"] = df["RIASEC Vector"].apply(lambda vec_str: tuple(parse_vector(vec_str)))
+        df["reasoning_hc"] = df["reasoning_hc"].astype(str)
+        return cls(df.reset_index(drop=True), version, top_n_depth)
+
+    def __len__(self):
+        return len(self.df)
+
+    def get(self, name: str):
+        """
+        Data satu profesi berdasarkan kolom 'reasoning_hc'.
+
+        Returns:
+            dict | None: Salinan baris profesi, atau None jika tidak ditemukan
+        """
+        record = self._index.get(name)
+        return dict(record) if record is not None else None
+
+    def _top_positions(self, mask: tuple, top_n: int):
+        """
+        Posisi top-N profesi untuk satu mask profil beserta skornya, terurut.
+        Skor dihitung dengan satu perkalian matriks-mask dan kandidat dipilih
+        dengan argpartition.
+        """
+        scores = self.vectors @ np.array(mask, dtype=np.float64)
+        top_n = max(0, min(top_n, len(scores)))
+        if top_n == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        if top_n < len(scores):
+            # Skor ke-N sebagai ambang; semua profesi yang seri di ambang ikut kandidat
+            # agar pilihan di antara yang seri tidak bergantung pada argpartition
+            threshold = scores[np.argpartition(-scores, top_n - 1)[top_n - 1]]
+            winners = np.flatnonzero(scores >= threshold)
+        else:
+            winners = np.arange(len(scores))
+        # Urutkan pemenang: skor tertinggi dulu, seri diurutkan sesuai urutan katalog
+        winners = winners[np.lexsort((winners, -scores[winners]))][:top_n]
+        top_scores = scores[winners]
+        winners.setflags(write=False)
+        top_scores.setflags(write=False)
+        return winners, top_scores
+
+    def rank(self, user_profile: str, top_n: int) -> Dict[str, Any]:
+        """
+        Top-N profesi untuk profil: skor = jumlah komponen vektor pada huruf profil.
+        Kode profil yang mungkin diambil dari tabel hasil perhitungan saat snapshot
+        dibuat; profil lain atau `top_n` yang lebih dalam dihitung langsung.
+        Hanya baris pemenang yang disalin ke dict hasil.
+        """
+        mask = profile_mask(user_profile)
+        entry = self._top_n.get(mask)
+        if entry is not None and (top_n <= self.top_n_depth or len(entry[0]) == len(self.df)):
+            positions, scores = entry[0][:top_n], entry[1][:top_n]
+        else:
+            positions, scores = self._top_positions(mask, top_n)
+
+        ranked = {}
+        for position, score in zip(positions, scores):
+            record = dict(self._records[position], score_profile=float(score))
+            ranked[record["reasoning_hc"]] = record
+        return ranked
+
+
+class ProfessionCatalog:
+    """
+    Katalog profesi yang dimuat sekali per worker dan dibagi lintas request.
+    Snapshot dimuat ulang saat stempel versi di `catalog_meta` berubah
+    (dicek paling sering setiap `check_interval` detik), atau langsung saat
+    change stream MongoDB melaporkan perubahan jika tersedia (replica set).
+    """
+
+    def __init__(self, check_interval: float = 30, use_change_stream: bool = True, top_n_depth: int = 10):
+        self.check_interval = check_interval
+        self.top_n_depth = top_n_depth
+        self.use_change_stream = use_change_stream
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._dirty = False
+        self._source = "version_stamp"
+        self._watcher = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._stats = {"loads": 0, "checks": 0, "invalidations": 0, "load_errors": 0}
+
+    def _record(self, outcome: str):
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def snapshot(self) -> ProfessionCatalogSnapshot:
+        """
+        Snapshot katalog saat ini. Hanya request pertama di worker yang menunggu
+        pemuatan; saat memuat ulang, request lain tetap memakai snapshot lama.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or self._dirty:
+            return self._load()
+        if self._source != "change_stream" and time.monotonic() - self._checked_at > self.check_interval:
+            with self._lock:
+                needs_check = time.monotonic() - self._checked_at > self.check_interval
+                if needs_check:
+                    # Tandai lebih dulu agar thread lain tidak ikut mengecek versi
+                    self._checked_at = time.monotonic()
+            if needs_check:
+                self._check_version()
+        return self._snapshot
+
+    def _check_version(self):
+        snapshot = self._snapshot
+        self._record("checks")
+        try:
+            version = catalog_version(connect_to_mongo())
+        except Exception as e:
+            print(f"Failed to check profession catalog version: {e}")
+            return
+        if snapshot is not None and version != snapshot.version:
+            self.invalidate()
+            self._load()
+
+    def _load(self) -> ProfessionCatalogSnapshot:
+        previous = self._snapshot
+        # Tanpa snapshot sama sekali, tunggu pemuatan; jika ada, jangan blokir request lain
+        if not self._load_lock.acquire(blocking=previous is None):
+            return previous
+        try:
+            if self._snapshot is not None and not self._dirty:
+                # Sudah dimuat oleh thread lain selagi menunggu lock
+                return self._snapshot
+            self._dirty = False
+            try:
+                db = connect_to_mongo()
+                # Versi dibaca sebelum data: perubahan selama pemuatan terdeteksi di pengecekan berikutnya
+                version = catalog_version(db)
+                with mongo_budget("mongo:professions"):
+                    documents = list(db.professions.find({}))
+                snapshot = ProfessionCatalogSnapshot.from_documents(documents, version, self.top_n_depth)
+            except Exception as e:
+                self._record("load_errors")
+                print(f"Error loading profession catalog: {e}")
+                if previous is None:
+                    raise
+                return previous
+            finally:
+                self._checked_at = time.monotonic()
+
+            self._snapshot = snapshot
+            self._record("loads")
+            print(f"Profession catalog loaded: {len(snapshot)} professions, version {snapshot.version}, "
+                  f"{snapshot.memory_bytes / 1024 / 1024:.1f} MiB (pid {os.getpid()}).")
+        finally:
+            self._load_lock.release()
+        self._start_watcher()
+        return snapshot
+
+    def invalidate(self):
+        """Menandai snapshot basi; request berikutnya memuat ulang katalog."""
+        self._dirty = True
+        self._record("invalidations")
+
+    def _start_watcher(self):
+        if not self.use_change_stream:
+            return
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch, name="profession-catalog-watcher", daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        try:
+            with connect_to_mongo().professions.watch() as stream:
+                self._source = "change_stream"
+                print("Profession catalog: watching change stream.")
+                # Perubahan antara pemuatan pertama dan terbukanya stream
+                self._check_version()
+                for _ in stream:
+                    self.invalidate()
+        except Exception as e:
+            # MongoDB standalone tidak mendukung change stream
+            print(f"Profession catalog change stream unavailable ({e}), using version stamp polling.")
+        finally:
+            self._source = "version_stamp"
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(
+            pid=os.getpid(),
+            source=self._source,
+            version=snapshot.version if snapshot else None,
+            loaded_at=snapshot.loaded_at.isoformat() + "Z" if snapshot else None,
+            professions=len(snapshot) if snapshot else 0,
+            top_n_profiles=len(snapshot._top_n) if snapshot else 0,
+            memory_bytes=snapshot.memory_bytes if snapshot else 0
+        )
+        return stats
+
+
+# Singleton instance untuk digunakan di seluruh aplikasi
+profession_catalog = ProfessionCatalog(
+    check_interval=PROFESSION_CATALOG_CHECK_INTERVAL,
+    use_change_stream=PROFESSION_CATALOG_CHANGE_STREAM,
+    top_n_depth=PROFESSION_TOP_N_TABLE_DEPTH
+)
+
+
 class ProfessionSelector:
     """
     Mengelola semua logika yang terkait dengan data profesi,
-    termasuk memuat dari database dan memilih berdasarkan profil.
+    termasuk memilih berdasarkan profil. Data diambil dari snapshot
+    katalog bersama, jadi membuat selector per request tidak memuat ulang database.
+
+    Aman dipakai bersama oleh banyak thread: `select` dan `get` hanya membaca
+    snapshot; skor dan hasilnya dibuat di buffer milik pemanggil.
     """
-    def __init__(self):
+    def __init__(self, snapshot: ProfessionCatalogSnapshot = None):
         try:
-            db = connect_to_mongo()
-            professions_collection = db.professions
-            cursor = professions_collection.find({})
-            data_list = list(cursor)
-
-            if not data_list:
-                print("WARNING: Professions collection is empty. Please ensure database seeding is completed.")
-                raise ValueError("Database collection 'professions' is empty. Please run database seeding first.")
-
-            self.df = pd.DataFrame(data_list)
-            if '_id' in self.df.columns:
-                self.df.drop('_id', axis=1, inplace=True)
-
-            self.df = self.df.dropna(subset=["RIASEC Vector"])
-            self.df["vector"] = self.df["RIASEC Vector"].apply(self.parse_vector)
-            self.df["reasoning_hc"] = self.df["reasoning_hc"].astype(str)
+            self.snapshot = snapshot or profession_catalog.snapshot()
         except Exception as e:
             print(f"Error initializing ProfessionSelector: {e}")
             raise
 
-    @staticmethod
-    def parse_vector(vec_str):
-        vals = []
-        for k in ['R', 'I', 'A', 'S', 'E', 'C']:
-            v_str = re.search(f"{k}:([\d\.]+)", vec_str)
-            vals.append(float(v_str.group(1)) if v_str else 0.0)
-        return vals
+    @property
+    def df(self) -> pd.DataFrame:
+        return self.snapshot.df
+
+    parse_vector = staticmethod(parse_vector)
+
+    def get(self, name: str):
+        """Data satu profesi berdasarkan 'reasoning_hc', atau None jika tidak ditemukan."""
+        return self.snapshot.get(name)
 
     def select(self, user_profile: str, top_n: int = 3) -> Dict[str, Any]:
-        top_codes = list(user_profile.upper())
-        top_indices = [RIASEC_INDEX_MAP[c] for c in top_codes if c in RIASEC_INDEX_MAP]
-        
-        def sum_top_codes(vec):
-            return sum(vec[i] for i in top_indices) if len(vec) == 6 else 0
-            
-        self.df["score_profile"] = self.df["vector"].apply(sum_top_codes)
-        top_n = min(top_n, len(self.df))
-        top_df = self.df.sort_values("score_profile", ascending=False).head(top_n)
-        return {row["reasoning_hc"]: row.to_dict() for _, row in top_df.iterrows()}
\ No newline at end of file
+        """Top-N profesi untuk profil; dict hasilnya milik pemanggil dan boleh diubah."""
+        return self.snapshot.rank(user_profile, top_n)
@@ -1,4 +1,5 @@
 from src.database import connect_to_mongo
+from src.services.request_deadline import mongo_budget
 
 class RiasecTest:
     """
@@ -28,9 +29,10 @@ class RiasecTest:
     def load_questions():
         """Mengambil pertanyaan dari koleksi MongoDB."""
         try:
-            db = connect_to_mongo()
-            questions_collection = db.riasec_questions
-            questions_data = list(questions_collection.find({}, {'_id': 0}))
+            with mongo_budget("mongo:riasec_questions"):
+                db = connect_to_mongo()
+                questions_collection = db.riasec_questions
+                questions_data = list(questions_collection.find({}, {'_id': 0}))
 
             if not questions_data:
                 print("Warning: No questions found in the database.")
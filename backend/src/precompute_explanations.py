@@ -0,0 +1,98 @@
+# src/precompute_explanations.py
+
+"""
+Job pre-generation untuk tabel penjelasan RIASEC.
+
+Mengisi koleksi `explanation_table` dengan output agent dominant type dan
+strengths & weaknesses untuk semua kode RIASEC berurutan (panjang 1-6).
+Entri yang hash prompt-nya masih sama dilewati, sehingga menjalankan ulang
+job setelah prompt berubah hanya meregenerasi entri yang basi.
+
+Jalankan dari direktori backend:
+    python -m src.precompute_explanations --concurrency 8
+    python -m src.precompute_explanations --kinds dominant_type --max-length 3 --force
+"""
+
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.config import EXPLANATION_PRECOMPUTE_CONCURRENCY
+from src.services.explanation_table import (
+    EXPLANATION_KINDS, all_codes, explanation_table
+)
+from src.services.llm import llm_priority
+
+
+def _is_error(output: str) -> bool:
+    try:
+        parsed = json.loads(output)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(parsed, dict) and "error" in parsed
+
+
+def _generate(kind: str, code: str):
+    _, generate = EXPLANATION_KINDS[kind]
+    # Jalur batch: jika dijalankan di proses server, request pengguna tetap didahulukan
+    with llm_priority("batch"):
+        return kind, code, generate(code)
+
+
+def precompute_explanations(kinds=None, max_length: int = 6, concurrency: int = 4, force: bool = False):
+    """
+    Mengisi tabel penjelasan dengan concurrency terbatas.
+
+    Args:
+        kinds (list): Jenis agent yang diproses (default: semua)
+        max_length (int): Panjang kode RIASEC maksimal
+        concurrency (int): Jumlah panggilan LLM yang berjalan bersamaan
+        force (bool): Regenerasi semua entri walaupun versi prompt-nya masih sama
+
+    Returns:
+        dict: Ringkasan jumlah entri yang dibuat, dilewati, dan gagal
+    """
+    kinds = kinds or list(EXPLANATION_KINDS)
+    explanation_table.reload()
+
+    pending = []
+    skipped = 0
+    for kind in kinds:
+        for code in all_codes(max_length):
+            if not force and explanation_table.is_current(kind, code):
+                skipped += 1
+            else:
+                pending.append((kind, code))
+
+    print(f"Pre-generating {len(pending)} entries ({skipped} up to date) with concurrency={concurrency}...")
+    generated = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(_generate, kind, code) for kind, code in pending]
+        for future in as_completed(futures):
+            try:
+                kind, code, output = future.result()
+                if _is_error(output):
+                    raise ValueError(output)
+                if not explanation_table.store(kind, code, output):
+                    raise RuntimeError(f"Failed to store {kind}:{code}")
+                generated += 1
+            except Exception as e:
+                failed += 1
+                print(f"Failed to pre-generate entry: {e}")
+            done = generated + failed
+            if done % 50 == 0:
+                print(f"Progress: {done}/{len(pending)}")
+
+    summary = {"generated": generated, "skipped": skipped, "failed": failed}
+    print(f"Pre-generation complete: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate the RIASEC explanation lookup table")
+    parser.add_argument("--kinds", nargs="+", choices=list(EXPLANATION_KINDS), help="Jenis agent yang diproses")
+    parser.add_argument("--max-length", type=int, default=6, help="Panjang kode RIASEC maksimal (1-6)")
+    parser.add_argument("--concurrency", type=int, default=EXPLANATION_PRECOMPUTE_CONCURRENCY,
+                        help="Jumlah panggilan LLM bersamaan")
+    parser.add_argument("--force", action="store_true", help="Regenerasi semua entri")
+    args = parser.parse_args()
+    precompute_explanations(args.kinds, args.max_length, args.concurrency, args.force)
@@ -3,6 +3,7 @@
 import os
 import pandas as pd
 import json
+from src.models.profession import bump_catalog_version
 
 def _init_professions(db):
     """Menginisialisasi koleksi profesi dari file Excel jika kosong."""
@@ -24,6 +25,8 @@ def _init_professions(db):
             df.dropna(subset=["RIASEC Vector"], inplace=True)
             data_to_insert = df.to_dict(orient='records')
             professions_collection.insert_many(data_to_insert)
+            # Worker yang sudah memuat katalog akan memuat ulang snapshot-nya
+            bump_catalog_version(db)
             print(f"Successfully inserted {len(data_to_insert)} documents into 'professions' collection.")
         except FileNotFoundError:
             print(f"ERROR: Data file not found at {data_path}")
@@ -52,6 +55,22 @@ def _init_riasec_questions(db):
     else:
         print("RIASEC questions collection already contains data. Skipping seed.")
 
+def _init_llm_cache(db):
+    """Memastikan TTL index koleksi cache LLM ada agar entri kedaluwarsa terhapus otomatis."""
+    try:
+        db.llm_cache.create_index("expires_at", expireAfterSeconds=0)
+        print("LLM cache TTL index is ready.")
+    except Exception as e:
+        print(f"An error occurred while creating LLM cache index: {e}")
+
+def _init_jobs(db):
+    """Memastikan TTL index koleksi job background ada agar status job lama terhapus otomatis."""
+    try:
+        db.jobs.create_index("expires_at", expireAfterSeconds=0)
+        print("Jobs TTL index is ready.")
+    except Exception as e:
+        print(f"An error occurred while creating jobs index: {e}")
+
 def seed_database(db):
     """
     Fungsi utama untuk menjalankan semua proses seeding yang diperlukan.
@@ -59,4 +78,6 @@ def seed_database(db):
     print("--- Running Database Seeder ---")
     _init_professions(db)
     _init_riasec_questions(db)
+    _init_llm_cache(db)
+    _init_jobs(db)
     print("--- Seeding Complete ---")
\ No newline at end of file
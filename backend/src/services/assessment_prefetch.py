@@ -0,0 +1,169 @@
+"""
+Assessment Prefetch Service
+Menjalankan pemilihan profesi dan pembuatan pertanyaan IKIGAI secara
+spekulatif di background segera setelah profil RIASEC dihitung
+(`/api/riasec/submit`), sehingga `/api/assessment/start` cukup mengambil
+hasil yang sudah siap atau menunggu job yang sedang berjalan.
+
+Hasil hanya bergantung pada kode profil, sehingga job dikunci per profil:
+pengguna dengan profil sama berbagi satu job.
+
+Job berjalan di jalur LLM "background" dengan deadline sendiri. Begitu
+request menunggunya, jalurnya dinaikkan ke "interactive"; request hanya
+menunggu sampai deadline-nya sendiri habis. Job yang belum sempat mulai
+(worker penuh) dibatalkan dan dikerjakan langsung oleh request.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.config import (
+    ASSESSMENT_PREFETCH_ENABLED, ASSESSMENT_PREFETCH_WORKERS, ASSESSMENT_PREFETCH_TTL, ASSESSMENT_PREFETCH_DEADLINE
+)
+from src.models.profession import ProfessionSelector
+from src.services.llm import generate_assessment_statements, llm_priority, LanePriority
+from src.services.request_deadline import on_request_cancel, check_cancelled, remaining_timeout, deadline_scope
+
+
+def prepare_assessment(profile: str) -> dict:
+    """
+    Memilih 5 kandidat profesi untuk profil lalu membuat pertanyaan IKIGAI.
+
+    Returns:
+        dict: {"profession_names": [...], "statements": {...}}
+    """
+    selector = ProfessionSelector()
+    top_professions = selector.select(profile, top_n=5)
+    professions_for_prompt = {
+        name: {
+            "role": data.get("role"),
+            "role_description": data.get("role_description"),
+            "core_skills": data.get("core_skills")
+        }
+        for name, data in top_professions.items()
+    }
+    statements = generate_assessment_statements(professions_for_prompt)
+    return {"profession_names": list(top_professions.keys()), "statements": statements}
+
+
+def _prefetch_job(profile: str, priority: LanePriority, budget: float) -> dict:
+    # Job spekulatif: panggilan LLM-nya mengalah ke route interaktif saat kuota provider sempit,
+    # sampai ada request yang menunggu hasilnya (lihat AssessmentPrefetcher.get)
+    with deadline_scope(budget, "prefetch:assessment"), llm_priority(priority):
+        return prepare_assessment(profile)
+
+
+def _is_valid(result: dict) -> bool:
+    statements = result.get("statements")
+    return bool(statements) and not statements.get("error") and "ikigai_questions" in statements
+
+
+class AssessmentPrefetcher:
+    """Job background per profil dengan worker terbatas dan masa berlaku hasil."""
+
+    def __init__(self, max_workers: int = 4, ttl: float = 600, enabled: bool = True, deadline: float = 120):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assessment-prefetch")
+        self._jobs = {}  # profile -> (waktu mulai, Future, LanePriority)
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "ready": 0, "waited": 0, "inline": 0, "failed": 0}
+
+    def _record(self, outcome: str):
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def _expire(self, now: float):
+        expired = [profile for profile, (started_at, _, _) in self._jobs.items() if now - started_at > self.ttl]
+        for profile in expired:
+            del self._jobs[profile]
+
+    def start(self, profile: str):
+        """Memulai job spekulatif untuk profil (tidak memblokir). Job yang masih berlaku tidak diulang."""
+        if not self.enabled or not profile:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if profile in self._jobs:
+                return
+            priority = LanePriority("background")
+            future = self._executor.submit(_prefetch_job, profile, priority, self.deadline)
+            self._jobs[profile] = (now, future, priority)
+            self._stats["started"] += 1
+
+    def get(self, profile: str) -> dict:
+        """
+        Mengambil hasil untuk profil: langsung jika sudah siap, menunggu jika
+        job sedang berjalan, atau menjalankan inline jika belum ada job (atau
+        job-nya belum sempat mulai). Hasil gagal tidak disimpan, sehingga
+        permintaan berikutnya mencoba lagi.
+
+        Raises:
+            DeadlineExceeded: jika deadline request habis sebelum job selesai
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            job = self._jobs.get(profile)
+        if job is not None and job[1].cancel():
+            # Semua worker sibuk dan job belum mulai: kerjakan di jalur interaktif request ini
+            self._discard(profile, job[1], failed=False)
+            job = None
+        if job is None:
+            self._record("inline")
+            return prepare_assessment(profile)
+
+        _, future, priority = job
+        self._record("ready" if future.done() else "waited")
+        # Ada request yang menunggu: job tidak lagi boleh mengalah ke route interaktif lain
+        priority.promote("interactive")
+        self._wait(future)
+        try:
+            result = future.result()
+        except Exception:
+            self._discard(profile, future)
+            raise
+        if not _is_valid(result):
+            self._discard(profile, future)
+        return result
+
+    @staticmethod
+    def _wait(future):
+        """
+        Menunggu job selesai, paling lama sampai deadline request; berhenti lebih
+        awal jika request dibatalkan (klien pergi). Job-nya sendiri tetap berjalan
+        karena hasilnya dipakai bersama per profil.
+        """
+        if future.done():
+            return
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+        with on_request_cancel(done.set, "assessment_prefetch"):
+            # remaining_timeout melempar DeadlineExceeded begitu sisa anggaran request habis
+            while not done.wait(remaining_timeout(None, "assessment_prefetch")):
+                pass
+        check_cancelled("assessment_prefetch")
+
+    def _discard(self, profile: str, future, failed: bool = True):
+        with self._lock:
+            if profile in self._jobs and self._jobs[profile][1] is future:
+                del self._jobs[profile]
+            if failed:
+                self._stats["failed"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = sum(1 for _, future, _ in self._jobs.values() if not future.done())
+            stats["cached"] = len(self._jobs) - stats["in_flight"]
+        return stats
+
+
+# Singleton instance untuk digunakan di seluruh aplikasi
+assessment_prefetcher = AssessmentPrefetcher(
+    max_workers=ASSESSMENT_PREFETCH_WORKERS,
+    ttl=ASSESSMENT_PREFETCH_TTL,
+    enabled=ASSESSMENT_PREFETCH_ENABLED,
+    deadline=ASSESSMENT_PREFETCH_DEADLINE
+)
@@ -0,0 +1,187 @@
+"""
+Explanation Table Service
+Tabel lookup hasil pre-generation untuk agent yang outputnya hanya bergantung
+pada kode RIASEC (dominant type explainer dan strengths & weaknesses analyzer).
+
+Setiap entri menyimpan hash prompt yang dipakai saat generasi. Ketika prompt
+agent berubah, hash-nya ikut berubah sehingga entri lama otomatis dianggap
+basi dan route kembali memakai generasi live sampai tabel diregenerasi
+(lihat `src/precompute_explanations.py`).
+"""
+
+import hashlib
+import itertools
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from src.database import connect_to_mongo
+from src.config import EXPLANATION_TABLE_REFRESH
+from src.services.request_deadline import mongo_budget
+from src.services.llm.dominant_type_explainer import (
+    build_dominant_type_prompt, generate_dominant_type_explanation
+)
+from src.services.llm.strengths_weaknesses_analyzer import (
+    build_strengths_weaknesses_prompt, generate_strengths_weaknesses_analysis
+)
+
+RIASEC_LETTERS = "RIASEC"
+
+# kind -> (pembuat prompt, generator live)
+EXPLANATION_KINDS = {
+    "dominant_type": (build_dominant_type_prompt, generate_dominant_type_explanation),
+    "strengths_weaknesses": (build_strengths_weaknesses_prompt, generate_strengths_weaknesses_analysis),
+}
+
+
+@lru_cache(maxsize=None)
+def prompt_hash(kind: str, code: str) -> str:
+    """Versi entri tabel: hash dari prompt yang saat ini dipakai agent untuk kode tersebut."""
+    build_prompt, _ = EXPLANATION_KINDS[kind]
+    return hashlib.sha256(build_prompt(code).encode("utf-8")).hexdigest()[:16]
+
+
+def all_codes(max_length: int = 6):
+    """Semua kode RIASEC berurutan (tanpa huruf berulang) dengan panjang 1 sampai `max_length`."""
+    for length in range(1, max_length + 1):
+        for letters in itertools.permutations(RIASEC_LETTERS, length):
+            yield "".join(letters)
+
+
+class ExplanationTable:
+    """
+    Cache in-process dari koleksi `explanation_table` di MongoDB.
+    Seluruh tabel dimuat ke dict dan dimuat ulang setiap `refresh_interval` detik
+    di thread background, sehingga lookup di jalur request hanya berupa akses dict.
+    """
+
+    def __init__(self, collection_name: str = "explanation_table", refresh_interval: float = 300):
+        self.collection_name = collection_name
+        self.refresh_interval = refresh_interval
+        self._entries = {}  # (kind, code) -> (prompt_hash, output)
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0}
+
+    def _collection(self):
+        return connect_to_mongo()[self.collection_name]
+
+    def reload(self) -> bool:
+        """
+        Memuat ulang seluruh tabel dari MongoDB. Jika gagal, tabel yang terakhir
+        dimuat tetap dipakai.
+
+        Returns:
+            bool: True jika tabel berhasil dimuat
+        """
+        try:
+            with mongo_budget("mongo:explanation_table"):
+                entries = {
+                    (doc["kind"], doc["code"]): (doc["prompt_hash"], doc["output"])
+                    for doc in self._collection().find(
+                        {}, {"_id": 0, "kind": 1, "code": 1, "prompt_hash": 1, "output": 1}
+                    )
+                }
+        except Exception as e:
+            print(f"Failed to load explanation table, keeping {len(self._entries)} loaded entries: {e}")
+            return False
+        finally:
+            # Tetap set waktu muat agar kegagalan tidak diulang di setiap request
+            self._loaded_at = time.monotonic()
+        with self._lock:
+            self._entries = entries
+        print(f"Explanation table loaded: {len(entries)} entries.")
+        return True
+
+    def _ensure_fresh(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at <= self.refresh_interval:
+            return
+        with self._lock:
+            first_load = self._loaded_at is None
+            needs_reload = first_load or time.monotonic() - self._loaded_at > self.refresh_interval
+            if needs_reload:
+                # Tandai lebih dulu agar thread lain tidak ikut memuat ulang
+                self._loaded_at = time.monotonic()
+        if not needs_reload:
+            return
+        if first_load:
+            # Belum ada tabel sama sekali: dimuat di request ini, dibatasi sisa anggaran request
+            self.reload()
+        else:
+            # Refresh berkala tidak menahan request: tabel lama dipakai sampai yang baru siap
+            threading.Thread(target=self.reload, name="explanation-table-reload", daemon=True).start()
+
+    def _record(self, outcome: str):
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def lookup(self, kind: str, code: str):
+        """
+        Mengambil output yang sudah dipregenerate.
+
+        Returns:
+            str | None: Output agent, atau None jika tidak ada / versi prompt sudah berubah
+        """
+        self._ensure_fresh()
+        entry = self._entries.get((kind, code))
+        if entry is None:
+            self._record("misses")
+            return None
+        stored_hash, output = entry
+        if stored_hash != prompt_hash(kind, code):
+            self._record("stale")
+            return None
+        self._record("hits")
+        return output
+
+    def is_current(self, kind: str, code: str) -> bool:
+        """True jika entri ada dan dibuat dengan versi prompt yang sedang dipakai."""
+        entry = self._entries.get((kind, code))
+        return entry is not None and entry[0] == prompt_hash(kind, code)
+
+    def store(self, kind: str, code: str, output: str) -> bool:
+        """
+        Menyimpan satu entri ke MongoDB dan ke cache in-process.
+
+        Returns:
+            bool: False jika penyimpanan ke MongoDB gagal (entri tidak disimpan)
+        """
+        current_hash = prompt_hash(kind, code)
+        try:
+            with mongo_budget("mongo:explanation_table"):
+                self._collection().replace_one(
+                    {"_id": f"{kind}:{code}"},
+                    {
+                        "_id": f"{kind}:{code}",
+                        "kind": kind,
+                        "code": code,
+                        "prompt_hash": current_hash,
+                        "output": output,
+                        "generated_at": datetime.utcnow()
+                    },
+                    upsert=True
+                )
+        except Exception as e:
+            print(f"Failed to store explanation table entry {kind}:{code}: {e}")
+            return False
+        with self._lock:
+            self._entries[(kind, code)] = (current_hash, output)
+        return True
+
+    def get_or_generate(self, kind: str, code: str) -> str:
+        """Mengembalikan output dari tabel, atau menjalankan generator live jika miss."""
+        output = self.lookup(kind, code)
+        if output is not None:
+            return output
+        _, generate = EXPLANATION_KINDS[kind]
+        return generate(code)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats
+
+
+# Singleton instance untuk digunakan di seluruh aplikasi
+explanation_table = ExplanationTable(refresh_interval=EXPLANATION_TABLE_REFRESH)
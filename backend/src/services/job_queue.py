@@ -0,0 +1,349 @@
+"""
+Job Queue Service
+Antrian job in-process untuk endpoint yang didominasi panggilan LLM
+(`/api/assessment/submit`, `/api/skill-roadmap`, `/api/campus-activities`).
+Request `.../async` hanya memvalidasi input lalu langsung mengembalikan
+`job_id`; pekerjaan dijalankan oleh worker pool terbatas dan klien mem-poll
+`/api/jobs/<job_id>` untuk status dan hasilnya.
+
+Status job disimpan di memori proses dan koleksi `jobs` MongoDB (kedaluwarsa
+lewat TTL index), sehingga hasil tetap bisa diambil oleh worker lain atau
+setelah proses di-restart. Job yang masih queued/running di proses yang mati
+dikenali dari lease yang habis dan dilaporkan gagal agar klien mengirim ulang.
+
+Klien yang tidak lagi membutuhkan hasilnya (misalnya menutup tab) dapat
+membatalkan job: job yang masih antri tidak dijalankan, dan panggilan LLM
+job yang sedang berjalan diputus lewat deadline-nya. Jika job dijalankan
+worker lain, permintaan batal disimpan sebagai `cancel_requested` di
+MongoDB dan worker pemegang job membatalkannya pada pengecekan berikutnya.
+
+Setiap job menyimpan `owner` (token pengirim); route hanya menampilkan
+atau membatalkan job milik pengirimnya.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from src.config import (
+    JOB_QUEUE_WORKERS, JOB_QUEUE_MAX_PENDING, JOB_RESULT_TTL, JOB_LEASE, JOB_DEADLINE, JOB_CANCEL_CHECK_INTERVAL
+)
+from src.services.request_deadline import deadline_scope, mongo_budget, is_deadline_error
+from src.database import connect_to_mongo
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobQueueFull(Exception):
+    """Dilempar saat jumlah job queued+running sudah mencapai batas."""
+
+
+class JobQueue:
+    """Worker pool terbatas dengan status job yang dipersistenkan ke MongoDB."""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 100, result_ttl: float = 86400,
+                 lease: float = 600, deadline: float = 300, collection_name: str = "jobs",
+                 persistent_retry_after: float = 60, cancel_check_interval: float = 2):
+        self.max_pending = max_pending
+        self.deadline = deadline
+        self.cancel_check_interval = cancel_check_interval
+        self.result_ttl = result_ttl
+        self.lease = lease
+        self.collection_name = collection_name
+        self.persistent_retry_after = persistent_retry_after
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self._handlers = {}  # kind -> (handler, on_complete)
+        self._jobs = {}      # job_id -> dokumen job milik proses ini
+        self._running = {}   # job_id -> Deadline job yang sedang berjalan
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._persistent_disabled_until = 0.0
+        self._cancel_watcher = None
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "interrupted": 0,
+                       "cancelled": 0}
+
+    def register(self, kind: str, handler, on_complete=None):
+        """
+        Mendaftarkan handler untuk satu jenis job.
+
+        Args:
+            kind (str): Nama jenis job, misalnya "skill_roadmap"
+            handler (callable): handler(**params) -> (payload dict, kode HTTP)
+            on_complete (callable): Opsional, on_complete(job) dipanggil di konteks
+                request saat klien mengambil job yang sudah selesai (misalnya untuk
+                mengisi session)
+        """
+        self._handlers[kind] = (handler, on_complete)
+
+    def _collection(self):
+        """Mengembalikan koleksi Mongo, atau None jika sedang tidak tersedia."""
+        if time.monotonic() < self._persistent_disabled_until:
+            return None
+        try:
+            return connect_to_mongo()[self.collection_name]
+        except Exception as e:
+            self._disable_persistent(e)
+            return None
+
+    def _disable_persistent(self, error: Exception):
+        # Hindari menunggu timeout Mongo di setiap request saat database sedang down
+        print(f"Job queue: persistent store unavailable ({error}), retrying in {self.persistent_retry_after:.0f}s")
+        self._persistent_disabled_until = time.monotonic() + self.persistent_retry_after
+
+    def _handle_persistent_error(self, error: Exception):
+        # Anggaran request/job yang habis bukan tanda database down: cukup lewati penyimpanan
+        if is_deadline_error(error):
+            print(f"Job queue: skipped persistent store ({error})")
+            return
+        self._disable_persistent(error)
+
+    def _save(self, job: dict):
+        collection = self._collection()
+        if collection is not None:
+            # $set (bukan replace) agar `cancel_requested` dari worker lain tidak tertimpa
+            fields = {key: value for key, value in job.items() if key != "_id"}
+            try:
+                with mongo_budget("mongo:jobs"):
+                    collection.update_one({"_id": job["_id"]}, {"$set": fields}, upsert=True)
+            except Exception as e:
+                self._handle_persistent_error(e)
+
+    def _update(self, job_id: str, expect: str = None, **fields) -> dict:
+        """Memperbarui job; jika `expect` diberikan, hanya saat statusnya masih `expect` (None jika tidak)."""
+        with self._lock:
+            job = self._jobs[job_id]
+            if expect is not None and job["status"] != expect:
+                return None
+            job.update(fields, updated_at=datetime.utcnow())
+            snapshot = dict(job)
+        self._save(snapshot)
+        return snapshot
+
+    def _expire(self, now: datetime):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["expires_at"] <= now and job["status"] not in ACTIVE_STATUSES]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, kind: str, owner: str = None, **params) -> dict:
+        """
+        Memasukkan job ke antrian tanpa menunggu hasilnya. Parameter harus
+        sudah berisi semua data yang dibutuhkan (misalnya isi session),
+        karena handler berjalan di luar konteks request.
+
+        Args:
+            kind (str): Jenis job yang sudah didaftarkan lewat `register`
+            owner (str): Token pengirim; hanya pemegang token ini yang boleh melihat/membatalkan job
+            **params: Argumen handler
+
+        Returns:
+            dict: Dokumen job dengan status "queued"
+
+        Raises:
+            JobQueueFull: jika antrian penuh
+        """
+        if kind not in self._handlers:
+            raise KeyError(f"Unknown job kind: {kind}")
+        now = datetime.utcnow()
+        job = {
+            "_id": uuid.uuid4().hex,
+            "kind": kind,
+            "owner": owner,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+            "lease_expires_at": now + timedelta(seconds=self.lease),
+            "expires_at": now + timedelta(seconds=self.result_ttl)
+        }
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise JobQueueFull(f"Job queue is full ({self._pending} pending)")
+            self._expire(now)
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._jobs[job["_id"]] = job
+            snapshot = dict(job)
+        self._save(snapshot)
+        self._executor.submit(self._run, job["_id"], kind, params)
+        self._start_cancel_watcher()
+        return snapshot
+
+    def _run(self, job_id: str, kind: str, params: dict):
+        handler, _ = self._handlers[kind]
+        try:
+            # Anggaran waktu job berlaku untuk semua panggilan LLM/MongoDB di dalam handler;
+            # `cancel` membatalkan deadline ini sehingga panggilan yang berjalan ikut diputus
+            with deadline_scope(self.deadline, f"job:{kind}") as deadline:
+                deadline.cancellable = True
+                with self._lock:
+                    self._running[job_id] = deadline
+                now = datetime.utcnow()
+                started = self._update(job_id, expect="queued", status="running", started_at=now,
+                                       lease_expires_at=now + timedelta(seconds=self.lease))
+                if started is None:
+                    # Dibatalkan selagi masih antri
+                    return
+                try:
+                    payload, http_status = handler(**params)
+                except Exception as e:
+                    print(f"Job {job_id} ({kind}) failed: {e}")
+                    payload, http_status = {"error": "Internal server error occurred"}, 500
+
+            status = "completed" if http_status < 400 else "failed"
+            now = datetime.utcnow()
+            finished = self._update(job_id, expect="running", status=status, result=payload, http_status=http_status,
+                                    finished_at=now, expires_at=now + timedelta(seconds=self.result_ttl))
+            if finished is not None:
+                with self._lock:
+                    self._stats[status] += 1
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+                self._pending -= 1
+
+    def cancel(self, job_id: str) -> dict:
+        """
+        Membatalkan job. Job yang masih antri tidak akan dijalankan; job yang
+        sedang berjalan dibatalkan lewat deadline-nya (panggilan LLM diputus).
+        Job milik proses lain ditandai `cancel_requested` dan dibatalkan oleh
+        pemegangnya (lihat `_watch_cancellations`). Job yang sudah selesai tidak diubah.
+
+        Returns:
+            dict | None: Dokumen job terbaru, atau None jika job tidak ditemukan
+                atau job proses lain sudah tidak aktif
+        """
+        with self._lock:
+            local = job_id in self._jobs
+        if not local:
+            return self._request_cancel(job_id)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] not in ACTIVE_STATUSES:
+                return dict(job)
+            now = datetime.utcnow()
+            job.update(status="cancelled", updated_at=now, finished_at=now,
+                       expires_at=now + timedelta(seconds=self.result_ttl))
+            self._stats["cancelled"] += 1
+            snapshot = dict(job)
+            deadline = self._running.get(job_id)
+        self._save(snapshot)
+        if deadline is not None:
+            deadline.cancel("job_cancelled")
+        return snapshot
+
+    def _request_cancel(self, job_id: str) -> dict:
+        """Menandai job aktif milik proses lain agar dibatalkan oleh pemegang lease-nya."""
+        collection = self._collection()
+        if collection is None:
+            return None
+        try:
+            with mongo_budget("mongo:jobs"):
+                return collection.find_one_and_update(
+                    {"_id": job_id, "status": {"$in": list(ACTIVE_STATUSES)},
+                     "expires_at": {"$gt": datetime.utcnow()}},
+                    {"$set": {"cancel_requested": True}},
+                    return_document=ReturnDocument.AFTER
+                )
+        except Exception as e:
+            self._handle_persistent_error(e)
+            return None
+
+    def _start_cancel_watcher(self):
+        with self._lock:
+            if self._cancel_watcher is not None:
+                return
+            self._cancel_watcher = threading.Thread(
+                target=self._watch_cancellations, name="job-cancel-watcher", daemon=True
+            )
+            self._cancel_watcher.start()
+
+    def _watch_cancellations(self):
+        """Membatalkan job proses ini yang diminta batal lewat worker lain (`cancel_requested`)."""
+        while True:
+            time.sleep(self.cancel_check_interval)
+            with self._lock:
+                active = [job_id for job_id, job in self._jobs.items() if job["status"] in ACTIVE_STATUSES]
+            collection = self._collection() if active else None
+            if collection is None:
+                continue
+            try:
+                requested = [doc["_id"] for doc in collection.find(
+                    {"_id": {"$in": active}, "cancel_requested": True}, {"_id": 1}
+                )]
+            except Exception as e:
+                self._handle_persistent_error(e)
+                continue
+            for job_id in requested:
+                print(f"Job {job_id}: cancellation requested by another worker")
+                self.cancel(job_id)
+
+    def get(self, job_id: str) -> dict:
+        """
+        Mengambil dokumen job dari memori, lalu dari MongoDB (job milik proses
+        lain atau sebelum restart).
+
+        Returns:
+            dict | None: Dokumen job, atau None jika tidak ditemukan/kedaluwarsa
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+
+        collection = self._collection()
+        if collection is None:
+            return None
+        try:
+            with mongo_budget("mongo:jobs"):
+                job = collection.find_one({"_id": job_id, "expires_at": {"$gt": datetime.utcnow()}})
+        except Exception as e:
+            self._handle_persistent_error(e)
+            return None
+        if job is None:
+            return None
+
+        if job["status"] in ACTIVE_STATUSES and job["lease_expires_at"] < datetime.utcnow():
+            # Proses pemilik job berhenti sebelum selesai (restart/crash)
+            job.update(status="failed", http_status=500,
+                       result={"error": "Job terhenti sebelum selesai. Silakan kirim ulang."})
+            with self._lock:
+                self._stats["interrupted"] += 1
+            try:
+                with mongo_budget("mongo:jobs"):
+                    collection.update_one(
+                        {"_id": job_id, "status": {"$in": list(ACTIVE_STATUSES)}},
+                        {"$set": {"status": "failed", "http_status": 500, "result": job["result"]}}
+                    )
+            except Exception as e:
+                self._handle_persistent_error(e)
+        return job
+
+    def on_complete(self, job: dict):
+        """Menjalankan hook on_complete jenis job (di konteks request) jika job selesai."""
+        handler = self._handlers.get(job["kind"])
+        if handler and handler[1] and job["status"] == "completed":
+            handler[1](job)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+            stats["running"] = sum(1 for job in self._jobs.values() if job["status"] == "running")
+        return stats
+
+
+# Singleton instance untuk digunakan di seluruh aplikasi
+job_queue = JobQueue(
+    max_workers=JOB_QUEUE_WORKERS,
+    max_pending=JOB_QUEUE_MAX_PENDING,
+    result_ttl=JOB_RESULT_TTL,
+    lease=JOB_LEASE,
+    deadline=JOB_DEADLINE,
+    cancel_check_interval=JOB_CANCEL_CHECK_INTERVAL
+)
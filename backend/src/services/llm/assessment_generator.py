@@ -6,18 +6,21 @@ berdasarkan data profesi yang diberikan.
 
 import json
 from .llm_client import llm_client
+from .structured_output import assessment_questions_schema
 
 
 def generate_assessment_statements(professions_data: dict):
     """Membuat pertanyaan asesmen IKIGAI berdasarkan data profesi."""
+    # Satu opsi per kandidat profesi; katalog bisa mengembalikan kurang dari 5 profesi
+    option_count = max(1, len(professions_data))
     
     prompt = f"""
     Anda adalah seorang Career Counselor berpengalaman yang merancang tes IKIGAI.
-    Berdasarkan 5 kandidat profesi berikut yang relevan dengan hasil tes RIASEC pengguna:
+    Berdasarkan {option_count} kandidat profesi berikut yang relevan dengan hasil tes RIASEC pengguna:
     {json.dumps(professions_data, indent=2)}
 
     Tugas Anda adalah membuat 4 pertanyaan untuk Tes IKIGAI yang akan membantu pengguna merefleksikan karier mereka.
-    Setiap pertanyaan harus memiliki 5 opsi jawaban yang terinspirasi dari 5 profesi di atas.
+    Setiap pertanyaan harus memiliki {option_count} opsi jawaban yang terinspirasi dari {option_count} profesi di atas.
 
     **Struktur Output JSON yang Diharapkan:**
     - Buat sebuah JSON object dengan satu kunci utama: "ikigai_questions".
@@ -25,30 +28,30 @@ def generate_assessment_statements(professions_data: dict):
     - Setiap objek pertanyaan harus memiliki tiga kunci:
       1. `dimension`: Nama dimensi IKIGAI ("Love", "Good At", "Needs", "Profession").
       2. `instruction`: Teks instruksi untuk pengguna sesuai dengan panduan.
-      3. `options`: Sebuah array berisi 5 string yang menjadi pilihan jawaban. Setiap pilihan harus secara implisit merepresentasikan salah satu dari 5 profesi yang diberikan.
+      3. `options`: Sebuah array berisi {option_count} string yang menjadi pilihan jawaban. Setiap pilihan harus secara implisit merepresentasikan salah satu dari {option_count} profesi yang diberikan.
 
     **Panduan untuk Setiap Dimensi:**
 
     1.  **Dimensi "Love" (Apa yang Disukai):**
         -   `instruction`: "Di antara aktivitas berikut, pilih satu atau dua yang paling Anda sukai, paling menarik bagi Anda, dan dapat Anda lakukan secara rutin dalam jangka panjang."
-        -   `options`: Buat 5 opsi yang mendeskripsikan aktivitas inti atau tugas yang paling menyenangkan dari masing-masing 5 profesi.
+        -   `options`: Buat {option_count} opsi yang mendeskripsikan aktivitas inti atau tugas yang paling menyenangkan dari masing-masing {option_count} profesi.
 
     2.  **Dimensi "Good At" (Apa yang Dikuasai):**
         -   `instruction`: "Di antara kemampuan berikut, pilih satu atau dua yang paling Anda kuasai atau merasa paling mampu melakukannya."
-        -   `options`: Buat 5 opsi yang mendeskripsikan keahlian atau kompetensi utama dari masing-masing 5 profesi.
+        -   `options`: Buat {option_count} opsi yang mendeskripsikan keahlian atau kompetensi utama dari masing-masing {option_count} profesi.
 
     3.  **Dimensi "Needs" (Apa yang Dibutuhkan Dunia):**
         -   `instruction`: "Di antara kontribusi berikut, pilih satu atau dua yang paling ingin Anda berikan kepada masyarakat melalui karier Anda."
-        -   `options`: Buat 5 opsi yang mendeskripsikan dampak atau kontribusi sosial dari masing-masing 5 profesi.
+        -   `options`: Buat {option_count} opsi yang mendeskripsikan dampak atau kontribusi sosial dari masing-masing {option_count} profesi.
 
     4.  **Dimensi "Profession" (Aspek Ekonomi):**
         -   `instruction`: "Dengan mempertimbangkan aspek penghasilan dan keberlanjutan karier, pilih satu atau dua opsi yang paling sesuai dengan situasi dan harapan Anda saat ini."
-        -   `options`: Buat 5 opsi yang mendeskripsikan aspek ekonomi, stabilitas, atau prospek karier dari masing-masing 5 profesi.
+        -   `options`: Buat {option_count} opsi yang mendeskripsikan aspek ekonomi, stabilitas, atau prospek karier dari masing-masing {option_count} profesi.
 
     **Aturan Penting:**
     1.  **JANGAN sebutkan nama profesi** di dalam teks `instruction` atau `options`.
     2.  Pastikan output adalah **HANYA JSON yang valid**, tanpa teks pembuka atau penutup seperti \`\`\`json.
-    3.  Setiap array `options` harus berisi **tepat 5 string**.
+    3.  Setiap array `options` harus berisi **tepat {option_count} string**.
 
     Contoh kerangka output (gunakan ini sebagai struktur akhir):
     {{
@@ -84,5 +87,6 @@ def generate_assessment_statements(professions_data: dict):
     print("="*50 + "\n")
     # --- END DEBUG ---
     
-    response = llm_client.invoke(prompt, service_name="Assessment Generator")
-    return llm_client.parse_json_response(response)
+    return llm_client.invoke_structured(
+        prompt, assessment_questions_schema(option_count), "ikigai_questions", service_name="Assessment Generator"
+    )
@@ -6,6 +6,7 @@ yang mendukung pengembangan diri berdasarkan tipe RIASEC dan target pekerjaan.
 
 import json
 from .llm_client import llm_client
+from .structured_output import CAMPUS_ACTIVITIES_SCHEMA
 
 
 def generate_campus_activities_recommendations(riasec_code: str, target_jobs: list) -> str:
@@ -150,10 +151,10 @@ def generate_campus_activities_recommendations(riasec_code: str, target_jobs: li
     print("="*50 + "\n")
     # --- END DEBUG ---
     
-    response = llm_client.invoke(prompt, service_name="Campus Activities Recommender")
-    
-    # Parse JSON response
-    parsed_response = llm_client.parse_json_response(response)
+    # Output dibatasi dan divalidasi terhadap skema JSON
+    parsed_response = llm_client.invoke_structured(
+        prompt, CAMPUS_ACTIVITIES_SCHEMA, "campus_activities", service_name="Campus Activities Recommender"
+    )
     
     # Jika ada error dalam parsing, kembalikan error
     if "error" in parsed_response:
@@ -8,30 +8,16 @@ import json
 from .llm_client import llm_client
 
 
-def generate_dominant_type_explanation(dominant_type: str) -> str:
+def build_dominant_type_prompt(dominant_type: str) -> str:
     """
-    Menghasilkan penjelasan tentang tipe dominan RIASEC dalam konteks mahasiswa.
+    Menyusun prompt penjelasan tipe dominan untuk kode RIASEC yang sudah tervalidasi.
     
     Args:
-        dominant_type (str): Kode RIASEC dominan (e.g., "R", "RIA", "SEC", "E", etc.)
+        dominant_type (str): Kode RIASEC uppercase yang hanya berisi huruf R, I, A, S, E, C
     
     Returns:
-        str: Penjelasan dalam bahasa Indonesia yang mudah dipahami untuk mahasiswa
+        str: Prompt yang akan dikirim ke LLM
     """
-    
-    # Validasi input - pastikan hanya berisi huruf RIASEC yang valid
-    valid_letters = set("RIASEC")
-    dominant_type = dominant_type.upper().strip()
-    
-    if not dominant_type:
-        return json.dumps({"error": "Dominant type cannot be empty"})
-    
-    if not all(letter in valid_letters for letter in dominant_type):
-        return json.dumps({"error": "Invalid dominant type. Must contain only letters R, I, A, S, E, C"})
-    
-    if len(dominant_type) > 6:
-        return json.dumps({"error": "Dominant type cannot be longer than 6 characters"})
-    
     # Mapping huruf ke nama lengkap
     riasec_mapping = {
         "R": "Realistic (Realistis)",
@@ -58,7 +44,7 @@ def generate_dominant_type_explanation(dominant_type: str) -> str:
         type_summary = f"kombinasi beragam: {', '.join(type_descriptions[:-1])} dan {type_descriptions[-1]}"
         complexity_note = "Keragaman tipe ini menunjukkan fleksibilitas dan adaptabilitas yang tinggi dalam berbagai situasi."
     
-    prompt = f"""
+    return f"""
     Anda adalah seorang konselor karier yang ramah. Buatlah deskripsi tipe dominan RIASEC dalam 2-3 paragraf singkat untuk mahasiswa.
     
     Kode RIASEC: {dominant_type}
@@ -79,6 +65,33 @@ def generate_dominant_type_explanation(dominant_type: str) -> str:
     
     Tulis langsung tanpa format markdown atau tambahan lainnya.
     """
+
+
+def generate_dominant_type_explanation(dominant_type: str) -> str:
+    """
+    Menghasilkan penjelasan tentang tipe dominan RIASEC dalam konteks mahasiswa.
+    
+    Args:
+        dominant_type (str): Kode RIASEC dominan (e.g., "R", "RIA", "SEC", "E", etc.)
+    
+    Returns:
+        str: Penjelasan dalam bahasa Indonesia yang mudah dipahami untuk mahasiswa
+    """
+    
+    # Validasi input - pastikan hanya berisi huruf RIASEC yang valid
+    valid_letters = set("RIASEC")
+    dominant_type = dominant_type.upper().strip()
+    
+    if not dominant_type:
+        return json.dumps({"error": "Dominant type cannot be empty"})
+    
+    if not all(letter in valid_letters for letter in dominant_type):
+        return json.dumps({"error": "Invalid dominant type. Must contain only letters R, I, A, S, E, C"})
+    
+    if len(dominant_type) > 6:
+        return json.dumps({"error": "Dominant type cannot be longer than 6 characters"})
+    
+    prompt = build_dominant_type_prompt(dominant_type)
     
     # --- DEBUG PRINT: Menampilkan prompt yang dikirim ke LLM ---
     print("\n" + "="*50)
@@ -100,3 +113,18 @@ def generate_dominant_type_explanation(dominant_type: str) -> str:
     
     # Return the explanation as plain text
     return response.strip()
+
+
+def stream_dominant_type_explanation(dominant_type: str):
+    """
+    Versi streaming dari `generate_dominant_type_explanation`: menghasilkan
+    potongan teks penjelasan begitu diterima dari LLM. Input tidak valid atau
+    kegagalan LLM menghasilkan satu potongan JSON error.
+    """
+    dominant_type = dominant_type.upper().strip()
+    if not dominant_type or len(dominant_type) > 6 or not set(dominant_type) <= set("RIASEC"):
+        yield json.dumps({"error": "Invalid dominant type. Must contain only letters R, I, A, S, E, C"})
+        return
+
+    prompt = build_dominant_type_prompt(dominant_type)
+    yield from llm_client.invoke_stream(prompt, service_name="Dominant Type Explainer")
@@ -6,6 +6,7 @@ analisis akhir dengan skor kecocokan untuk setiap profesi.
 
 import json
 from .llm_client import llm_client
+from .structured_output import FINAL_ANALYSIS_SCHEMA
 
 
 def generate_final_analysis(professions: dict, answers: dict):
@@ -43,5 +44,6 @@ def generate_final_analysis(professions: dict, answers: dict):
     print("="*50 + "\n")
     # --- END DEBUG ---
     
-    response = llm_client.invoke(prompt, service_name="Final Analyzer")
-    return llm_client.parse_json_response(response)
+    return llm_client.invoke_structured(
+        prompt, FINAL_ANALYSIS_SCHEMA, "final_analysis", service_name="Final Analyzer"
+    )
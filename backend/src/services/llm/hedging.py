@@ -0,0 +1,75 @@
+"""
+Hedging Module
+Mengurangi tail latency: jika panggilan ke model utama belum selesai setelah
+batas persentil latensi yang pernah teramati, prompt yang sama dikirim ke
+model sekunder dan jawaban yang datang lebih dulu yang dipakai.
+"""
+
+import math
+import threading
+from collections import deque
+
+
+class HedgingPolicy:
+    """
+    Konfigurasi hedging per `service_name` beserta pelacak latensinya.
+
+    Contoh konfigurasi:
+        {"Final Analyzer": {"secondary_model": "openai/gpt-4o-mini", "percentile": 95,
+                            "min_delay": 4, "default_delay": 10}}
+    """
+
+    def __init__(self, services: dict = None, default_secondary_model: str = None,
+                 window: int = 200, min_samples: int = 20):
+        self.services = services or {}
+        self.default_secondary_model = default_secondary_model
+        self.window = window
+        self.min_samples = min_samples
+        self._latencies = {}  # (service_name, model) -> deque detik
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def settings_for(self, service_name: str, model: str):
+        """Mengembalikan setelan hedging untuk service, atau None jika hedging tidak aktif."""
+        settings = self.services.get(service_name)
+        if not settings or settings.get("enabled") is False:
+            return None
+        secondary_model = settings.get("secondary_model") or self.default_secondary_model
+        if not secondary_model or secondary_model == model:
+            return None
+        return dict(settings, secondary_model=secondary_model)
+
+    def observe(self, service_name: str, model: str, elapsed: float):
+        """Mencatat latensi panggilan yang berhasil."""
+        with self._lock:
+            samples = self._latencies.setdefault((service_name, model), deque(maxlen=self.window))
+            samples.append(elapsed)
+
+    def hedge_delay(self, service_name: str, model: str, settings: dict) -> float:
+        """
+        Batas waktu sebelum hedge dikirim: persentil latensi terbaru
+        (default p95), tidak lebih kecil dari `min_delay`. Sebelum sampel
+        cukup, dipakai `default_delay`.
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get((service_name, model), ()))
+        if len(samples) < self.min_samples:
+            return settings.get("default_delay", 10)
+        percentile = settings.get("percentile", 95)
+        index = min(len(samples) - 1, max(0, math.ceil(percentile / 100 * len(samples)) - 1))
+        return max(samples[index], settings.get("min_delay", 1))
+
+    def record(self, service_name: str, outcome: str):
+        """Mencatat hasil hedging: 'fired', 'won' (model sekunder menang), atau 'lost'."""
+        with self._lock:
+            service = self._stats.setdefault(service_name, {"fired": 0, "won": 0, "lost": 0})
+            service[outcome] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            by_service = {name: dict(counts) for name, counts in self._stats.items()}
+        return {
+            "fired": sum(s["fired"] for s in by_service.values()),
+            "won": sum(s["won"] for s in by_service.values()),
+            "by_service": by_service
+        }
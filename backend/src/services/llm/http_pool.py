@@ -0,0 +1,142 @@
+"""
+HTTP Pool Module
+Transport HTTP dengan connection pool persisten (keep-alive) yang dipakai
+bersama oleh semua agent LLM, sehingga setiap panggilan tidak perlu
+melakukan TCP dan TLS handshake baru ke OpenRouter.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledHTTPTransport:
+    """
+    Transport HTTP thread-safe berbasis satu HTTPAdapter bersama.
+
+    Setiap thread mendapat objek `requests.Session` sendiri (state cookie/header
+    tidak dibagi antar thread), tetapi semuanya me-mount adapter yang sama
+    sehingga koneksi keep-alive di pool urllib3 tetap dipakai bersama.
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 16,
+                 pool_block: bool = False, keepalive_expiry: float = 60):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keepalive_expiry = keepalive_expiry
+
+        # max_retries=0: kebijakan retry ditangani di level LLMClient, bukan di transport
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_used = time.monotonic()
+
+    def _session(self) -> requests.Session:
+        """Mengembalikan Session milik thread saat ini (dibuat sekali per thread)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+            self._local.session = session
+        return session
+
+    def _expire_idle_connections(self):
+        """
+        Membuang koneksi di pool jika sudah idle melebihi `keepalive_expiry`.
+        Server/proxy upstream biasanya menutup koneksi idle lebih dulu, dan
+        memakai koneksi basi seperti itu justru menyebabkan request gagal.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.keepalive_expiry and now - self._last_used > self.keepalive_expiry:
+                self._adapter.poolmanager.clear()
+            self._last_used = now
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Mengirim request melalui pool bersama. Argumen sama dengan `requests.request`."""
+        self._expire_idle_connections()
+        return self._session().request(method, url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def warm_up(self, url: str, timeout: float = 10) -> float:
+        """
+        Membuka koneksi ke host `url` lebih awal agar handshake TCP/TLS sudah
+        selesai sebelum request pengguna pertama masuk.
+
+        Returns:
+            float: Durasi warm-up dalam detik
+        """
+        start = time.perf_counter()
+        # HEAD cukup untuk membangun koneksi; status code-nya tidak penting.
+        # Response tanpa body langsung dikembalikan ke pool oleh requests.
+        self.request("HEAD", url, timeout=timeout)
+        return time.perf_counter() - start
+
+    def close(self):
+        """Menutup semua koneksi di pool."""
+        self._adapter.close()
+
+
+async def _run_in_context(coro, context: contextvars.Context):
+    # Task di event loop mendapat salinan context thread loop, bukan milik pemanggil
+    for var, value in context.items():
+        var.set(value)
+    return await coro
+
+
+class AsyncPooledHTTPTransport:
+    """
+    Transport HTTP asinkron berbasis `httpx.AsyncClient`.
+
+    Client dan connection pool-nya hidup di satu event loop latar belakang
+    (thread daemon "llm-event-loop") yang dibuat saat pertama kali dipakai,
+    sehingga kode sinkron dapat mengirim banyak coroutine sekaligus dan
+    semuanya berbagi pool yang sama.
+    """
+
+    def __init__(self, max_connections: int = 64, max_keepalive_connections: int = 16,
+                 keepalive_expiry: float = 60):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._loop = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop milik transport (dibuat dan dijalankan secara lazy)."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-event-loop", daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    def submit(self, coro):
+        """
+        Menjadwalkan coroutine di event loop transport; mengembalikan concurrent.futures.Future.
+        Contextvars pemanggil (misalnya deadline request) ikut dibawa ke task tersebut.
+        """
+        return asyncio.run_coroutine_threadsafe(_run_in_context(coro, contextvars.copy_context()), self.loop)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """Mengirim POST melalui pool bersama. Harus dipanggil dari dalam event loop transport."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=self.limits)
+        return await self._client.post(url, **kwargs)
@@ -0,0 +1,253 @@
+"""
+JSON Extractor Module
+Mengekstrak nilai JSON terluar dari completion LLM yang bisa berisi teks
+pembuka/penutup, code fence, atau beberapa objek JSON sekaligus.
+
+Jalur cepat memakai `JSONDecoder.raw_decode` langsung dari kurung pembuka
+pertama. Jika gagal, pemindai satu kali jalan yang sadar string dan kurung
+memperbaiki cacat umum output LLM (trailing comma, koma ganda, karakter
+kontrol mentah di dalam string, literal Python) lalu melaporkan posisi
+persis di teks asli jika parsing tetap gagal.
+
+Output terpotong (misalnya kena max_tokens) hanya diperbaiki jika pemanggil
+meminta `allow_truncated=True`: perbaikan itu menutup kurung dan membuang
+elemen terakhir, jadi data yang hilang hanya tertangkap jika hasilnya
+divalidasi terhadap skema.
+"""
+
+import bisect
+import json
+import re
+
+# Satu token per string utuh (termasuk escape), karakter struktural, atau literal/angka.
+# Spasi dan titik dua di antara token dilewati oleh mesin regex, bukan oleh loop Python.
+_TOKEN = re.compile(
+    r'[\s:]*(?P<token>"[^"\\]*(?:\\.[^"\\]*)*(?P<close>")?|[{}\[\],]|[^"{}\[\],\s:][^"{}\[\],]*)',
+    re.DOTALL
+)
+_CONTROL_CHARACTER = re.compile(r'[\x00-\x1f]')
+_PYTHON_LITERALS = re.compile(r'\b(True|False|None)\b')
+_PYTHON_LITERAL_MAP = {"True": "true", "False": "false", "None": "null"}
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+# Batas kandidat kurung pembuka yang dicoba (misalnya kurung di dalam prosa)
+MAX_CANDIDATES = 8
+
+_decoder = json.JSONDecoder()
+
+
+class JSONExtractionError(ValueError):
+    """Dilempar jika tidak ada nilai JSON yang bisa diekstrak; `position` menunjuk ke teks asli."""
+
+    def __init__(self, message: str, text: str, position: int, end: int = None):
+        self.message = message
+        self.position = position
+        # Akhir kandidat yang gagal; pencarian kandidat berikutnya dimulai setelahnya
+        self.end = end if end is not None else position + 1
+        self.line = text.count("\n", 0, position) + 1
+        self.column = position - (text.rfind("\n", 0, position) + 1) + 1
+        self.snippet = text[max(0, position - 30):position + 30]
+        super().__init__(f"{message} at line {self.line} column {self.column} (char {position}): {self.snippet!r}")
+
+
+class _Output:
+    """
+    Hasil perbaikan yang dibangun secara malas: bagian teks asli yang tidak
+    diubah disalin sekaligus, hanya titik perbaikan yang dicatat. Menyimpan
+    pemetaan posisi output -> posisi teks asli untuk laporan error.
+    """
+
+    def __init__(self, text: str, start: int):
+        self.source = text
+        self.copied_to = start
+        self.parts = []
+        self.length = 0
+        self.out_positions = []
+        self.src_positions = []
+        # Untuk output terpotong: (panjang output sebelum elemen terakhir yang belum lengkap, penutup)
+        self.truncation_fallback = None
+
+    def _emit(self, chunk: str, src_position: int):
+        if chunk:
+            self.out_positions.append(self.length)
+            self.src_positions.append(src_position)
+            self.parts.append(chunk)
+            self.length += len(chunk)
+
+    def replace(self, start: int, end: int, replacement: str = ""):
+        """Mengganti teks asli [start, end) dengan `replacement`."""
+        self._emit(self.source[self.copied_to:start], self.copied_to)
+        self._emit(replacement, start)
+        self.copied_to = end
+
+    def finish(self, end: int, suffix: str = ""):
+        self._emit(self.source[self.copied_to:end], self.copied_to)
+        self._emit(suffix, end)
+        self.copied_to = end
+
+    def output_position(self, src_position: int) -> int:
+        """Posisi output yang bersesuaian dengan posisi asli yang belum disalin (>= copied_to)."""
+        return self.length + (src_position - self.copied_to)
+
+    def source_position(self, out_position: int) -> int:
+        index = bisect.bisect_right(self.out_positions, out_position) - 1
+        if index < 0:
+            return self.src_positions[0] if self.src_positions else 0
+        return self.src_positions[index] + (out_position - self.out_positions[index])
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+def _escape_control_characters(token: str) -> str:
+    return _CONTROL_CHARACTER.sub(
+        lambda m: _CONTROL_ESCAPES.get(m.group(0), f"\\u{ord(m.group(0)):04x}"), token
+    )
+
+
+def _repair(text: str, start: int, repairs: list, allow_truncated: bool = False):
+    """
+    Memindai satu nilai JSON mulai dari `start` dalam satu kali jalan.
+
+    Returns:
+        tuple: (_Output hasil perbaikan, posisi akhir kandidat di teks asli)
+
+    Raises:
+        JSONExtractionError: jika struktur kurung tidak cocok, atau output
+            terpotong dan `allow_truncated` False
+    """
+    out = _Output(text, start)
+    stack = []
+    boundaries = []  # per container: posisi output sebelum elemen yang sedang dibaca
+    last_comma = None  # posisi koma jika token signifikan terakhir adalah koma
+    unterminated = False
+
+    for match in _TOKEN.finditer(text, start):
+        token = match.group("token")
+        position = match.start("token")
+        first = token[0]
+
+        if first == '"':
+            last_comma = None
+            if _CONTROL_CHARACTER.search(token):
+                repairs.append("control_character")
+                out.replace(position, match.end(), _escape_control_characters(token))
+            if match.group("close") is None:
+                unterminated = True
+                break
+        elif first == ",":
+            if last_comma is not None:
+                repairs.append("double_comma")
+                out.replace(position, position + 1)
+            else:
+                last_comma = position
+                boundaries[-1] = out.output_position(position)
+        elif first in "{[":
+            last_comma = None
+            stack.append(first)
+            boundaries.append(out.output_position(position + 1))
+        elif first in "}]":
+            if last_comma is not None:
+                repairs.append("trailing_comma")
+                out.replace(last_comma, last_comma + 1)
+                last_comma = None
+            if not stack or _CLOSERS[stack.pop()] != first:
+                raise JSONExtractionError(f"Unexpected '{first}'", text, position, match.end())
+            boundaries.pop()
+            if not stack:
+                out.finish(match.end())
+                return out, match.end()
+        else:
+            last_comma = None
+            if ("True" in token or "False" in token or "None" in token) and _PYTHON_LITERALS.search(token):
+                repairs.append("python_literal")
+                out.replace(position, match.end(), _PYTHON_LITERALS.sub(
+                    lambda m: _PYTHON_LITERAL_MAP[m.group(0)], token
+                ))
+
+    if not stack:
+        raise JSONExtractionError("No JSON value found", text, start)
+    if not allow_truncated:
+        raise JSONExtractionError("Truncated JSON value", text, len(text), len(text))
+    # Output terpotong (misalnya kena max_tokens): tutup string dan semua kurung yang masih terbuka
+    repairs.append("truncated")
+    if last_comma is not None:
+        out.replace(last_comma, last_comma + 1)
+    # String terpotong berhenti di akhir token (membuang backslash yang menggantung)
+    end = match.end() if unterminated else len(text)
+    container_closers = "".join(_CLOSERS[opener] for opener in reversed(stack))
+    out.finish(end, ('"' if unterminated else "") + container_closers)
+    # Alternatif jika elemen terakhir terpotong di tengah (misalnya hanya key tanpa value): buang elemen itu
+    out.truncation_fallback = (boundaries[-1], container_closers)
+    return out, end
+
+
+def _parse_candidate(text: str, start: int, repairs: list, allow_truncated: bool = False):
+    """Mencoba parse cepat lalu parse dengan perbaikan untuk kandidat di `start`."""
+    try:
+        return _decoder.raw_decode(text, start)
+    except json.JSONDecodeError:
+        pass
+    out, end = _repair(text, start, repairs, allow_truncated)
+    repaired = out.text()
+    try:
+        return json.loads(repaired), end
+    except json.JSONDecodeError as e:
+        error = JSONExtractionError(e.msg, text, out.source_position(e.pos), end)
+    if out.truncation_fallback:
+        cut, closers = out.truncation_fallback
+        try:
+            value = json.loads(repaired[:cut] + closers)
+            repairs.append("truncated_element_dropped")
+            return value, end
+        except json.JSONDecodeError:
+            pass
+    raise error
+
+
+def extract_json(text: str, start_chars: str = "{[", repairs: list = None, allow_truncated: bool = False):
+    """
+    Mengekstrak nilai JSON terluar pertama yang valid dari teks.
+
+    Args:
+        text (str): Completion mentah dari LLM
+        start_chars (str): Kurung pembuka yang boleh memulai nilai ("{" untuk objek saja)
+        repairs (list): Jika diberikan, diisi nama perbaikan yang diterapkan
+        allow_truncated (bool): Perbaiki output terpotong (tutup kurung, buang elemen
+            terakhir yang belum lengkap). Hanya untuk pemanggil yang memvalidasi hasil
+            terhadap skema; tanpa itu output terpotong dianggap gagal parse.
+
+    Returns:
+        Nilai JSON hasil parsing (dict/list)
+
+    Raises:
+        JSONExtractionError: Berisi posisi, baris, dan kolom kegagalan di teks asli
+    """
+    if not isinstance(text, str):
+        raise JSONExtractionError("Response is not a string", "", 0)
+    repairs = [] if repairs is None else repairs
+    best_error = None
+    position = _find_start(text, start_chars, 0)
+    candidates = 0
+
+    while position != -1 and candidates < MAX_CANDIDATES:
+        candidates += 1
+        try:
+            value, _ = _parse_candidate(text, position, repairs, allow_truncated)
+            return value
+        except JSONExtractionError as e:
+            # Laporkan kandidat yang parsing-nya paling jauh: paling mungkin JSON yang dimaksud
+            if best_error is None or e.position > best_error.position:
+                best_error = e
+            # Objek bersarang di dalam kandidat yang gagal tidak dicoba
+            next_offset = max(position + 1, e.end)
+        repairs.clear()
+        position = _find_start(text, start_chars, next_offset)
+
+    raise best_error or JSONExtractionError("No JSON value found", text, 0)
+
+
+def _find_start(text: str, start_chars: str, offset: int) -> int:
+    positions = [p for p in (text.find(c, offset) for c in start_chars) if p != -1]
+    return min(positions) if positions else -1
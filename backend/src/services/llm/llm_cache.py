@@ -0,0 +1,175 @@
+"""
+LLM Cache Module
+Cache respons LLM berbasis konten (content-addressed): kunci cache adalah hash
+dari model, prompt, dan parameter generasi. Terdiri dari dua tingkat:
+LRU terbatas di memori proses dan koleksi `llm_cache` di MongoDB yang
+kedaluwarsa otomatis lewat TTL index.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from src.database import connect_to_mongo
+from src.services.request_deadline import mongo_budget, is_deadline_error
+
+
+class LLMResponseCache:
+    """Cache dua tingkat (LRU in-process + MongoDB) untuk respons LLM."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 604800,
+                 persistent: bool = True, collection_name: str = "llm_cache",
+                 persistent_retry_after: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persistent = persistent
+        self.collection_name = collection_name
+        self.persistent_retry_after = persistent_retry_after
+
+        self._entries = OrderedDict()  # key -> (expires_at_monotonic, value)
+        self._lock = threading.Lock()
+        self._persistent_disabled_until = 0.0
+        self._stats = {"hits_memory": 0, "hits_persistent": 0, "misses": 0, "stores": 0}
+        self._service_stats = {}
+
+    @staticmethod
+    def make_key(payload: dict) -> str:
+        """
+        Membuat kunci cache dari payload request (model, messages, dan
+        parameter generasi lain). Urutan key dinormalisasi agar payload yang
+        setara selalu menghasilkan hash yang sama.
+        """
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _collection(self):
+        """Mengembalikan koleksi Mongo, atau None jika tier persisten sedang tidak tersedia."""
+        if not self.persistent or time.monotonic() < self._persistent_disabled_until:
+            return None
+        try:
+            return connect_to_mongo()[self.collection_name]
+        except Exception as e:
+            self._disable_persistent(e)
+            return None
+
+    def _disable_persistent(self, error: Exception):
+        # Hindari menunggu timeout Mongo di setiap request saat database sedang down
+        print(f"LLM cache: persistent tier unavailable ({error}), retrying in {self.persistent_retry_after:.0f}s")
+        self._persistent_disabled_until = time.monotonic() + self.persistent_retry_after
+
+    def _handle_persistent_error(self, error: Exception):
+        # Anggaran request yang habis bukan tanda database down: cukup lewati tier persisten
+        if is_deadline_error(error):
+            print(f"LLM cache: skipped persistent tier ({error})")
+            return
+        self._disable_persistent(error)
+
+    def _record(self, outcome: str, service_name: str):
+        with self._lock:
+            self._stats[outcome] += 1
+            service = self._service_stats.setdefault(service_name, {"hits": 0, "misses": 0})
+            service["misses" if outcome == "misses" else "hits"] += 1
+
+    def _remember(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str, service_name: str = "LLM"):
+        """
+        Mencari respons di LRU lalu di MongoDB.
+
+        Returns:
+            str | None: Respons yang tersimpan, atau None jika miss/kedaluwarsa
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    entry = None
+        if entry is not None:
+            self._record("hits_memory", service_name)
+            return value
+
+        collection = self._collection()
+        if collection is not None:
+            try:
+                now = datetime.utcnow()
+                with mongo_budget("mongo:llm_cache"):
+                    doc = collection.find_one({"_id": key, "expires_at": {"$gt": now}})
+                if doc is not None:
+                    remaining = (doc["expires_at"] - now).total_seconds()
+                    self._remember(key, doc["response"], remaining)
+                    self._record("hits_persistent", service_name)
+                    return doc["response"]
+            except Exception as e:
+                self._handle_persistent_error(e)
+
+        self._record("misses", service_name)
+        return None
+
+    def set(self, key: str, value: str, service_name: str = "LLM", model: str = None):
+        """Menyimpan respons ke LRU dan MongoDB."""
+        self._remember(key, value, self.ttl)
+        with self._lock:
+            self._stats["stores"] += 1
+
+        collection = self._collection()
+        if collection is not None:
+            try:
+                now = datetime.utcnow()
+                with mongo_budget("mongo:llm_cache"):
+                    collection.replace_one(
+                        {"_id": key},
+                        {
+                            "_id": key,
+                            "response": value,
+                            "service_name": service_name,
+                            "model": model,
+                            "created_at": now,
+                            "expires_at": now + timedelta(seconds=self.ttl)
+                        },
+                        upsert=True
+                    )
+            except Exception as e:
+                self._handle_persistent_error(e)
+
+    def discard(self, key: str):
+        """
+        Menghapus satu entri. Dipakai ketika respons yang sudah tersimpan ternyata
+        tidak bisa diproses (misalnya JSON rusak), agar kesalahan yang sama tidak
+        terus disajikan dari cache.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+        collection = self._collection()
+        if collection is not None:
+            try:
+                with mongo_budget("mongo:llm_cache"):
+                    collection.delete_one({"_id": key})
+            except Exception as e:
+                self._handle_persistent_error(e)
+
+    def clear(self):
+        """Mengosongkan LRU in-process (data di MongoDB tidak disentuh)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Statistik hit/miss cache, total dan per service."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["by_service"] = {name: dict(counts) for name, counts in self._service_stats.items()}
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits_memory"] + stats["hits_persistent"] + stats["misses"]
+        stats["hit_ratio"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+        return stats
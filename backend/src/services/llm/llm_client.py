@@ -4,10 +4,48 @@ Modul terpusat untuk menangani komunikasi dengan OpenRouter API.
 Menghindari duplikasi kode dan memudahkan maintenance.
 """
 
+import asyncio
+import concurrent.futures
 import requests
-import re
+import httpx
 import json
-from src.config import OPENROUTER_API_KEY, OPENROUTER_API_URL
+import threading
+import time
+from src.config import (
+    OPENROUTER_API_KEY, OPENROUTER_API_URL,
+    LLM_POOL_CONNECTIONS, LLM_POOL_MAXSIZE, LLM_POOL_BLOCK, LLM_KEEPALIVE_EXPIRY,
+    LLM_CACHE_ENABLED, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL, LLM_CACHE_PERSISTENT,
+    LLM_CACHE_SERVICES, LLM_CACHE_EXCLUDE_SERVICES, LLM_SINGLE_FLIGHT_ENABLED,
+    LLM_RETRY_MAX, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY,
+    LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RECOVERY_TIMEOUT,
+    LLM_HEDGE_SERVICES, LLM_HEDGE_DEFAULT_SECONDARY_MODEL,
+    LLM_RATE_LIMIT_ENABLED, LLM_RATE_LIMIT_MAX_QUEUE, LLM_RATE_LIMIT_MAX_WAIT,
+    LLM_DEFAULT_MODEL, LLM_DEFAULT_TIMEOUT, LLM_ROUTING_FILE, LLM_ROUTING_CHECK_INTERVAL,
+    LLM_STRUCTURED_OUTPUT_ENABLED
+)
+from .http_pool import PooledHTTPTransport, AsyncPooledHTTPTransport
+from .llm_cache import LLMResponseCache
+from .single_flight import SingleFlight
+from .resilience import RetryPolicy, CircuitBreakerRegistry, CircuitOpenError
+from .hedging import HedgingPolicy
+from .model_routing import ModelRouter
+from .llm_metrics import LLMMetrics
+from .rate_limiter import RateLimitScheduler, RateLimitExceeded, estimate_tokens
+from .structured_output import build_response_format, validate as validate_schema
+from .json_extractor import extract_json, JSONExtractionError
+from src.services.request_deadline import (
+    remaining_timeout, fits_in_budget, DeadlineExceeded, RequestCancelled,
+    is_cancellable, on_request_cancel, check_cancelled
+)
+
+DEADLINE_ERROR = "Request deadline exceeded before the LLM service could respond."
+CANCELLED_ERROR = "Request was cancelled before the LLM service could respond."
+RATE_LIMIT_ERROR = "LLM service is busy. Please try again later."
+
+
+def _deadline_error(error: DeadlineExceeded) -> str:
+    """JSON error untuk panggilan yang dilewati karena anggaran waktu habis atau request dibatalkan."""
+    return json.dumps({"error": CANCELLED_ERROR if isinstance(error, RequestCancelled) else DEADLINE_ERROR})
 
 
 class LLMClient:
@@ -16,10 +54,194 @@ class LLMClient:
     def __init__(self):
         self.api_key = OPENROUTER_API_KEY
         self.api_url = OPENROUTER_API_URL
-        self.default_model = "google/gemini-2.0-flash-001"
-        self.timeout = 30
+        self.default_model = LLM_DEFAULT_MODEL
+        self.timeout = LLM_DEFAULT_TIMEOUT
+        # Tabel routing service_name -> model/max_tokens/temperature/timeout (reload otomatis)
+        self.router = ModelRouter(
+            LLM_ROUTING_FILE,
+            default_model=self.default_model,
+            default_timeout=self.timeout,
+            check_interval=LLM_ROUTING_CHECK_INTERVAL
+        )
+        # Kirim skema JSON lewat response_format untuk agent yang outputnya terstruktur
+        self.structured_output_enabled = LLM_STRUCTURED_OUTPUT_ENABLED
+        # Counter & histogram per panggilan untuk endpoint /metrics
+        self.metrics = LLMMetrics()
+        # Token bucket per model dan antrian prioritas di depan upstream (batas dari tabel routing)
+        self.scheduler = RateLimitScheduler(
+            self.router.rate_limit,
+            max_queue=LLM_RATE_LIMIT_MAX_QUEUE,
+            max_wait=LLM_RATE_LIMIT_MAX_WAIT,
+            enabled=LLM_RATE_LIMIT_ENABLED,
+            metrics=self.metrics
+        )
+        # Connection pool keep-alive yang dipakai bersama oleh semua agent
+        self.transport = PooledHTTPTransport(
+            pool_connections=LLM_POOL_CONNECTIONS,
+            pool_maxsize=LLM_POOL_MAXSIZE,
+            pool_block=LLM_POOL_BLOCK,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+        )
+        # Pool asinkron untuk hedging dan panggilan yang bisa dibatalkan, dengan batas yang setara
+        self.async_transport = AsyncPooledHTTPTransport(
+            max_connections=LLM_POOL_CONNECTIONS * LLM_POOL_MAXSIZE,
+            max_keepalive_connections=LLM_POOL_MAXSIZE,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+        )
+        # Cache respons untuk prompt yang sepenuhnya ditentukan oleh inputnya
+        self.cache = LLMResponseCache(
+            max_entries=LLM_CACHE_MAX_ENTRIES,
+            ttl=LLM_CACHE_TTL,
+            persistent=LLM_CACHE_PERSISTENT
+        )
+        self.cache_enabled = LLM_CACHE_ENABLED
+        self.cache_services = set(LLM_CACHE_SERVICES)
+        self.cache_exclude_services = set(LLM_CACHE_EXCLUDE_SERVICES)
+        # Deduplikasi prompt identik yang sedang in-flight
+        self.single_flight = SingleFlight()
+        self.single_flight_enabled = LLM_SINGLE_FLIGHT_ENABLED
+        # Retry dengan backoff untuk 429/5xx dan circuit breaker per model
+        self.retry_policy = RetryPolicy(
+            max_retries=LLM_RETRY_MAX,
+            base_delay=LLM_RETRY_BASE_DELAY,
+            max_delay=LLM_RETRY_MAX_DELAY
+        )
+        self.circuit_breakers = CircuitBreakerRegistry(
+            failure_threshold=LLM_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=LLM_BREAKER_RECOVERY_TIMEOUT
+        )
+        # Hedging opsional ke model sekunder untuk memangkas tail latency
+        self.hedging = HedgingPolicy(
+            services=LLM_HEDGE_SERVICES,
+            default_secondary_model=LLM_HEDGE_DEFAULT_SECONDARY_MODEL
+        )
+
+    def warm_up(self, background: bool = True):
+        """
+        Membuka koneksi ke OpenRouter saat worker boot agar request pertama
+        tidak menanggung biaya handshake TCP/TLS.
+
+        Args:
+            background (bool): Jalankan di thread daemon agar tidak menahan startup
+        """
+        def _warm_up():
+            try:
+                elapsed = self.transport.warm_up(self.api_url)
+                print(f"LLM connection pool warmed up in {elapsed * 1000:.0f} ms.")
+            except requests.exceptions.RequestException as e:
+                print(f"LLM connection pool warm-up failed: {e}")
+
+        if background:
+            threading.Thread(target=_warm_up, name="llm-warmup", daemon=True).start()
+        else:
+            _warm_up()
     
-    def invoke(self, prompt: str, model: str = None, service_name: str = "LLM") -> str:
+    def _is_configured(self) -> bool:
+        return bool(self.api_key) and self.api_key != 'your-openrouter-api-key-here'
+
+    def _build_request(self, prompt: str, model: str, route: dict = None,
+                       response_format: dict = None) -> tuple:
+        """Menyusun header dan payload request chat completion, termasuk parameter generasi dari route."""
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        for param in ("max_tokens", "temperature"):
+            if route and route.get(param) is not None:
+                payload[param] = route[param]
+        if response_format:
+            payload["response_format"] = response_format
+        return headers, payload
+
+    def _record_call(self, service_name: str, model: str, elapsed: float, status,
+                     retries: int = 0, usage: dict = None):
+        """
+        Mencatat satu panggilan upstream ke metrik, laporan routing, dan pelacak latensi hedging.
+        `status` berupa kode HTTP akhir, "error" (gagal koneksi/timeout), atau "circuit_open".
+        """
+        ok = status == 200
+        cost = self.router.estimate_cost(model, usage) if ok else 0.0
+        self.metrics.observe_call(service_name, model, elapsed, str(status), retries, usage, cost)
+        if status == "circuit_open":
+            return
+        self.router.record(service_name, model, elapsed, usage, ok)
+        if ok:
+            self.hedging.observe(service_name, model, elapsed)
+
+    def _cache_key(self, payload: dict, service_name: str, use_cache: bool = None):
+        """
+        Mengembalikan kunci cache untuk payload, atau None jika cache tidak
+        dipakai untuk service ini. `use_cache` (jika diisi) meng-override
+        konfigurasi opt-in/opt-out per service.
+        """
+        if use_cache is None:
+            use_cache = (
+                self.cache_enabled
+                and service_name not in self.cache_exclude_services
+                and ("*" in self.cache_services or service_name in self.cache_services)
+            )
+        return self.cache.make_key(payload) if use_cache else None
+
+    def cache_key_for(self, prompt: str, model: str = None, service_name: str = "LLM",
+                      use_cache: bool = None, response_format: dict = None):
+        """
+        Kunci cache yang dipakai `invoke`/`invoke_stream` untuk argumen yang sama,
+        atau None jika respons service ini tidak di-cache. Untuk `invoke`, pakai
+        `invoke_with_key` agar route dan payload tidak disusun dua kali.
+        """
+        route = self.router.resolve(service_name)
+        _, payload = self._build_request(prompt, model or route["model"], route, response_format)
+        return self._cache_key(payload, service_name, use_cache)
+
+    def _log_cache_hit(self, service_name: str):
+        # --- DEBUG PRINT ---
+        print(f"===== CACHE HIT ({service_name}) =====")
+        # --- END DEBUG ---
+
+    def stats(self) -> dict:
+        """Statistik operasional client: cache, request coalescing, rate limiter, retry, circuit breaker, hedging, dan routing."""
+        return {
+            "cache": self.cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "rate_limiter": self.scheduler.stats(),
+            "retry": self.retry_policy.stats(),
+            "circuit_breakers": self.circuit_breakers.snapshot(),
+            "hedging": self.hedging.stats(),
+            "routing": self.router.report()
+        }
+
+    def _log_request(self, model: str, service_name: str):
+        # --- DEBUG PRINT: Menampilkan detail request ---
+        print("\n" + "="*50)
+        print(f"===== REQUEST DETAILS ({service_name}) =====")
+        print(f"URL: {self.api_url}")
+        print(f"Model: {model}")
+        print(f"API Key (first 10 chars): {self.api_key[:10]}...")
+        print("="*50 + "\n")
+        # --- END DEBUG ---
+
+    def _log_response(self, status_code: int, body: str, service_name: str):
+        # --- DEBUG PRINT: Menampilkan detail response ---
+        print("\n" + "="*50)
+        print(f"===== RESPONSE DETAILS ({service_name}) =====")
+        print(f"Status Code: {status_code}")
+        if status_code != 200:
+            print(f"Error Response Body: {body}")
+            print("="*50 + "\n")
+        # --- END DEBUG ---
+
+    def _extract_content(self, data: dict, service_name: str) -> str:
+        # --- DEBUG PRINT: Menampilkan respons mentah dari LLM ---
+        raw_response_content = data['choices'][0]['message']['content']
+        print(f"===== RAW RESPONSE FROM LLM ({service_name}) =====")
+        print(raw_response_content)
+        print("="*50 + "\n")
+        # --- END DEBUG ---
+        return raw_response_content
+
+    def invoke(self, prompt: str, model: str = None, service_name: str = "LLM",
+               use_cache: bool = None, response_format: dict = None) -> str:
         """
         Mengirim prompt ke OpenRouter API dan mengembalikan respons teks.
         
@@ -27,85 +249,545 @@ class LLMClient:
             prompt (str): Prompt yang akan dikirim ke LLM
             model (str): Model LLM yang akan digunakan (opsional)
             service_name (str): Nama service untuk debugging (opsional)
+            use_cache (bool): Paksa pakai/lewati cache (opsional, default mengikuti konfigurasi)
+            response_format (dict): Payload `response_format` provider, misalnya skema JSON (opsional)
             
         Returns:
             str: Respons dari LLM atau JSON error jika gagal
         """
-        if not self.api_key or self.api_key == 'your-openrouter-api-key-here':
-            return json.dumps({"error": "API Key for OpenRouter is not configured."})
+        return self.invoke_with_key(prompt, model, service_name, use_cache, response_format)[0]
+
+    def invoke_with_key(self, prompt: str, model: str = None, service_name: str = "LLM",
+                        use_cache: bool = None, response_format: dict = None) -> tuple:
+        """
+        Sama seperti `invoke`, tetapi juga mengembalikan kunci cache respons
+        agar pemanggil bisa menghapus entri yang ternyata tidak bisa diparsing.
+
+        Returns:
+            tuple: (respons, kunci cache atau None jika service tidak di-cache)
+        """
+        if not self._is_configured():
+            return json.dumps({"error": "API Key for OpenRouter is not configured."}), None
         
-        model_to_use = model or self.default_model
+        route = self.router.resolve(service_name)
+        model_to_use = model or route["model"]
+        timeout = route.get("timeout", self.timeout)
+        headers, payload = self._build_request(prompt, model_to_use, route, response_format)
+
+        cache_key = self._cache_key(payload, service_name, use_cache)
+        return self._invoke_payload(headers, payload, model_to_use, service_name, timeout, cache_key), cache_key
+
+    def _invoke_payload(self, headers: dict, payload: dict, model_to_use: str, service_name: str,
+                        timeout: float, cache_key) -> str:
+        """Cache, single-flight, dan pengiriman untuk payload yang sudah disusun `invoke_with_key`."""
+        if cache_key:
+            cached = self.cache.get(cache_key, service_name)
+            if cached is not None:
+                self._log_cache_hit(service_name)
+                self.metrics.observe_cache(service_name, model_to_use, "hit")
+                return cached
+        led = []
         
+        # Panggilan identik yang sedang berjalan digabung menjadi satu request upstream
+        def _call():
+            led.append(True)
+            hedge = self.hedging.settings_for(service_name, model_to_use)
+            if hedge:
+                # Hedging butuh pembatalan request yang kalah, jadi dijalankan di event loop client
+                content = self._run_cancellable(
+                    self._ahedged_send(headers, payload, model_to_use, service_name, timeout, hedge),
+                    f"llm:{service_name}"
+                )
+            elif is_cancellable():
+                # Request yang bisa dibatalkan (klien dipantau/job) dikirim lewat event loop
+                # agar koneksi upstream bisa diputus saat klien pergi
+                content = self._run_cancellable(
+                    self._asend(headers, payload, model_to_use, service_name, timeout),
+                    f"llm:{service_name}"
+                )
+            else:
+                content = self._send(headers, payload, model_to_use, service_name, timeout)
+            if cache_key:
+                self.cache.set(cache_key, content, service_name, model_to_use)
+            return content
+
         try:
-            # --- DEBUG PRINT: Menampilkan detail request ---
-            print("\n" + "="*50)
-            print(f"===== REQUEST DETAILS ({service_name}) =====")
-            print(f"URL: {self.api_url}")
-            print(f"Model: {model_to_use}")
-            print(f"API Key (first 10 chars): {self.api_key[:10]}...")
-            print("="*50 + "\n")
-            # --- END DEBUG ---
-            
-            response = requests.post(
-                url=self.api_url,
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                json={
-                    "model": model_to_use,
-                    "messages": [{"role": "user", "content": prompt}]
-                },
-                timeout=self.timeout
-            )
-            
-            # --- DEBUG PRINT: Menampilkan detail response ---
-            print("\n" + "="*50)
-            print(f"===== RESPONSE DETAILS ({service_name}) =====")
-            print(f"Status Code: {response.status_code}")
-            if response.status_code != 200:
-                print(f"Error Response Body: {response.text}")
-                print("="*50 + "\n")
-                response.raise_for_status()
-            # --- END DEBUG ---
+            if not self.single_flight_enabled:
+                return _call()
+            flight_key = cache_key or self.cache.make_key(payload)
+            return self.single_flight.do(flight_key, _call, service_name)
             
+        except (requests.exceptions.RequestException, httpx.HTTPError) as e:
+            print(f"Error calling LLM API: {e}")
+            return json.dumps({"error": "Failed to communicate with the LLM service."})
+        except CircuitOpenError as e:
+            print(f"Skipping LLM call: {e}")
+            return json.dumps({"error": "LLM service is temporarily unavailable. Please try again later."})
+        except DeadlineExceeded as e:
+            print(f"Skipping LLM call ({service_name}): {e}")
+            return _deadline_error(e)
+        except RateLimitExceeded as e:
+            print(f"Skipping LLM call ({service_name}): {e}")
+            return json.dumps({"error": RATE_LIMIT_ERROR})
+        finally:
+            self._observe_cache_outcome(service_name, model_to_use, cache_key, led)
+
+    def _run_cancellable(self, coro, stage: str):
+        """
+        Menjalankan coroutine di event loop client dan menunggu hasilnya dari kode sinkron.
+        Jika request/job dibatalkan, task-nya ikut dibatalkan (httpx menutup koneksi upstream).
+
+        Raises:
+            RequestCancelled: jika dibatalkan sebelum atau selama coroutine berjalan
+        """
+        future = self.async_transport.submit(coro)
+        try:
+            with on_request_cancel(future.cancel, stage):
+                return future.result()
+        except concurrent.futures.CancelledError:
+            check_cancelled(stage)
+            raise
+        except RequestCancelled:
+            future.cancel()
+            raise
+
+    def _observe_cache_outcome(self, service_name: str, model: str, cache_key, led: list):
+        """Mencatat hasil cache untuk invoke yang tidak hit: miss, bypass, atau coalesced (menumpang leader)."""
+        if not led:
+            outcome = "coalesced"
+        else:
+            outcome = "miss" if cache_key else "bypass"
+        self.metrics.observe_cache(service_name, model, outcome)
+
+    def _send(self, headers: dict, payload: dict, model: str, service_name: str, timeout: float) -> str:
+        """
+        Mengirim request ke upstream lewat pool sinkron dengan rate limiter, retry, dan circuit breaker.
+        Melempar RequestException, CircuitOpenError, RateLimitExceeded, atau DeadlineExceeded jika gagal.
+        """
+        # Cek anggaran sebelum breaker agar slot probe half-open tidak terpakai sia-sia
+        remaining_timeout(timeout, f"llm:{service_name}")
+        breaker = self.circuit_breakers.get(model)
+        if not breaker.allow():
+            self._record_call(service_name, model, 0.0, "circuit_open")
+            raise CircuitOpenError(model)
+
+        attempt = 0
+        start = time.perf_counter()
+        tokens = estimate_tokens(payload)
+        while True:
+            # Probe half-open tidak di-retry agar pemulihan dideteksi secepatnya
+            can_retry = breaker.state == breaker.CLOSED
+            self._acquire_slot(breaker, model, tokens, service_name)
+            try:
+                self._log_request(model, service_name)
+                response = self.transport.post(
+                    url=self.api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=remaining_timeout(timeout, f"llm:{service_name}")
+                )
+            except requests.exceptions.RequestException as e:
+                # Hanya kegagalan koneksi yang di-retry
+                retryable = isinstance(e, requests.exceptions.ConnectionError)
+                delay = self._retry_delay(attempt, can_retry, service_name) if retryable else None
+                if delay is not None:
+                    self._wait_before_retry(delay, attempt, service_name, e)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+                self._record_call(service_name, model, time.perf_counter() - start, "error", attempt)
+                raise
+
+            self._log_response(response.status_code, response.text, service_name)
+            self._pause_if_rate_limited(model, response)
+            if self.retry_policy.is_retryable_status(response.status_code):
+                delay = self._retry_delay(attempt, can_retry, service_name, response.headers.get("Retry-After"))
+                if delay is not None:
+                    self._wait_before_retry(delay, attempt, service_name, response.status_code)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+            else:
+                # Error 4xx lain berarti provider tetap merespons normal
+                breaker.record_success()
+            if response.status_code >= 400:
+                self._record_call(service_name, model, time.perf_counter() - start, response.status_code, attempt)
             response.raise_for_status()
-            
-            # --- DEBUG PRINT: Menampilkan respons mentah dari LLM ---
-            raw_response_content = response.json()['choices'][0]['message']['content']
-            print(f"===== RAW RESPONSE FROM LLM ({service_name}) =====")
-            print(raw_response_content)
-            print("="*50 + "\n")
-            # --- END DEBUG ---
-            
-            return raw_response_content
-            
+            data = response.json()
+            content = self._extract_content(data, service_name)
+            self.scheduler.settle(model, tokens, data.get("usage"))
+            self._record_call(service_name, model, time.perf_counter() - start, response.status_code,
+                              attempt, data.get("usage"))
+            return content
+
+    def _acquire_slot(self, breaker, model: str, tokens: int, service_name: str):
+        """Menunggu slot rate limiter; slot probe half-open dilepas jika slot tidak didapat."""
+        try:
+            self.scheduler.acquire(model, tokens, f"llm_rate_limit:{service_name}")
+        except BaseException:
+            breaker.release_probe()
+            raise
+
+    async def _aacquire_slot(self, breaker, model: str, tokens: int, service_name: str):
+        try:
+            await self.scheduler.aacquire(model, tokens, f"llm_rate_limit:{service_name}")
+        except BaseException:
+            breaker.release_probe()
+            raise
+
+    def _pause_if_rate_limited(self, model: str, response):
+        """429 dari provider: tahan semua panggilan ke model ini selama Retry-After (atau jeda dasar retry)."""
+        if response.status_code == 429:
+            retry_after = self.retry_policy.parse_retry_after(response.headers.get("Retry-After"))
+            self.scheduler.pause(model, retry_after if retry_after is not None else self.retry_policy.base_delay)
+
+    def _retry_delay(self, attempt: int, can_retry: bool, service_name: str, retry_after: str = None):
+        """Jeda sebelum retry, atau None jika tidak boleh retry (jatah habis, breaker, atau sisa deadline tidak cukup)."""
+        if not can_retry:
+            return None
+        delay = self.retry_policy.backoff(attempt, retry_after)
+        if delay is not None and not fits_in_budget(delay, f"llm_retry:{service_name}"):
+            return None
+        return delay
+
+    def _wait_before_retry(self, delay: float, attempt: int, service_name: str, reason):
+        print(f"Retrying LLM call ({service_name}) after {reason} in {delay:.2f}s (attempt {attempt + 1})")
+        self.retry_policy.record_retry(service_name)
+        time.sleep(delay)
+
+    def invoke_stream(self, prompt: str, model: str = None, service_name: str = "LLM",
+                      use_cache: bool = None):
+        """
+        Versi streaming dari `invoke` (`stream=true`): generator yang menghasilkan
+        potongan teks segera setelah diterima dari provider.
+
+        Kontrak kompatibel dengan `invoke`: gabungan semua potongan sama dengan
+        respons `invoke`. Cache hit dikirim sebagai satu potongan, dan kegagalan
+        sebelum token pertama menghasilkan satu potongan JSON error yang sama
+        dengan `invoke`. Hasil lengkap disimpan ke cache dengan kunci yang sama
+        seperti panggilan non-streaming.
+
+        Raises:
+            requests.exceptions.RequestException: jika koneksi putus di tengah stream
+        """
+        if not self._is_configured():
+            yield json.dumps({"error": "API Key for OpenRouter is not configured."})
+            return
+
+        route = self.router.resolve(service_name)
+        model_to_use = model or route["model"]
+        timeout = route.get("timeout", self.timeout)
+        headers, payload = self._build_request(prompt, model_to_use, route)
+
+        cache_key = self._cache_key(payload, service_name, use_cache)
+        if cache_key:
+            cached = self.cache.get(cache_key, service_name)
+            if cached is not None:
+                self._log_cache_hit(service_name)
+                self.metrics.observe_cache(service_name, model_to_use, "hit")
+                yield cached
+                return
+        self.metrics.observe_cache(service_name, model_to_use, "miss" if cache_key else "bypass")
+
+        stream_payload = dict(payload, stream=True, stream_options={"include_usage": True})
+        start = time.perf_counter()
+        try:
+            response, attempt = self._open_stream(headers, stream_payload, model_to_use, service_name, timeout, start)
         except requests.exceptions.RequestException as e:
             print(f"Error calling LLM API: {e}")
-            return json.dumps({"error": "Failed to communicate with the LLM service."})
-    
-    def parse_json_response(self, response: str, default_on_error=None):
+            yield json.dumps({"error": "Failed to communicate with the LLM service."})
+            return
+        except CircuitOpenError as e:
+            print(f"Skipping LLM call: {e}")
+            yield json.dumps({"error": "LLM service is temporarily unavailable. Please try again later."})
+            return
+        except DeadlineExceeded as e:
+            print(f"Skipping LLM call ({service_name}): {e}")
+            yield _deadline_error(e)
+            return
+        except RateLimitExceeded as e:
+            print(f"Skipping LLM call ({service_name}): {e}")
+            yield json.dumps({"error": RATE_LIMIT_ERROR})
+            return
+
+        parts = []
+        usage = None
+        try:
+            # Saat klien pergi, koneksi upstream ditutup dari thread pemantau sehingga pembacaan berhenti
+            with on_request_cancel(response.close, f"llm_stream:{service_name}"):
+                for data in self._iter_sse_data(response):
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    usage = chunk.get("usage") or usage
+                    choices = chunk.get("choices") or [{}]
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        if not parts:
+                            self.metrics.observe_first_token(service_name, model_to_use, time.perf_counter() - start)
+                        parts.append(delta)
+                        yield delta
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+            # Response yang ditutup dari thread lain membuat urllib3 melempar AttributeError/ValueError;
+            # jika itu karena pembatalan, laporkan sebagai RequestCancelled, bukan kegagalan provider
+            check_cancelled(f"llm_stream:{service_name}")
+            print(f"LLM stream interrupted ({service_name}): {e}")
+            self._record_call(service_name, model_to_use, time.perf_counter() - start, "error", attempt)
+            raise
+        finally:
+            # Juga berjalan saat consumer berhenti membaca (GeneratorExit): koneksi upstream ditutup
+            response.close()
+
+        content = "".join(parts)
+        print(f"===== STREAMED RESPONSE FROM LLM ({service_name}) =====")
+        print(content)
+        print("="*50 + "\n")
+        self.scheduler.settle(model_to_use, estimate_tokens(stream_payload), usage)
+        self._record_call(service_name, model_to_use, time.perf_counter() - start, 200, attempt, usage)
+        if cache_key:
+            self.cache.set(cache_key, content, service_name, model_to_use)
+
+    def _open_stream(self, headers: dict, payload: dict, model: str, service_name: str,
+                     timeout: float, start: float) -> tuple:
+        """
+        Membuka request streaming dengan retry dan circuit breaker yang sama seperti `_send`.
+        Retry hanya mungkin sebelum byte pertama body diterima.
+
+        Returns:
+            tuple: (response streaming dengan status 200, jumlah retry)
+        """
+        remaining_timeout(timeout, f"llm:{service_name}")
+        breaker = self.circuit_breakers.get(model)
+        if not breaker.allow():
+            self._record_call(service_name, model, 0.0, "circuit_open")
+            raise CircuitOpenError(model)
+
+        attempt = 0
+        tokens = estimate_tokens(payload)
+        while True:
+            can_retry = breaker.state == breaker.CLOSED
+            self._acquire_slot(breaker, model, tokens, service_name)
+            try:
+                self._log_request(model, service_name)
+                response = self.transport.post(
+                    url=self.api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=remaining_timeout(timeout, f"llm:{service_name}"),
+                    stream=True
+                )
+            except requests.exceptions.RequestException as e:
+                # Hanya kegagalan koneksi yang di-retry
+                retryable = isinstance(e, requests.exceptions.ConnectionError)
+                delay = self._retry_delay(attempt, can_retry, service_name) if retryable else None
+                if delay is not None:
+                    self._wait_before_retry(delay, attempt, service_name, e)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+                self._record_call(service_name, model, time.perf_counter() - start, "error", attempt)
+                raise
+
+            if response.status_code == 200:
+                breaker.record_success()
+                self._log_response(response.status_code, "", service_name)
+                return response, attempt
+
+            self._log_response(response.status_code, response.text, service_name)
+            self._pause_if_rate_limited(model, response)
+            if self.retry_policy.is_retryable_status(response.status_code):
+                delay = self._retry_delay(attempt, can_retry, service_name, response.headers.get("Retry-After"))
+                if delay is not None:
+                    response.close()
+                    self._wait_before_retry(delay, attempt, service_name, response.status_code)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            self._record_call(service_name, model, time.perf_counter() - start, response.status_code, attempt)
+            response.close()
+            response.raise_for_status()
+
+    @staticmethod
+    def _iter_sse_data(response):
+        """Menghasilkan field `data` dari setiap event SSE; komentar keep-alive (`:`) diabaikan."""
+        # SSE selalu UTF-8; potongan kecil agar event diteruskan begitu tiba
+        response.encoding = "utf-8"
+        for line in response.iter_lines(chunk_size=128, decode_unicode=True):
+            if line and line.startswith("data:"):
+                yield line[5:].strip()
+
+    async def _asend(self, headers: dict, payload: dict, model: str, service_name: str, timeout: float) -> str:
+        """Versi asinkron dari `_send`. Melempar httpx.HTTPError, CircuitOpenError, RateLimitExceeded, atau DeadlineExceeded jika gagal."""
+        remaining_timeout(timeout, f"llm:{service_name}")
+        breaker = self.circuit_breakers.get(model)
+        if not breaker.allow():
+            self._record_call(service_name, model, 0.0, "circuit_open")
+            raise CircuitOpenError(model)
+
+        attempt = 0
+        start = time.perf_counter()
+        tokens = estimate_tokens(payload)
+        while True:
+            can_retry = breaker.state == breaker.CLOSED
+            await self._aacquire_slot(breaker, model, tokens, service_name)
+            try:
+                self._log_request(model, service_name)
+                response = await self.async_transport.post(
+                    self.api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=remaining_timeout(timeout, f"llm:{service_name}")
+                )
+            except asyncio.CancelledError:
+                # Request dibatalkan (misalnya kalah hedging): bukan kegagalan provider
+                breaker.release_probe()
+                raise
+            except httpx.HTTPError as e:
+                retryable = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                delay = self._retry_delay(attempt, can_retry, service_name) if retryable else None
+                if delay is not None:
+                    await self._await_before_retry(delay, attempt, service_name, e)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+                self._record_call(service_name, model, time.perf_counter() - start, "error", attempt)
+                raise
+
+            self._log_response(response.status_code, response.text, service_name)
+            self._pause_if_rate_limited(model, response)
+            if self.retry_policy.is_retryable_status(response.status_code):
+                delay = self._retry_delay(attempt, can_retry, service_name, response.headers.get("Retry-After"))
+                if delay is not None:
+                    await self._await_before_retry(delay, attempt, service_name, response.status_code)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.status_code >= 400:
+                self._record_call(service_name, model, time.perf_counter() - start, response.status_code, attempt)
+            response.raise_for_status()
+            data = response.json()
+            content = self._extract_content(data, service_name)
+            self.scheduler.settle(model, tokens, data.get("usage"))
+            self._record_call(service_name, model, time.perf_counter() - start, response.status_code,
+                              attempt, data.get("usage"))
+            return content
+
+    async def _await_before_retry(self, delay: float, attempt: int, service_name: str, reason):
+        print(f"Retrying LLM call ({service_name}) after {reason} in {delay:.2f}s (attempt {attempt + 1})")
+        self.retry_policy.record_retry(service_name)
+        await asyncio.sleep(delay)
+
+    async def _ahedged_send(self, headers: dict, payload: dict, model: str,
+                            service_name: str, timeout: float, hedge: dict) -> str:
+        """
+        Mengirim request ke model utama; jika belum selesai setelah batas
+        persentil latensi, prompt yang sama dikirim ke model sekunder.
+        Jawaban sukses pertama dipakai dan request lainnya dibatalkan.
+        """
+        primary = asyncio.create_task(self._asend(headers, payload, model, service_name, timeout))
+        delay = self.hedging.hedge_delay(service_name, model, hedge)
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        secondary_model = hedge["secondary_model"]
+        print(f"Hedging LLM call ({service_name}): {model} exceeded {delay:.2f}s, sending to {secondary_model}")
+        self.hedging.record(service_name, "fired")
+        secondary = asyncio.create_task(
+            self._asend(headers, dict(payload, model=secondary_model), secondary_model, service_name, timeout)
+        )
+
+        pending = {primary, secondary}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.hedging.record(service_name, "won" if task is secondary else "lost")
+                        return task.result()
+            # Keduanya gagal: laporkan kegagalan model utama
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def parse_json_response(self, response: str, default_on_error=None, cache_key: str = None,
+                            allow_truncated: bool = False):
         """
         Mengekstrak dan mem-parsing JSON dari respons LLM yang mungkin berisi teks tambahan.
         
         Args:
             response (str): Respons mentah dari LLM
             default_on_error: Nilai default jika parsing gagal
+            cache_key (str): Kunci cache respons (lihat `cache_key_for`); entri dihapus jika parsing gagal
+            allow_truncated (bool): Terima output terpotong yang diperbaiki; hanya untuk
+                hasil yang kemudian divalidasi terhadap skema
             
         Returns:
             dict: JSON yang telah diparsing atau default value jika gagal
         """
         try:
-            match = re.search(r'\{.*\}', response, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                # Bersihkan trailing comma
-                json_str = re.sub(r',\s*}', '}', json_str)
-                json_str = re.sub(r',\s*]', ']', json_str)
-                return json.loads(json_str)
-            print(f"DEBUG: No JSON object found in LLM response: {response}")
-        except json.JSONDecodeError as e:
-            print(f"DEBUG: JSON decode error: {e}. Response: {response}")
+            repairs = []
+            parsed = extract_json(response, start_chars="{", repairs=repairs, allow_truncated=allow_truncated)
+            if repairs:
+                print(f"DEBUG: Repaired LLM JSON response: {', '.join(sorted(set(repairs)))}")
+            return parsed
+        except JSONExtractionError as e:
+            print(f"DEBUG: JSON extraction error: {e}. Response: {response}")
+
+        # Jangan biarkan completion yang tidak bisa diparsing tersaji ulang dari cache
+        if cache_key:
+            self.cache.discard(cache_key)
         
         return default_on_error if default_on_error is not None else {"error": "Invalid JSON response from LLM."}
 
 
+    def invoke_structured(self, prompt: str, schema: dict, schema_name: str, model: str = None,
+                          service_name: str = "LLM", use_cache: bool = None) -> dict:
+        """
+        Mengirim prompt dengan skema JSON lewat `response_format` dan memvalidasi hasilnya.
+
+        Args:
+            prompt (str): Prompt yang akan dikirim ke LLM
+            schema (dict): JSON Schema output (lihat `structured_output.py`)
+            schema_name (str): Nama skema untuk provider
+            model (str): Model LLM yang akan digunakan (opsional)
+            service_name (str): Nama service untuk debugging (opsional)
+            use_cache (bool): Paksa pakai/lewati cache (opsional)
+
+        Returns:
+            dict: Output yang valid terhadap skema, atau dict berisi "error"
+        """
+        response_format = build_response_format(schema_name, schema) if self.structured_output_enabled else None
+        response, cache_key = self.invoke_with_key(prompt, model, service_name, use_cache, response_format)
+        # Tanpa skema di request, model tidak dibatasi: hanya key yang dibaca pemanggil yang diperiksa
+        return self.parse_structured_response(
+            response, schema, service_name, cache_key, strict=response_format is not None
+        )
+
+    def parse_structured_response(self, response: str, schema: dict, service_name: str = "LLM",
+                                  cache_key: str = None, strict: bool = True) -> dict:
+        """
+        Mem-parsing respons LLM lalu memvalidasinya terhadap skema; entri cache `cache_key` dihapus jika tidak valid.
+        `strict=False` melonggarkan validasi objek (lihat `structured_output.validate`).
+        """
+        # Output terpotong boleh diperbaiki: data yang hilang tertangkap oleh validasi skema
+        parsed = self.parse_json_response(response, cache_key=cache_key, allow_truncated=True)
+        if not isinstance(parsed, dict) or "error" in parsed:
+            return parsed
+        errors = validate_schema(parsed, schema, strict=strict)
+        if errors:
+            print(f"DEBUG: {service_name} response does not match schema: {errors[:5]}")
+            # Output yang tidak valid jangan sampai tersaji ulang dari cache
+            if cache_key:
+                self.cache.discard(cache_key)
+            return {"error": "LLM response does not match the expected format.", "details": errors[:5]}
+        return parsed
+
+
 # Singleton instance untuk digunakan di seluruh aplikasi
 llm_client = LLMClient()
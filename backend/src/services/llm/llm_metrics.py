@@ -0,0 +1,173 @@
+"""
+LLM Metrics Module
+Counter dan histogram per panggilan LLM (latensi upstream, token, status,
+retry, dan hasil cache) yang dikelompokkan per `service_name` dan model,
+lalu dirender dalam format teks Prometheus untuk route `/metrics`.
+"""
+
+import bisect
+import threading
+
+# Batas bucket latensi upstream (detik); completion LLM biasanya 0.5-30 detik
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+# Batas bucket jumlah token per panggilan
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_counter(name: str, help_text: str, samples: list, metric_type: str = "counter") -> str:
+    """Merender satu counter di luar registry LLM (sampel: list (labels, nilai)) dalam format Prometheus."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def render_gauge(name: str, help_text: str, samples: list) -> str:
+    """Seperti `render_counter`, untuk nilai sesaat (misalnya kedalaman antrian)."""
+    return render_counter(name, help_text, samples, metric_type="gauge")
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # bucket terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class LLMMetrics:
+    """Registry metrik LLM yang thread-safe, tanpa dependensi ke prometheus_client."""
+
+    # nama metrik -> (tipe, keterangan)
+    METRICS = {
+        "llm_requests_total": ("counter", "Panggilan upstream ke LLM per status akhir (kode HTTP, error, circuit_open)."),
+        "llm_retries_total": ("counter", "Jumlah retry ke upstream."),
+        "llm_tokens_total": ("counter", "Token yang dilaporkan field usage API, per tipe (prompt/completion)."),
+        "llm_cost_usd_total": ("counter", "Estimasi biaya panggilan LLM dalam USD."),
+        "llm_cache_requests_total": ("counter", "Hasil lookup cache per invoke (hit, miss, coalesced, bypass)."),
+        "llm_upstream_latency_seconds": ("histogram", "Latensi panggilan upstream termasuk retry."),
+        "llm_prompt_tokens": ("histogram", "Jumlah prompt token per panggilan."),
+        "llm_completion_tokens": ("histogram", "Jumlah completion token per panggilan."),
+        "llm_stream_first_token_seconds": ("histogram", "Waktu sampai token pertama pada panggilan streaming."),
+        "llm_rate_limit_requests_total": ("counter", "Hasil antrian rate limiter client-side per model dan jalur prioritas (granted, rejected, timeout, cancelled)."),
+        "llm_rate_limit_wait_seconds": ("histogram", "Waktu tunggu slot rate limiter sebelum panggilan upstream dikirim."),
+    }
+
+    def __init__(self, latency_buckets: tuple = LATENCY_BUCKETS, token_buckets: tuple = TOKEN_BUCKETS):
+        self.latency_buckets = latency_buckets
+        self.token_buckets = token_buckets
+        self._lock = threading.Lock()
+        self._counters = {}    # (nama, labels) -> nilai
+        self._histograms = {}  # (nama, labels) -> _Histogram
+
+    def _inc(self, name: str, labels: tuple, amount=1):
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def _observe(self, name: str, labels: tuple, value: float, buckets: tuple):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = _Histogram(buckets)
+        histogram.observe(value)
+
+    def observe_call(self, service_name: str, model: str, elapsed: float, status: str,
+                     retries: int = 0, usage: dict = None, cost: float = 0.0):
+        """
+        Mencatat satu panggilan upstream (sudah termasuk semua retry-nya).
+
+        Args:
+            service_name (str): Nama agent pemanggil
+            model (str): Model yang dipanggil
+            elapsed (float): Latensi total dalam detik
+            status (str): Kode HTTP akhir, "error" (gagal koneksi/timeout), atau "circuit_open"
+            retries (int): Jumlah retry yang dilakukan
+            usage (dict): Field `usage` dari respons API (opsional)
+            cost (float): Estimasi biaya dalam USD
+        """
+        labels = (("service", service_name), ("model", model))
+        with self._lock:
+            self._inc("llm_requests_total", labels + (("status", status),))
+            if retries:
+                self._inc("llm_retries_total", labels, retries)
+            if status == "circuit_open":
+                # Tidak ada request yang dikirim, latensi tidak relevan
+                return
+            self._observe("llm_upstream_latency_seconds", labels, elapsed, self.latency_buckets)
+            if usage:
+                for token_type in ("prompt", "completion"):
+                    tokens = usage.get(f"{token_type}_tokens")
+                    if tokens is None:
+                        continue
+                    self._inc("llm_tokens_total", labels + (("type", token_type),), tokens)
+                    self._observe(f"llm_{token_type}_tokens", labels, tokens, self.token_buckets)
+            if cost:
+                self._inc("llm_cost_usd_total", labels, cost)
+
+    def observe_first_token(self, service_name: str, model: str, elapsed: float):
+        """Mencatat waktu sampai token pertama untuk panggilan streaming."""
+        labels = (("service", service_name), ("model", model))
+        with self._lock:
+            self._observe("llm_stream_first_token_seconds", labels, elapsed, self.latency_buckets)
+
+    def observe_rate_limit(self, model: str, lane: str, waited: float, outcome: str):
+        """Mencatat satu antrian rate limiter: lama menunggu dan hasilnya."""
+        labels = (("model", model), ("lane", lane))
+        with self._lock:
+            self._inc("llm_rate_limit_requests_total", labels + (("outcome", outcome),))
+            self._observe("llm_rate_limit_wait_seconds", labels, waited, self.latency_buckets)
+
+    def observe_cache(self, service_name: str, model: str, outcome: str):
+        """Mencatat hasil lookup cache satu invoke: 'hit', 'miss', 'coalesced', atau 'bypass'."""
+        labels = (("service", service_name), ("model", model), ("outcome", outcome))
+        with self._lock:
+            self._inc("llm_cache_requests_total", labels)
+
+    def render(self) -> str:
+        """Merender seluruh metrik dalam format teks Prometheus (text/plain; version=0.0.4)."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                ((key, list(h.counts), h.sum, h.count, h.buckets) for key, h in self._histograms.items()),
+                key=lambda item: item[0]
+            )
+
+        lines = []
+        for name, (metric_type, help_text) in self.METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == "counter":
+                for (metric_name, labels), value in counters:
+                    if metric_name == name:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            for (metric_name, labels), counts, total, count, buckets in histograms:
+                if metric_name != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    le = bound if bound == "+Inf" else _format_value(float(bound))
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
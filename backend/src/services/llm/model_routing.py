@@ -0,0 +1,149 @@
+"""
+Model Routing Module
+Tabel routing berbasis konfigurasi yang memetakan `service_name` ke model,
+max_tokens, temperature, dan timeout, beserta batas rate per model. File
+routing dimuat ulang otomatis ketika berubah, sehingga tuning tidak
+membutuhkan restart. Modul ini juga mencatat latensi, token, dan estimasi
+biaya per route.
+"""
+
+import json
+import os
+import threading
+import time
+
+ROUTE_PARAMS = ("model", "max_tokens", "temperature", "timeout")
+
+
+class ModelRouter:
+    """Resolusi parameter generasi per service dan laporan biaya/latensi per route."""
+
+    def __init__(self, path: str, default_model: str, default_timeout: float = 30,
+                 check_interval: float = 5):
+        self.path = path
+        self.default_route = {"model": default_model, "timeout": default_timeout}
+        self.check_interval = check_interval
+        self._routes = {}
+        self._pricing = {}
+        self._rate_limits = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._usage = {}  # service_name -> counter
+        self.reload()
+
+    def reload(self) -> bool:
+        """
+        Memuat ulang file routing. Jika file tidak ada atau tidak valid,
+        tabel terakhir yang valid tetap dipakai.
+
+        Returns:
+            bool: True jika tabel berhasil dimuat
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            routes = config.get("routes", {})
+            pricing = config.get("pricing_per_million_tokens", {})
+            rate_limits = config.get("rate_limits", {})
+        except FileNotFoundError:
+            print(f"LLM routing file not found at {self.path}, using default model for all services.")
+            return False
+        except (OSError, ValueError) as e:
+            print(f"Failed to load LLM routing file {self.path}: {e}")
+            return False
+
+        with self._lock:
+            self._routes = routes
+            self._pricing = pricing
+            self._rate_limits = rate_limits
+            self._mtime = mtime
+        print(f"LLM routing table loaded: {len(routes)} routes.")
+        return True
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            changed = os.path.getmtime(self.path) != self._mtime
+        except OSError:
+            return
+        if changed:
+            self.reload()
+
+    def resolve(self, service_name: str) -> dict:
+        """
+        Mengembalikan parameter route untuk service: entri service di atas
+        entri "default", di atas default bawaan client.
+        """
+        self._reload_if_changed()
+        with self._lock:
+            route = dict(self.default_route)
+            route.update(self._routes.get("default", {}))
+            route.update(self._routes.get(service_name, {}))
+        return {key: route[key] for key in ROUTE_PARAMS if route.get(key) is not None}
+
+    def rate_limit(self, model: str) -> dict:
+        """
+        Batas rate client-side untuk model: entri model di atas entri "default".
+
+        Returns:
+            dict: {"requests_per_minute": n, "tokens_per_minute": n} (0/absen = tanpa batas)
+        """
+        self._reload_if_changed()
+        with self._lock:
+            limits = dict(self._rate_limits.get("default", {}))
+            limits.update(self._rate_limits.get(model, {}))
+        return limits
+
+    def estimate_cost(self, model: str, usage: dict) -> float:
+        """Estimasi biaya (USD) dari field `usage` respons API dan tabel harga per model."""
+        with self._lock:
+            price = self._pricing.get(model)
+        if not price or not usage:
+            return 0.0
+        return (
+            usage.get("prompt_tokens", 0) * price.get("prompt", 0)
+            + usage.get("completion_tokens", 0) * price.get("completion", 0)
+        ) / 1_000_000
+
+    def record(self, service_name: str, model: str, elapsed: float, usage: dict = None, ok: bool = True):
+        """Mencatat satu panggilan upstream untuk laporan per route."""
+        usage = usage or {}
+        cost = self.estimate_cost(model, usage) if ok else 0.0
+        with self._lock:
+            counter = self._usage.setdefault(service_name, {
+                "calls": 0, "errors": 0, "latency_seconds_total": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0, "models": {}
+            })
+            counter["calls"] += 1
+            counter["errors"] += 0 if ok else 1
+            counter["latency_seconds_total"] += elapsed
+            counter["prompt_tokens"] += usage.get("prompt_tokens", 0)
+            counter["completion_tokens"] += usage.get("completion_tokens", 0)
+            counter["cost_usd"] += cost
+            counter["models"][model] = counter["models"].get(model, 0) + 1
+
+    def report(self) -> dict:
+        """Laporan per route: model yang dikonfigurasi, latensi rata-rata, token, dan biaya."""
+        report = {}
+        with self._lock:
+            services = set(self._routes) | set(self._usage)
+            usage = {name: dict(counter, models=dict(counter["models"])) for name, counter in self._usage.items()}
+        for service_name in sorted(services - {"default"}):
+            counter = usage.get(service_name, {})
+            calls = counter.get("calls", 0)
+            report[service_name] = {
+                "route": self.resolve(service_name),
+                "calls": calls,
+                "errors": counter.get("errors", 0),
+                "avg_latency_ms": round(counter["latency_seconds_total"] / calls * 1000, 1) if calls else None,
+                "prompt_tokens": counter.get("prompt_tokens", 0),
+                "completion_tokens": counter.get("completion_tokens", 0),
+                "cost_usd": round(counter.get("cost_usd", 0.0), 6),
+                "models": counter.get("models", {})
+            }
+        return report
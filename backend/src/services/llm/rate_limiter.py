@@ -0,0 +1,368 @@
+"""
+Rate Limiter Module
+Penjadwal client-side di depan panggilan upstream OpenRouter: token bucket
+per model untuk request/menit dan token/menit, antrian tunggu terbatas, dan
+jalur prioritas sehingga route interaktif (misalnya `/assessment/start`)
+didahulukan dari prefetch background dan pre-generation batch.
+
+Saat beban cohort melebihi kuota provider, panggilan menunggu giliran di
+antrian alih-alih semuanya gagal 429 bersamaan. Respons 429 dari provider
+juga menghentikan sementara bucket model tersebut selama Retry-After.
+
+Batas dibaca dari tabel routing (`rate_limits` per model) dan berlaku per
+proses server. `limits_for` bisa membaca file (reload tabel routing), jadi
+selalu dipanggil di luar lock scheduler; bucket dikonfigurasi ulang setiap
+ada panggilan baru ke model tersebut.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, CancelledError, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from src.services.request_deadline import (
+    remaining_timeout, on_request_cancel, check_cancelled, DeadlineExceeded, RequestCancelled
+)
+
+# Urutan = prioritas: jalur pertama dilayani lebih dulu
+LANES = ("interactive", "background", "batch")
+
+# Perkiraan token untuk panggilan tanpa max_tokens di route
+DEFAULT_COMPLETION_TOKENS = 1024
+
+class LanePriority:
+    """
+    Jalur prioritas sebuah pekerjaan. Bisa dinaikkan saat pekerjaan sedang
+    berjalan (misalnya job background yang kemudian ditunggu request
+    interaktif); waiter yang sudah mengantri ikut naik pada dispatch berikutnya.
+    """
+    __slots__ = ("lane",)
+
+    def __init__(self, lane: str):
+        if lane not in LANES:
+            raise ValueError(f"Unknown LLM priority lane: {lane}")
+        self.lane = lane
+
+    def promote(self, lane: str):
+        """Menaikkan jalur ke `lane`; tidak pernah menurunkan prioritas."""
+        if LANES.index(lane) < LANES.index(self.lane):
+            self.lane = lane
+
+
+_priority = contextvars.ContextVar("llm_priority", default=LanePriority("interactive"))
+
+
+@contextmanager
+def llm_priority(lane):
+    """
+    Menjalankan panggilan LLM di dalam blok pada jalur prioritas `lane`
+    (nama jalur atau `LanePriority` milik pemanggil agar bisa dinaikkan nanti).
+    """
+    priority = lane if isinstance(lane, LanePriority) else LanePriority(lane)
+    token = _priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get().lane
+
+
+def estimate_tokens(payload: dict) -> int:
+    """Perkiraan kasar token satu panggilan: ~4 karakter per token prompt ditambah max_tokens."""
+    prompt_chars = sum(len(message.get("content") or "") for message in payload.get("messages", []))
+    return prompt_chars // 4 + (payload.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+
+class RateLimitExceeded(Exception):
+    """Dilempar saat antrian tunggu penuh atau slot tidak didapat dalam batas waktu tunggu."""
+
+    def __init__(self, model: str, reason: str):
+        super().__init__(f"Client-side rate limit for model '{model}': {reason}")
+        self.model = model
+        self.reason = reason
+
+
+class TokenBucket:
+    """Token bucket dengan kapasitas per menit; kapasitas 0 berarti tanpa batas."""
+
+    def __init__(self, per_minute: float = 0):
+        self.per_minute = 0
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.configure(per_minute)
+
+    def configure(self, per_minute: float):
+        """Mengubah kapasitas (misalnya setelah file routing dimuat ulang) tanpa mereset isi bucket."""
+        per_minute = per_minute or 0
+        if per_minute == self.per_minute:
+            return
+        self._refill(time.monotonic())
+        self.tokens = per_minute if not self.per_minute else min(self.tokens, per_minute)
+        self.per_minute = per_minute
+
+    def _refill(self, now: float):
+        if self.per_minute:
+            self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Detik sampai `amount` tersedia (0 jika sudah tersedia)."""
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        # Panggilan yang lebih besar dari kapasitas tetap bisa lewat saat bucket penuh
+        amount = min(amount, self.per_minute)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60 / self.per_minute
+
+    def take(self, amount: float):
+        if self.per_minute:
+            self.tokens -= min(amount, self.per_minute)
+
+    def adjust(self, delta: float):
+        """Mengembalikan (delta positif) atau menambah (delta negatif) pemakaian; isi boleh negatif."""
+        if self.per_minute:
+            self.tokens = min(self.per_minute, self.tokens + delta)
+
+
+class _ModelLimiter:
+    def __init__(self):
+        self.requests = TokenBucket()
+        self.tokens = TokenBucket()
+        self.paused_until = 0.0
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        return max(self.paused_until - now, self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "model", "tokens", "future", "enqueued_at")
+
+    def __init__(self, priority: LanePriority, seq: int, model: str, tokens: int):
+        self.priority = priority
+        self.seq = seq
+        self.model = model
+        self.tokens = tokens
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def lane(self) -> int:
+        # Dibaca ulang setiap dispatch: jalur bisa dinaikkan selama menunggu
+        return LANES.index(self.priority.lane)
+
+
+class RateLimitScheduler:
+    """
+    Penjadwal slot upstream per model dengan antrian prioritas.
+
+    Waiter dilayani berdasarkan (jalur, urutan datang). Dalam satu model,
+    waiter di belakang tidak boleh mendahului waiter di depannya yang masih
+    menunggu bucket, sehingga panggilan besar tidak kelaparan; model lain
+    tetap bisa jalan. Satu thread dispatcher membangunkan antrian saat
+    bucket terisi kembali.
+    """
+
+    def __init__(self, limits_for, max_queue: int = 200, max_wait: float = 30,
+                 enabled: bool = True, metrics=None):
+        """
+        Args:
+            limits_for (callable): limits_for(model) -> {"requests_per_minute": n, "tokens_per_minute": n}
+            max_queue (int): Maksimal panggilan yang menunggu slot sekaligus
+            max_wait (float): Batas waktu tunggu (detik) jika request tidak punya deadline lebih pendek
+            enabled (bool): False untuk meneruskan semua panggilan tanpa pembatasan
+            metrics (LLMMetrics): Registry untuk waktu tunggu dan hasil antrian (opsional)
+        """
+        self.limits_for = limits_for
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.enabled = enabled
+        self.metrics = metrics
+        self._limiters = {}  # model -> _ModelLimiter
+        self._waiters = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stats = {"granted": 0, "queued": 0, "rejected": 0, "timeout": 0, "cancelled": 0}
+
+    def _limiter(self, model: str, limits: dict = None) -> _ModelLimiter:
+        """Limiter model (dipanggil di bawah lock); `limits` dari `limits_for` mengonfigurasi ulang bucket."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = _ModelLimiter()
+        if limits is not None:
+            limiter.requests.configure(limits.get("requests_per_minute", 0))
+            limiter.tokens.configure(limits.get("tokens_per_minute", 0))
+        return limiter
+
+    def _enqueue(self, model: str, tokens: int, priority: LanePriority) -> _Waiter:
+        # Di luar lock: limits_for bisa memuat ulang file routing
+        limits = self.limits_for(model) or {}
+        with self._cond:
+            self._limiter(model, limits)
+            if len(self._waiters) >= self.max_queue:
+                raise RateLimitExceeded(model, f"wait queue is full ({len(self._waiters)} waiting)")
+            self._seq += 1
+            waiter = _Waiter(priority, self._seq, model, tokens)
+            self._waiters.append(waiter)
+            self._dispatch_locked()
+            if not waiter.future.done():
+                self._stats["queued"] += 1
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="llm-rate-limiter", daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+        return waiter
+
+    def _dispatch_locked(self) -> float:
+        """Memberi slot ke waiter yang bisa jalan; mengembalikan detik sampai pengecekan berikutnya."""
+        now = time.monotonic()
+        next_check = None
+        blocked = set()
+        remaining = []
+        for waiter in sorted(self._waiters, key=lambda w: (w.lane, w.seq)):
+            if waiter.future.cancelled():
+                continue
+            if waiter.model in blocked:
+                remaining.append(waiter)
+                continue
+            limiter = self._limiter(waiter.model)
+            wait = limiter.wait_time(waiter.tokens, now)
+            if wait > 0 or not waiter.future.set_running_or_notify_cancel():
+                if wait > 0:
+                    blocked.add(waiter.model)
+                    remaining.append(waiter)
+                    next_check = wait if next_check is None else min(next_check, wait)
+                continue
+            limiter.requests.take(1)
+            limiter.tokens.take(waiter.tokens)
+            self._stats["granted"] += 1
+            waiter.future.set_result(now - waiter.enqueued_at)
+        self._waiters = remaining
+        return next_check
+
+    def _run(self):
+        with self._cond:
+            while True:
+                next_check = self._dispatch_locked()
+                self._cond.wait(next_check)
+
+    def _observe(self, model: str, lane: str, waited: float, outcome: str):
+        if outcome != "granted":
+            with self._cond:
+                self._stats[outcome] += 1
+        if self.metrics is not None:
+            self.metrics.observe_rate_limit(model, lane, waited, outcome)
+
+    def acquire(self, model: str, tokens: int, stage: str) -> float:
+        """
+        Menunggu slot untuk satu panggilan upstream (memblokir thread pemanggil).
+
+        Args:
+            model (str): Model tujuan
+            tokens (int): Perkiraan token panggilan (lihat `estimate_tokens`)
+            stage (str): Nama tahap untuk pencatatan deadline, misalnya "llm_rate_limit:Final Analyzer"
+
+        Returns:
+            float: Lama menunggu di antrian (detik)
+
+        Raises:
+            RateLimitExceeded: jika antrian penuh atau menunggu melebihi `max_wait`
+            DeadlineExceeded: jika deadline request habis selama menunggu
+        """
+        if not self.enabled:
+            return 0.0
+        lane = current_priority()
+        timeout = remaining_timeout(self.max_wait, stage)
+        try:
+            waiter = self._enqueue(model, tokens, _priority.get())
+        except RateLimitExceeded:
+            self._observe(model, lane, 0.0, "rejected")
+            raise
+        try:
+            with on_request_cancel(waiter.future.cancel, stage):
+                waited = waiter.future.result(timeout)
+        except FutureTimeoutError:
+            return self._give_up(waiter, lane, timeout, stage)
+        except (CancelledError, RequestCancelled):
+            waiter.future.cancel()
+            self._observe(model, lane, time.monotonic() - waiter.enqueued_at, "cancelled")
+            check_cancelled(stage)
+            raise
+        self._observe(model, lane, waited, "granted")
+        return waited
+
+    async def aacquire(self, model: str, tokens: int, stage: str) -> float:
+        """Versi asinkron dari `acquire` (tidak memblokir event loop)."""
+        if not self.enabled:
+            return 0.0
+        lane = current_priority()
+        timeout = remaining_timeout(self.max_wait, stage)
+        try:
+            waiter = self._enqueue(model, tokens, _priority.get())
+        except RateLimitExceeded:
+            self._observe(model, lane, 0.0, "rejected")
+            raise
+        try:
+            # Pembatalan task (hedging, request dibatalkan) ikut membatalkan Future waiter
+            waited = await asyncio.wait_for(asyncio.wrap_future(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            return self._give_up(waiter, lane, timeout, stage)
+        except asyncio.CancelledError:
+            self._observe(model, lane, time.monotonic() - waiter.enqueued_at, "cancelled")
+            raise
+        self._observe(model, lane, waited, "granted")
+        return waited
+
+    def _give_up(self, waiter: _Waiter, lane: str, timeout: float, stage: str):
+        # Di bawah lock: dispatcher memberi slot (running -> result) secara atomik
+        with self._cond:
+            waiter.future.cancel()
+        if not waiter.future.cancelled():
+            # Slot diberikan tepat saat batas waktu habis: tetap dipakai
+            waited = waiter.future.result()
+            self._observe(waiter.model, lane, waited, "granted")
+            return waited
+        self._observe(waiter.model, lane, timeout, "timeout")
+        if timeout < self.max_wait:
+            raise DeadlineExceeded(stage, 0.0)
+        raise RateLimitExceeded(waiter.model, f"no slot within {timeout:.0f}s")
+
+    def settle(self, model: str, estimated: int, usage: dict = None):
+        """Mengoreksi bucket token/menit dengan pemakaian sebenarnya dari field `usage` respons."""
+        if not self.enabled or not usage:
+            return
+        actual = usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+        limits = self.limits_for(model) or {}
+        with self._cond:
+            self._limiter(model, limits).tokens.adjust(estimated - actual)
+            self._cond.notify()
+
+    def pause(self, model: str, seconds: float):
+        """Menahan semua panggilan ke model selama `seconds` (misalnya setelah 429 dari provider)."""
+        if not self.enabled or not seconds:
+            return
+        limits = self.limits_for(model) or {}
+        with self._cond:
+            limiter = self._limiter(model, limits)
+            limiter.paused_until = max(limiter.paused_until, time.monotonic() + seconds)
+
+    def queue_depth(self) -> dict:
+        """Jumlah waiter per jalur prioritas."""
+        with self._cond:
+            depth = {lane: 0 for lane in LANES}
+            for waiter in self._waiters:
+                if not waiter.future.cancelled():
+                    depth[LANES[waiter.lane]] += 1
+        return depth
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self.queue_depth()
+        return stats
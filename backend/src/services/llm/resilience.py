@@ -0,0 +1,181 @@
+"""
+Resilience Module
+Kebijakan retry (exponential backoff dengan jitter yang menghormati header
+Retry-After) dan circuit breaker per model untuk panggilan ke OpenRouter.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class CircuitOpenError(Exception):
+    """Dilempar ketika circuit breaker model sedang terbuka (provider dianggap down)."""
+
+    def __init__(self, model: str):
+        super().__init__(f"Circuit breaker for model '{model}' is open")
+        self.model = model
+
+
+class RetryPolicy:
+    """Menentukan kapan request diulang dan berapa lama menunggu sebelum mengulang."""
+
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5, max_delay: float = 8):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._retries_by_service = {}
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.RETRYABLE_STATUS_CODES
+
+    @staticmethod
+    def parse_retry_after(value: str):
+        """Mem-parsing header Retry-After (detik atau HTTP-date). Mengembalikan detik atau None."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def backoff(self, attempt: int, retry_after: str = None):
+        """
+        Menghitung jeda sebelum percobaan berikutnya.
+
+        Args:
+            attempt (int): Nomor percobaan yang baru gagal (mulai dari 0)
+            retry_after (str): Nilai header Retry-After dari upstream (opsional)
+
+        Returns:
+            float | None: Jeda dalam detik, atau None jika tidak boleh retry lagi
+                (jatah habis, atau Retry-After melebihi `max_delay`)
+        """
+        if attempt >= self.max_retries:
+            return None
+        server_delay = self.parse_retry_after(retry_after)
+        if server_delay is not None:
+            return server_delay if server_delay <= self.max_delay else None
+        # Full jitter: acak di antara 0 dan batas eksponensial
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def record_retry(self, service_name: str):
+        with self._lock:
+            self._retries_by_service[service_name] = self._retries_by_service.get(service_name, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            by_service = dict(self._retries_by_service)
+        return {"retries": sum(by_service.values()), "retries_by_service": by_service}
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker sederhana dengan tiga state:
+    - closed: request diteruskan normal
+    - open: request langsung ditolak sampai `recovery_timeout` berlalu
+    - half_open: satu request probe diizinkan untuk mendeteksi pemulihan
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """True jika request boleh dikirim ke upstream."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release_probe(self):
+        """Melepas slot probe half-open tanpa mencatat hasil (misalnya request dibatalkan)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            snapshot = {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self._times_opened
+            }
+            if self._state == self.OPEN:
+                remaining = self.recovery_timeout - (time.monotonic() - self._opened_at)
+                snapshot["retry_in_seconds"] = round(max(0.0, remaining), 1)
+        return snapshot
+
+
+class CircuitBreakerRegistry:
+    """Kumpulan circuit breaker, satu per model."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(model)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+                self._breakers[model] = breaker
+            return breaker
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {model: breaker.snapshot() for model, breaker in breakers.items()}
+
+    def any_open(self) -> bool:
+        return any(snapshot["state"] != CircuitBreaker.CLOSED for snapshot in self.snapshot().values())
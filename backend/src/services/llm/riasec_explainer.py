@@ -40,6 +40,6 @@ def generate_riasec_explanation(user_profile: str, vector_explanation: str):
     print("="*50 + "\n")
     # --- END DEBUG ---
     
-    response = llm_client.invoke(prompt, service_name="RIASEC Explainer")
+    response, cache_key = llm_client.invoke_with_key(prompt, service_name="RIASEC Explainer")
     default_error = {code: "Penjelasan tidak dapat dibuat saat ini." for code in user_profile}
-    return llm_client.parse_json_response(response, default_on_error=default_error)
+    return llm_client.parse_json_response(response, default_on_error=default_error, cache_key=cache_key)
@@ -0,0 +1,83 @@
+"""
+Single Flight Module
+Deduplikasi request LLM yang identik dan sedang berjalan bersamaan: pemanggil
+pertama (leader) mengirim request ke upstream, pemanggil lain dengan kunci
+yang sama menunggu dan memakai hasil yang sama.
+
+Jika leader dibatalkan oleh kliennya sendiri (misalnya klien menutup tab),
+follower yang masih aktif tidak ikut gagal: salah satunya menjadi leader baru.
+"""
+
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from src.services.request_deadline import remaining_timeout, check_cancelled, DeadlineExceeded, RequestCancelled
+
+
+class SingleFlight:
+    """
+    Penggabung panggilan (request coalescing).
+
+    Setiap panggilan in-flight direpresentasikan oleh satu
+    `concurrent.futures.Future` yang ditunggu oleh semua follower.
+    """
+
+    def __init__(self):
+        self._calls = {}  # key -> Future
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0}
+        self._coalesced_by_service = {}
+
+    def _begin(self, key: str, service_name: str):
+        """Mengembalikan (future, is_leader) untuk kunci tersebut."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                self._coalesced_by_service[service_name] = self._coalesced_by_service.get(service_name, 0) + 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._stats["leaders"] += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result=None, error: BaseException = None):
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn, service_name: str = "LLM"):
+        """
+        Menjalankan `fn()` sekali untuk semua pemanggil sinkron dengan kunci yang sama.
+        Exception dari leader diteruskan ke semua pemanggil, kecuali pembatalan leader.
+        """
+        while True:
+            future, is_leader = self._begin(key, service_name)
+            if is_leader:
+                break
+            # Follower menunggu leader paling lama sampai deadline request-nya sendiri
+            timeout = remaining_timeout(None, f"llm_coalesced:{service_name}")
+            try:
+                return future.result(timeout)
+            except FutureTimeoutError:
+                raise DeadlineExceeded(f"llm_coalesced:{service_name}", 0.0)
+            except RequestCancelled:
+                check_cancelled(f"llm_coalesced:{service_name}")
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "leaders": self._stats["leaders"],
+                "coalesced": self._stats["coalesced"],
+                "in_flight": len(self._calls),
+                "coalesced_by_service": dict(self._coalesced_by_service)
+            }
@@ -6,6 +6,7 @@ berdasarkan tipe RIASEC dan target pekerjaan yang diinginkan mahasiswa.
 
 import json
 from .llm_client import llm_client
+from .structured_output import SKILL_ROADMAP_SCHEMA
 
 
 def generate_skill_development_roadmap(riasec_code: str, target_jobs: list) -> str:
@@ -138,10 +139,10 @@ def generate_skill_development_roadmap(riasec_code: str, target_jobs: list) -> s
     print("="*50 + "\n")
     # --- END DEBUG ---
     
-    response = llm_client.invoke(prompt, service_name="Skill Development Roadmap")
-    
-    # Parse JSON response
-    parsed_response = llm_client.parse_json_response(response)
+    # Output dibatasi dan divalidasi terhadap skema JSON
+    parsed_response = llm_client.invoke_structured(
+        prompt, SKILL_ROADMAP_SCHEMA, "skill_roadmap", service_name="Skill Development Roadmap"
+    )
     
     # Jika ada error dalam parsing, kembalikan error
     if "error" in parsed_response:
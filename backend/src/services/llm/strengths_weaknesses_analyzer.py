@@ -8,30 +8,16 @@ import json
 from .llm_client import llm_client
 
 
-def generate_strengths_weaknesses_analysis(riasec_code: str) -> str:
+def build_strengths_weaknesses_prompt(riasec_code: str) -> str:
     """
-    Menghasilkan analisis kekuatan dan area pengembangan berdasarkan kode RIASEC.
+    Menyusun prompt analisis kekuatan dan area pengembangan untuk kode RIASEC yang sudah tervalidasi.
     
     Args:
-        riasec_code (str): Kode RIASEC (e.g., "R", "RIA", "SEC", "E", etc.)
+        riasec_code (str): Kode RIASEC uppercase yang hanya berisi huruf R, I, A, S, E, C
     
     Returns:
-        str: JSON string berisi daftar kekuatan dan area pengembangan
+        str: Prompt yang akan dikirim ke LLM
     """
-    
-    # Validasi input - pastikan hanya berisi huruf RIASEC yang valid
-    valid_letters = set("RIASEC")
-    riasec_code = riasec_code.upper().strip()
-    
-    if not riasec_code:
-        return json.dumps({"error": "RIASEC code cannot be empty"})
-    
-    if not all(letter in valid_letters for letter in riasec_code):
-        return json.dumps({"error": "Invalid RIASEC code. Must contain only letters R, I, A, S, E, C"})
-    
-    if len(riasec_code) > 6:
-        return json.dumps({"error": "RIASEC code cannot be longer than 6 characters"})
-    
     # Mapping huruf ke nama lengkap
     riasec_mapping = {
         "R": "Realistic (Realistis)",
@@ -54,7 +40,7 @@ def generate_strengths_weaknesses_analysis(riasec_code: str) -> str:
     else:
         type_summary = f"kombinasi beragam: {', '.join(type_descriptions[:-1])} dan {type_descriptions[-1]}"
     
-    prompt = f"""
+    return f"""
     Anda adalah seorang konselor karier yang ahli dalam analisis RIASEC. Berikan analisis kekuatan dan area pengembangan untuk mahasiswa.
     
     Kode RIASEC: {riasec_code}
@@ -89,6 +75,33 @@ def generate_strengths_weaknesses_analysis(riasec_code: str) -> str:
     
     Pastikan output HANYA berupa JSON yang valid, tanpa teks tambahan.
     """
+
+
+def generate_strengths_weaknesses_analysis(riasec_code: str) -> str:
+    """
+    Menghasilkan analisis kekuatan dan area pengembangan berdasarkan kode RIASEC.
+    
+    Args:
+        riasec_code (str): Kode RIASEC (e.g., "R", "RIA", "SEC", "E", etc.)
+    
+    Returns:
+        str: JSON string berisi daftar kekuatan dan area pengembangan
+    """
+    
+    # Validasi input - pastikan hanya berisi huruf RIASEC yang valid
+    valid_letters = set("RIASEC")
+    riasec_code = riasec_code.upper().strip()
+    
+    if not riasec_code:
+        return json.dumps({"error": "RIASEC code cannot be empty"})
+    
+    if not all(letter in valid_letters for letter in riasec_code):
+        return json.dumps({"error": "Invalid RIASEC code. Must contain only letters R, I, A, S, E, C"})
+    
+    if len(riasec_code) > 6:
+        return json.dumps({"error": "RIASEC code cannot be longer than 6 characters"})
+    
+    prompt = build_strengths_weaknesses_prompt(riasec_code)
     
     # --- DEBUG PRINT: Menampilkan prompt yang dikirim ke LLM ---
     print("\n" + "="*50)
@@ -98,10 +111,10 @@ def generate_strengths_weaknesses_analysis(riasec_code: str) -> str:
     print("="*50 + "\n")
     # --- END DEBUG ---
     
-    response = llm_client.invoke(prompt, service_name="Strengths & Weaknesses Analyzer")
+    response, cache_key = llm_client.invoke_with_key(prompt, service_name="Strengths & Weaknesses Analyzer")
     
     # Parse JSON response
-    parsed_response = llm_client.parse_json_response(response)
+    parsed_response = llm_client.parse_json_response(response, cache_key=cache_key)
     
     # Jika ada error dalam parsing, kembalikan error
     if "error" in parsed_response:
@@ -109,3 +122,18 @@ def generate_strengths_weaknesses_analysis(riasec_code: str) -> str:
     
     # Return the parsed JSON as string
     return json.dumps(parsed_response, ensure_ascii=False, indent=2)
+
+
+def stream_strengths_weaknesses_analysis(riasec_code: str):
+    """
+    Versi streaming dari `generate_strengths_weaknesses_analysis`: menghasilkan
+    potongan mentah JSON analisis begitu diterima dari LLM. Input tidak valid
+    atau kegagalan LLM menghasilkan satu potongan JSON error.
+    """
+    riasec_code = riasec_code.upper().strip()
+    if not riasec_code or len(riasec_code) > 6 or not set(riasec_code) <= set("RIASEC"):
+        yield json.dumps({"error": "Invalid RIASEC code. Must contain only letters R, I, A, S, E, C"})
+        return
+
+    prompt = build_strengths_weaknesses_prompt(riasec_code)
+    yield from llm_client.invoke_stream(prompt, service_name="Strengths & Weaknesses Analyzer")
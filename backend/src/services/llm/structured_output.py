@@ -0,0 +1,180 @@
+"""
+Structured Output Module
+Skema JSON output untuk agent yang menghasilkan JSON, beserta validator
+ringan untuk subset JSON Schema yang dipakai. Skema dikirim ke provider
+lewat `response_format` (mode json_schema) sehingga model dibatasi untuk
+menghasilkan JSON yang sesuai, lalu hasilnya divalidasi ulang di sini.
+
+Batas jumlah/nilai (minItems, maxItems, minimum, maximum) hanya diperiksa
+oleh validator lokal: beberapa provider OpenRouter menolak keyword tersebut
+di mode strict, sehingga tidak ikut dikirim.
+
+Jika skema tidak dikirim (LLM_STRUCTURED_OUTPUT_ENABLED=false), validasi
+berjalan dengan `strict=False`: properti tambahan dibiarkan dan properti
+yang tidak dibaca pemanggil (`x-optional`) boleh tidak ada.
+"""
+
+PRIORITY_LEVELS = ["High", "Medium", "Low"]
+
+# Keyword yang tidak dikirim ke provider (lihat docstring modul)
+LOCAL_ONLY_KEYWORDS = ("minItems", "maxItems", "minimum", "maximum", "x-optional")
+
+
+def _object(properties: dict, optional: tuple = ()) -> dict:
+    """
+    Objek strict: semua properti wajib dan tidak ada properti tambahan.
+    `optional` berisi properti yang tidak dibaca pemanggil (hanya longgar pada validasi non-strict).
+    """
+    schema = {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+    if optional:
+        schema["x-optional"] = list(optional)
+    return schema
+
+
+def _array(items: dict, min_items: int = None, max_items: int = None) -> dict:
+    schema = {"type": "array", "items": items}
+    if min_items is not None:
+        schema["minItems"] = min_items
+    if max_items is not None:
+        schema["maxItems"] = max_items
+    return schema
+
+
+_STRING = {"type": "string"}
+
+IKIGAI_DIMENSIONS = ["Love", "Good At", "Needs", "Profession"]
+
+
+def assessment_questions_schema(option_count: int) -> dict:
+    """Skema pertanyaan IKIGAI: satu pertanyaan per dimensi, satu opsi per kandidat profesi."""
+    return _object({
+        "ikigai_questions": _array(_object({
+            "dimension": {"type": "string", "enum": IKIGAI_DIMENSIONS},
+            "instruction": _STRING,
+            "options": _array(_STRING, option_count, option_count)
+        }), len(IKIGAI_DIMENSIONS), len(IKIGAI_DIMENSIONS))
+    })
+
+FINAL_ANALYSIS_SCHEMA = _object({
+    "analysis": _array(_object({
+        "profession": _STRING,
+        "match_percentage": {"type": "number", "minimum": 0, "maximum": 100},
+        "reason": _STRING
+    }), 1),
+    "top_2": _array(_STRING, 1, 2)
+})
+
+_SKILL = _object({
+    "skill": _STRING,
+    "description": _STRING,
+    "action_steps": _array(_STRING, 1),
+    "priority": {"type": "string", "enum": PRIORITY_LEVELS}
+})
+
+SKILL_ROADMAP_SCHEMA = _object({
+    "riasec_code": _STRING,
+    "target_jobs": _array(_STRING),
+    "soft_skills": _array(_SKILL, 1),
+    "hard_skills": _array(_SKILL, 1),
+    "roadmap_notes": _STRING
+}, optional=("riasec_code", "target_jobs", "roadmap_notes"))
+
+_ACTIVITY = _object({
+    "activity": _STRING,
+    "description": _STRING,
+    "benefits": _STRING,
+    "commitment_level": {"type": "string", "enum": PRIORITY_LEVELS},
+    "relevance_to_jobs": _STRING
+})
+
+CAMPUS_ACTIVITIES_SCHEMA = _object({
+    "riasec_code": _STRING,
+    "target_jobs": _array(_STRING),
+    "organizational_activities": _array(_ACTIVITY, 1),
+    "competitions_events": _array(_ACTIVITY, 1),
+    "projects_initiatives": _array(_ACTIVITY, 1),
+    "volunteer_social": _array(_ACTIVITY, 1),
+    "recommendations_summary": _STRING
+}, optional=("riasec_code", "target_jobs", "recommendations_summary"))
+
+
+def provider_schema(schema):
+    """Salinan skema tanpa keyword yang hanya divalidasi lokal (`LOCAL_ONLY_KEYWORDS`)."""
+    if isinstance(schema, dict):
+        return {key: provider_schema(value) for key, value in schema.items() if key not in LOCAL_ONLY_KEYWORDS}
+    if isinstance(schema, list):
+        return [provider_schema(value) for value in schema]
+    return schema
+
+
+def build_response_format(name: str, schema: dict) -> dict:
+    """Payload `response_format` OpenRouter/OpenAI untuk mode json_schema."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": provider_schema(schema)}
+    }
+
+
+_TYPE_CHECKS = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def validate(instance, schema: dict, path: str = "$", strict: bool = True) -> list:
+    """
+    Memvalidasi `instance` terhadap subset JSON Schema (type, enum, properties,
+    required, additionalProperties, items, minItems/maxItems, minimum/maximum).
+
+    Dengan `strict=False` (skema tidak dikirim ke provider), `additionalProperties`
+    diabaikan dan properti `x-optional` tidak wajib ada.
+
+    Returns:
+        list: Daftar pesan error (kosong jika valid)
+    """
+    expected_type = schema.get("type")
+    if expected_type and not _TYPE_CHECKS[expected_type](instance):
+        return [f"{path}: expected {expected_type}, got {type(instance).__name__}"]
+
+    errors = []
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: {instance!r} is not one of {schema['enum']}")
+
+    if expected_type == "object":
+        properties = schema.get("properties", {})
+        optional = () if strict else schema.get("x-optional", ())
+        for key in schema.get("required", []):
+            if key not in instance and key not in optional:
+                errors.append(f"{path}: missing required property '{key}'")
+        for key, value in instance.items():
+            if key in properties:
+                errors.extend(validate(value, properties[key], f"{path}.{key}", strict))
+            elif strict and schema.get("additionalProperties") is False:
+                errors.append(f"{path}: unexpected property '{key}'")
+
+    elif expected_type == "array":
+        if len(instance) < schema.get("minItems", 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} items, got {len(instance)}")
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            errors.append(f"{path}: expected at most {schema['maxItems']} items, got {len(instance)}")
+        if "items" in schema:
+            for index, item in enumerate(instance):
+                errors.extend(validate(item, schema["items"], f"{path}[{index}]", strict))
+
+    elif expected_type in ("number", "integer"):
+        if "minimum" in schema and instance < schema["minimum"]:
+            errors.append(f"{path}: {instance} is less than {schema['minimum']}")
+        if "maximum" in schema and instance > schema["maximum"]:
+            errors.append(f"{path}: {instance} is greater than {schema['maximum']}")
+
+    return errors
@@ -0,0 +1,299 @@
+"""
+Request Deadline Module
+Anggaran waktu (deadline) per request yang disimpan di `contextvars`.
+Route (lewat hook Flask) atau job background memasang deadline; LLMClient
+dan operasi MongoDB menurunkan timeout-nya dari sisa waktu, sehingga rantai
+beberapa agent tidak melewati batas waktu frontend/nginx. Pekerjaan yang
+tidak mungkin selesai tepat waktu langsung gagal (DeadlineExceeded) dan
+dicatat per endpoint dan tahap untuk dasar penentuan timeout.
+
+Deadline juga bisa dibatalkan lebih awal (misalnya klien memutus koneksi
+atau job dibatalkan): tahap berikutnya langsung gagal dengan
+RequestCancelled, dan callback yang didaftarkan lewat `on_request_cancel`
+memutus panggilan upstream yang sedang berjalan.
+
+Thread pool tidak mewarisi contextvars secara otomatis; pekerjaan yang
+dijadwalkan atas nama request harus dijalankan lewat
+`contextvars.copy_context().run`.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+import pymongo
+import pymongo.errors
+
+# Sisa waktu minimum agar panggilan baru masih layak dimulai (detik)
+MIN_USEFUL_BUDGET = 1.0
+
+_current = contextvars.ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Dilempar saat sisa anggaran waktu request tidak cukup untuk tahap berikutnya."""
+
+    def __init__(self, stage: str, remaining: float):
+        self.stage = stage
+        self.remaining = remaining
+        super().__init__(f"Request deadline exceeded before {stage} ({remaining:.2f}s left)")
+
+
+class RequestCancelled(DeadlineExceeded):
+    """Dilempar saat request/job dibatalkan sebelum tahap berikutnya (misalnya klien sudah pergi)."""
+
+    def __init__(self, stage: str, reason: str):
+        self.stage = stage
+        self.remaining = 0.0
+        self.reason = reason
+        Exception.__init__(self, f"Request cancelled ({reason}) before {stage}")
+
+
+class Deadline:
+    """Batas waktu absolut (monotonic) untuk satu request atau job, dan status pembatalannya."""
+
+    def __init__(self, budget: float, endpoint: str = "unknown"):
+        self.budget = budget
+        self.endpoint = endpoint
+        self.expires_at = time.monotonic() + budget
+        # True jika ada sumber pembatalan (pemantau koneksi klien atau job queue)
+        self.cancellable = False
+        self.cancel_reason = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_reason is not None
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """
+        Membatalkan request/job ini dan menjalankan semua callback pembatalan.
+
+        Returns:
+            bool: False jika sudah dibatalkan sebelumnya
+        """
+        with self._lock:
+            if self.cancel_reason is not None:
+                return False
+            self.cancel_reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        _stats.record_cancelled(self.endpoint, reason)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancel callback ({self.endpoint}): {e}")
+        return True
+
+    def add_cancel_callback(self, callback) -> bool:
+        """Mendaftarkan callback; False jika deadline sudah dibatalkan (callback tidak didaftarkan)."""
+        with self._lock:
+            if self.cancel_reason is not None:
+                return False
+            self._callbacks.append(callback)
+            return True
+
+    def remove_cancel_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+class _DeadlineStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = 0
+        self.expired = {}    # (endpoint, stage) -> jumlah
+        self.cancelled = {}  # (endpoint, reason) -> jumlah
+
+    def record_started(self):
+        with self._lock:
+            self.started += 1
+
+    def record_expired(self, endpoint: str, stage: str):
+        with self._lock:
+            key = (endpoint, stage)
+            self.expired[key] = self.expired.get(key, 0) + 1
+
+    def record_cancelled(self, endpoint: str, reason: str):
+        with self._lock:
+            key = (endpoint, reason)
+            self.cancelled[key] = self.cancelled.get(key, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started": self.started,
+                "expired": {f"{endpoint}:{stage}": count for (endpoint, stage), count in sorted(self.expired.items())},
+                "cancelled": {f"{endpoint}:{reason}": count
+                              for (endpoint, reason), count in sorted(self.cancelled.items())}
+            }
+
+    def expired_samples(self) -> list:
+        with self._lock:
+            return [((("endpoint", endpoint), ("stage", stage)), count)
+                    for (endpoint, stage), count in sorted(self.expired.items())]
+
+    def cancelled_samples(self) -> list:
+        with self._lock:
+            return [((("endpoint", endpoint), ("reason", reason)), count)
+                    for (endpoint, reason), count in sorted(self.cancelled.items())]
+
+
+_stats = _DeadlineStats()
+
+
+def current_deadline():
+    """Deadline yang aktif di konteks saat ini, atau None."""
+    return _current.get()
+
+
+def start_deadline(budget: float, endpoint: str = "unknown"):
+    """Memasang deadline baru; kembalikan token untuk `end_deadline`."""
+    _stats.record_started()
+    return _current.set(Deadline(budget, endpoint))
+
+
+def end_deadline(token):
+    try:
+        _current.reset(token)
+    except ValueError:
+        # Token dibuat di context lain (misalnya server WSGI menyalin context per request)
+        _current.set(None)
+
+
+@contextmanager
+def deadline_scope(budget: float, endpoint: str = "unknown"):
+    """
+    Context manager untuk memasang deadline di luar request (misalnya job background).
+    Menghasilkan objek Deadline agar pemilik scope dapat membatalkannya.
+    """
+    token = start_deadline(budget, endpoint)
+    try:
+        yield _current.get()
+    finally:
+        end_deadline(token)
+
+
+def is_cancellable() -> bool:
+    """True jika request/job di konteks saat ini dapat dibatalkan sebelum selesai."""
+    deadline = _current.get()
+    return deadline is not None and deadline.cancellable
+
+
+def cancel_request(reason: str = "cancelled") -> bool:
+    """Membatalkan deadline di konteks saat ini (jika ada)."""
+    deadline = _current.get()
+    return deadline is not None and deadline.cancel(reason)
+
+
+@contextmanager
+def on_request_cancel(callback, stage: str = "upstream"):
+    """
+    Menjalankan `callback()` jika request/job dibatalkan selama blok berjalan,
+    misalnya untuk membatalkan Future atau menutup koneksi upstream.
+    Jika sudah dibatalkan sebelum blok dimulai, RequestCancelled langsung dilempar.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        yield
+        return
+    if not deadline.add_cancel_callback(callback):
+        raise RequestCancelled(stage, deadline.cancel_reason)
+    try:
+        yield
+    finally:
+        deadline.remove_cancel_callback(callback)
+
+
+def check_cancelled(stage: str):
+    """Melempar RequestCancelled jika request/job di konteks saat ini sudah dibatalkan."""
+    deadline = _current.get()
+    if deadline is not None and deadline.cancelled:
+        raise RequestCancelled(stage, deadline.cancel_reason)
+
+
+def remaining_timeout(default, stage: str, minimum: float = MIN_USEFUL_BUDGET):
+    """
+    Timeout untuk satu tahap: `default` dipotong ke sisa anggaran request.
+
+    Args:
+        default (float | None): Timeout normal tahap ini (None = tanpa batas)
+        stage (str): Nama tahap untuk pencatatan, misalnya "llm:Final Analyzer"
+        minimum (float): Sisa waktu minimum agar tahap masih layak dimulai
+
+    Returns:
+        float | None: Timeout efektif (None jika tidak ada deadline dan default None)
+
+    Raises:
+        DeadlineExceeded: jika sisa anggaran kurang dari `minimum`
+        RequestCancelled: jika request sudah dibatalkan
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    if deadline.cancelled:
+        raise RequestCancelled(stage, deadline.cancel_reason)
+    remaining = deadline.remaining()
+    if remaining < minimum:
+        _stats.record_expired(deadline.endpoint, stage)
+        raise DeadlineExceeded(stage, remaining)
+    return remaining if default is None else min(default, remaining)
+
+
+def fits_in_budget(delay: float, stage: str) -> bool:
+    """True jika masih ada waktu untuk menunggu `delay` lalu menjalankan tahap berikutnya."""
+    deadline = _current.get()
+    if deadline is not None and deadline.cancelled:
+        return False
+    if deadline is None or deadline.remaining() - delay >= MIN_USEFUL_BUDGET:
+        return True
+    _stats.record_expired(deadline.endpoint, stage)
+    return False
+
+
+@contextmanager
+def mongo_budget(stage: str = "mongo"):
+    """
+    Membatasi operasi MongoDB di dalam blok ke sisa anggaran request
+    (client-side operation timeout pymongo). Tanpa deadline, tidak ada efek.
+    """
+    timeout = remaining_timeout(None, stage, minimum=0.05)
+    if timeout is None:
+        yield
+        return
+    with pymongo.timeout(timeout):
+        try:
+            yield
+        except pymongo.errors.PyMongoError as e:
+            if e.timeout:
+                deadline = _current.get()
+                _stats.record_expired(deadline.endpoint, stage)
+            raise
+
+
+def is_deadline_error(error: Exception) -> bool:
+    """True jika error berasal dari anggaran request yang habis, bukan kegagalan layanan."""
+    if isinstance(error, DeadlineExceeded):
+        return True
+    # Timeout client-side pymongo (pymongo.timeout) menandai error dengan atribut `timeout`
+    return _current.get() is not None and getattr(error, "timeout", False) is True
+
+
+def stats() -> dict:
+    """Jumlah request ber-deadline, kejadian anggaran habis per endpoint:tahap, dan pembatalan per endpoint:alasan."""
+    return _stats.snapshot()
+
+
+def expired_samples() -> list:
+    """Sampel counter anggaran habis dalam bentuk (labels, nilai) untuk /metrics."""
+    return _stats.expired_samples()
+
+
+def cancelled_samples() -> list:
+    """Sampel counter pembatalan dalam bentuk (labels, nilai) untuk /metrics."""
+    return _stats.cancelled_samples()
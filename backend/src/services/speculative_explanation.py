@@ -0,0 +1,83 @@
+"""
+Speculative RIASEC Explanation Service
+`/api/assessment/submit` hanya menunggu analisis final untuk mengetahui
+penjelasan vektor profesi teratas mana yang dipakai oleh
+`generate_riasec_explanation`. Karena kandidatnya hanya beberapa profesi,
+penjelasan untuk semua kandidat dijalankan bersamaan dengan analisis final,
+lalu hanya yang cocok dengan `top_2[0]` yang dipakai.
+
+Spekulasi yang tidak terpakai dibatalkan jika belum berjalan; yang sudah
+berjalan dibiarkan selesai dan hasilnya masuk cache LLM (kunci cache
+ditentukan oleh prompt, jadi submit berikutnya dengan kandidat sama langsung hit).
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.config import ASSESSMENT_SPECULATIVE_EXPLANATION, ASSESSMENT_SPECULATIVE_WORKERS
+from src.services.llm import generate_riasec_explanation
+
+
+class SpeculativeExplainer:
+    """Menjalankan penjelasan RIASEC untuk semua kandidat profesi secara paralel."""
+
+    def __init__(self, max_workers: int = 8, enabled: bool = True):
+        self.enabled = enabled
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="riasec-explainer")
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "used": 0, "inline": 0, "cancelled": 0, "wasted": 0}
+
+    def _record(self, outcome: str, count: int = 1):
+        with self._lock:
+            self._stats[outcome] += count
+
+    def start(self, profile: str, vector_explanations) -> dict:
+        """
+        Memulai penjelasan untuk setiap teks penjelasan vektor kandidat (tidak memblokir).
+        Teks yang sama hanya dijalankan sekali.
+
+        Returns:
+            dict: teks penjelasan vektor -> Future, kosong jika mode spekulatif nonaktif
+        """
+        if not self.enabled:
+            return {}
+        speculative = {}
+        for text in vector_explanations:
+            if text not in speculative:
+                # Deadline request ikut dibawa ke thread pool
+                speculative[text] = self._executor.submit(
+                    contextvars.copy_context().run, generate_riasec_explanation, profile, text
+                )
+        self._record("started", len(speculative))
+        return speculative
+
+    def take(self, speculative: dict, profile: str, vector_explanation: str) -> dict:
+        """
+        Mengambil hasil untuk teks yang terpilih dan membatalkan sisanya.
+        Jika teks tidak ada di spekulasi, atau job-nya masih antri di pool,
+        penjelasan dijalankan langsung di thread pemanggil.
+        """
+        future = speculative.pop(vector_explanation, None)
+        self.discard(speculative)
+        if future is not None and not future.cancel():
+            self._record("used")
+            return future.result()
+        self._record("inline")
+        return generate_riasec_explanation(profile, vector_explanation)
+
+    def discard(self, speculative: dict):
+        """Membatalkan spekulasi yang belum berjalan; yang sudah berjalan hasilnya masuk cache LLM."""
+        for future in speculative.values():
+            self._record("cancelled" if future.cancel() else "wasted")
+        speculative.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+# Singleton instance untuk digunakan di seluruh aplikasi
+speculative_explainer = SpeculativeExplainer(
+    max_workers=ASSESSMENT_SPECULATIVE_WORKERS,
+    enabled=ASSESSMENT_SPECULATIVE_EXPLANATION
+)
@@ -1,6 +1,9 @@
 # src/web/__init__.py
 
-from flask import Flask
+from flask import Flask, g, request
+from src.config import REQUEST_DEADLINE, REQUEST_DEADLINE_ENDPOINTS, CLIENT_DISCONNECT_ENDPOINTS
+from src.services.request_deadline import start_deadline, end_deadline, current_deadline
+from src.web.disconnect import disconnect_watcher
 
 def register_blueprints(app):
     """Register all application blueprints"""
@@ -12,6 +15,9 @@ def register_blueprints(app):
     from .routes.strengths_weaknesses_routes import strengths_weaknesses_bp
     from .routes.skill_roadmap_routes import skill_roadmap_bp
     from .routes.campus_activities_routes import campus_activities_bp
+    from .routes.metrics_routes import metrics_bp
+    from .routes.job_routes import jobs_bp
+    from .routes.report_routes import report_bp
     
     # Register blueprints with URL prefixes
     app.register_blueprint(info_blueprint, url_prefix='/')
@@ -22,3 +28,27 @@ def register_blueprints(app):
     app.register_blueprint(strengths_weaknesses_bp, url_prefix='/api/strengths-weaknesses')
     app.register_blueprint(skill_roadmap_bp, url_prefix='/api/skill-roadmap')
     app.register_blueprint(campus_activities_bp, url_prefix='/api/campus-activities')
+    app.register_blueprint(metrics_bp, url_prefix='/metrics')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    app.register_blueprint(report_bp, url_prefix='/api/report')
+
+
+def register_request_deadline(app):
+    """
+    Memasang deadline per request; LLMClient dan MongoDB menurunkan timeout dari sisa waktunya.
+    Pada route LLM yang lama, deadline dibatalkan saat klien memutus koneksi.
+    """
+    @app.before_request
+    def _start_request_deadline():
+        endpoint = request.endpoint or "unknown"
+        budget = REQUEST_DEADLINE_ENDPOINTS.get(endpoint, REQUEST_DEADLINE)
+        g.request_deadline_token = start_deadline(budget, endpoint)
+        if endpoint in CLIENT_DISCONNECT_ENDPOINTS:
+            g.disconnect_watch_id = disconnect_watcher.watch(request.environ, current_deadline())
+
+    @app.teardown_request
+    def _end_request_deadline(exc):
+        disconnect_watcher.unwatch(g.pop("disconnect_watch_id", None))
+        token = g.pop("request_deadline_token", None)
+        if token is not None:
+            end_deadline(token)
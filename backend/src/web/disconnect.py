@@ -0,0 +1,132 @@
+# src/web/disconnect.py
+"""
+Deteksi klien yang memutus koneksi (misalnya menutup tab) selama route LLM
+yang lama masih berjalan.
+
+Satu thread pemantau memeriksa socket klien setiap beberapa ratus milidetik.
+Jika klien sudah menutup koneksi, deadline request dibatalkan: panggilan LLM
+yang sedang berjalan diputus dan tahap berikutnya tidak dijalankan, sehingga
+worker dan token tidak terbuang untuk respons yang tidak akan dibaca.
+
+Socket diambil dari environ WSGI (`werkzeug.socket` pada server Flask,
+`gunicorn.socket` pada gunicorn); server lain tidak dipantau.
+"""
+
+import select
+import socket
+import threading
+import time
+from src.config import CLIENT_DISCONNECT_WATCH, CLIENT_DISCONNECT_POLL_INTERVAL
+
+SOCKET_ENVIRON_KEYS = ("werkzeug.socket", "gunicorn.socket")
+
+
+def client_socket(environ: dict):
+    """Mengembalikan socket klien dari environ WSGI, atau None jika tidak tersedia."""
+    for key in SOCKET_ENVIRON_KEYS:
+        sock = environ.get(key)
+        if sock is not None:
+            return sock
+    return None
+
+
+def _is_closed(sock) -> bool:
+    """
+    True jika klien sudah menutup koneksi. Dipanggil hanya saat socket terbaca:
+    EOF berarti klien pergi, sedangkan data (misalnya request keep-alive
+    berikutnya) dibiarkan di buffer untuk dibaca server.
+    """
+    try:
+        return sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b""
+    except (BlockingIOError, InterruptedError):
+        return False
+    except OSError:
+        # Reset/broken pipe: klien juga sudah pergi
+        return True
+
+
+class DisconnectWatcher:
+    """Thread pemantau socket klien untuk request yang sedang berjalan."""
+
+    def __init__(self, poll_interval: float = 0.5, enabled: bool = True):
+        self.poll_interval = poll_interval
+        self.enabled = enabled
+        self._watched = {}  # id watch -> (socket, Deadline)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = {"watched": 0, "disconnected": 0, "unsupported": 0}
+
+    def watch(self, environ: dict, deadline):
+        """
+        Mulai memantau koneksi klien request ini; saat klien pergi, `deadline`
+        dibatalkan dengan alasan "client_disconnected".
+
+        Returns:
+            int | None: id watch untuk `unwatch`, atau None jika tidak dipantau
+        """
+        if not self.enabled or deadline is None:
+            return None
+        sock = client_socket(environ)
+        # Socket TLS tidak mendukung MSG_PEEK
+        if sock is None or not hasattr(sock, "recv") or hasattr(sock, "cipher"):
+            with self._lock:
+                self._stats["unsupported"] += 1
+            return None
+
+        deadline.cancellable = True
+        with self._lock:
+            self._next_id += 1
+            watch_id = self._next_id
+            self._watched[watch_id] = (sock, deadline)
+            self._stats["watched"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="disconnect-watcher", daemon=True)
+                self._thread.start()
+        return watch_id
+
+    def unwatch(self, watch_id):
+        if watch_id is None:
+            return
+        with self._lock:
+            self._watched.pop(watch_id, None)
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self._poll()
+            except Exception as e:
+                print(f"Disconnect watcher error: {e}")
+
+    def _poll(self):
+        with self._lock:
+            watched = {watch_id: entry for watch_id, entry in self._watched.items() if entry[0].fileno() >= 0}
+        if not watched:
+            return
+        by_fileno = {sock.fileno(): watch_id for watch_id, (sock, _) in watched.items()}
+        readable, _, _ = select.select(list(by_fileno), [], [], 0)
+        for fileno in readable:
+            watch_id = by_fileno[fileno]
+            sock, deadline = watched[watch_id]
+            if not _is_closed(sock):
+                continue
+            with self._lock:
+                if self._watched.pop(watch_id, None) is None:
+                    continue
+                self._stats["disconnected"] += 1
+            print(f"Client disconnected during {deadline.endpoint}, cancelling upstream work")
+            deadline.cancel("client_disconnected")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["active"] = len(self._watched)
+        return stats
+
+
+# Singleton instance untuk digunakan di seluruh aplikasi
+disconnect_watcher = DisconnectWatcher(
+    poll_interval=CLIENT_DISCONNECT_POLL_INTERVAL,
+    enabled=CLIENT_DISCONNECT_WATCH
+)
@@ -0,0 +1,76 @@
+"""
+Validasi body request bersama untuk route yang menerima `riasec_code` dan
+`target_jobs` (roadmap skill, aktivitas kampus, dan laporan lengkap), baik
+endpoint sinkron maupun `.../async`.
+"""
+
+from flask import request, jsonify
+
+
+def read_riasec_jobs_request():
+    """
+    Membaca dan memvalidasi field `riasec_code` dan `target_jobs` dari body JSON.
+
+    Returns:
+        tuple: ((riasec_code, target_jobs), None) jika valid, atau (None, (response, status)) jika tidak
+    """
+    # Validate request content type
+    if not request.is_json:
+        return None, (jsonify({"error": "Content-Type must be application/json"}), 400)
+
+    # Get request data
+    data = request.get_json()
+
+    # Validate required fields
+    if not data:
+        return None, (jsonify({"error": "Request body is required"}), 400)
+
+    if 'riasec_code' not in data:
+        return None, (jsonify({"error": "Field 'riasec_code' is required"}), 400)
+
+    if 'target_jobs' not in data:
+        return None, (jsonify({"error": "Field 'target_jobs' is required"}), 400)
+
+    riasec_code = data['riasec_code']
+    target_jobs = data['target_jobs']
+
+    # Validate riasec_code value
+    if not isinstance(riasec_code, str):
+        return None, (jsonify({"error": "Field 'riasec_code' must be a string"}), 400)
+
+    # Strip whitespace and validate against valid letters
+    riasec_code = riasec_code.strip().upper()
+    valid_letters = set("RIASEC")
+
+    if not riasec_code:
+        return None, (jsonify({"error": "RIASEC code cannot be empty"}), 400)
+
+    if not all(letter in valid_letters for letter in riasec_code):
+        return None, (jsonify({"error": "Invalid RIASEC code. Must contain only letters R, I, A, S, E, C"}), 400)
+
+    if len(riasec_code) > 6:
+        return None, (jsonify({"error": "RIASEC code cannot be longer than 6 characters"}), 400)
+
+    # Validate target_jobs
+    if not isinstance(target_jobs, list):
+        return None, (jsonify({"error": "Target jobs must be a list"}), 400)
+
+    if not target_jobs:
+        return None, (jsonify({"error": "Target jobs list cannot be empty"}), 400)
+
+    if len(target_jobs) > 10:
+        return None, (jsonify({"error": "Too many target jobs. Maximum 10 jobs allowed"}), 400)
+
+    # Filter and validate job names
+    filtered_jobs = []
+    for job in target_jobs:
+        if not isinstance(job, str):
+            return None, (jsonify({"error": "All job names must be strings"}), 400)
+        job = job.strip()
+        if job:  # Only add non-empty jobs
+            filtered_jobs.append(job)
+
+    if not filtered_jobs:
+        return None, (jsonify({"error": "Target jobs list cannot be empty after filtering"}), 400)
+
+    return (riasec_code, filtered_jobs), None
@@ -1,6 +1,12 @@
 from flask import Blueprint, request, jsonify, session
 from src.models.profession import ProfessionSelector
-from src.services.llm import generate_assessment_statements, generate_final_analysis, generate_riasec_explanation
+from src.services.llm import generate_final_analysis
+from src.services.assessment_prefetch import assessment_prefetcher
+from src.services.job_queue import job_queue
+from src.services.speculative_explanation import speculative_explainer
+from src.web.routes.job_routes import enqueue_job
+from src.web.routes.report_routes import prefetch_report
+from src.services.request_deadline import DeadlineExceeded, mongo_budget, is_deadline_error
 from src.database import validate_hash, save_assessment_results, get_assessment_by_hash, connect_to_mongo, save_assessment_additional_data
 import json
 import logging
@@ -74,6 +80,15 @@ def start_assessment():
                 error:
                   type: string
                   example: "Profil RIASEC tidak ditemukan. Harap selesaikan tes terlebih dahulu."
+      504:
+        description: Pertanyaan belum selesai dibuat sebelum batas waktu request habis
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
       500:
         description: Error dalam memulai assessment
         content:
@@ -89,19 +104,9 @@ def start_assessment():
         return jsonify({"error": "Profil RIASEC tidak ditemukan. Harap selesaikan tes terlebih dahulu."}), 400
 
     try:
-        selector = ProfessionSelector()
-        top_professions = selector.select(session["profile"], top_n=5)
-
-        professions_for_prompt = {
-            name: {
-                "role": data.get("role"),
-                "role_description": data.get("role_description"),
-                "core_skills": data.get("core_skills")
-            }
-            for name, data in top_professions.items()
-        }
-        
-        statements = generate_assessment_statements(professions_for_prompt)
+        # Hasil biasanya sudah disiapkan di background sejak /api/riasec/submit
+        prepared = assessment_prefetcher.get(session["profile"])
+        statements = prepared["statements"]
 
         # --- PERBAIKAN: Validasi yang lebih ketat terhadap respons LLM ---
         # Kita cek apakah responsnya valid DAN memiliki kunci yang kita butuhkan.
@@ -112,7 +117,7 @@ def start_assessment():
         # --- END PERBAIKAN ---
         
         session['statements'] = statements
-        session['profession_names_for_analysis'] = list(top_professions.keys())
+        session['profession_names_for_analysis'] = prepared["profession_names"]
 
         # --- DEBUG PRINT: Menampilkan JSON yang akan dikirim ke frontend ---
         print("\n" + "="*50)
@@ -122,11 +127,131 @@ def start_assessment():
         # --- END DEBUG ---
 
         return jsonify(statements)
+    except DeadlineExceeded as e:
+        logger.error(f"Assessment questions not ready before the request deadline: {e}")
+        return jsonify({"error": "Pembuatan pertanyaan asesmen melebihi batas waktu. Silakan coba lagi."}), 504
     except Exception as e:
         logger.error(f"Error starting assessment: {e}", exc_info=True)
         return jsonify({"error": f"Error dalam memulai asesmen: {e}"}), 500
 
 
+def _vector_explanation_text(selector, profession_name):
+    """Mengambil teks penjelasan vektor RIASEC untuk profesi (berdasarkan kolom 'reasoning_hc')."""
+    profession = selector.get(profession_name)
+    if profession is None:
+        return "Penjelasan tidak tersedia."
+    # Pastikan kolom 'riasec_explanation' ada sebelum diakses
+    if 'riasec_explanation' in profession:
+        return profession['riasec_explanation']
+    # Fallback jika kolom tidak ada
+    return profession.get('vector_explanation', "Penjelasan tidak tersedia.")
+
+
+def _build_assessment_result(user_hash, profile, normalized_scores, profession_names, answers):
+    """
+    Menjalankan analisis final dan penjelasan RIASEC lalu menyimpan hasilnya.
+    Semua data sesi diterima sebagai argumen agar bisa dijalankan sebagai job
+    background di luar konteks request.
+
+    Returns:
+        tuple: (body respons dict, kode HTTP)
+    """
+    selector = ProfessionSelector()
+    
+    # --- PERBAIKAN UTAMA: Gunakan kolom 'reasoning_hc' untuk mencari data ---
+    professions_data = {}
+    for name in profession_names:
+        # Cari berdasarkan kolom 'reasoning_hc', bukan 'role'
+        profession = selector.get(name)
+
+        if profession is not None:
+            professions_data[name] = profession
+        else:
+            logger.warning(f"Profession with reasoning_hc name '{name}' not found in the dataframe.")
+    
+    if not professions_data:
+        return {"error": "Tidak dapat menemukan data detail untuk profesi yang dipilih."}, 500
+    # --- END PERBAIKAN ---
+
+    # Penjelasan RIASEC semua kandidat berjalan paralel dengan analisis final
+    speculative = speculative_explainer.start(
+        profile, [_vector_explanation_text(selector, name) for name in professions_data]
+    )
+
+    final_analysis = generate_final_analysis(professions_data, answers)
+    if final_analysis.get("error"):
+        speculative_explainer.discard(speculative)
+        return {"error": final_analysis["error"]}, 500
+    
+    # top_profession_name sekarang sudah cocok dengan kolom 'reasoning_hc'
+    top_profession_name = final_analysis.get("top_2", [list(professions_data.keys())[0]])[0]
+    vector_explanation_text = _vector_explanation_text(selector, top_profession_name)
+        
+    riasec_explanations = speculative_explainer.take(speculative, profile, vector_explanation_text)
+    
+    chart_data = {
+        'labels': [RIASEC_MAP_FULL[key] for key in sorted(RIASEC_MAP_FULL.keys())],
+        'data': [normalized_scores.get(RIASEC_MAP_FULL[key], 0) for key in sorted(RIASEC_MAP_FULL.keys())]
+    }
+
+    response_data = {
+        "results": final_analysis,
+        "profile": profile,
+        "riasec_explanations": riasec_explanations,
+        "riasec_map_full": RIASEC_MAP_FULL,
+        "chart_data": chart_data,
+        "hash": user_hash
+    }
+    
+    try:
+        save_assessment_results(user_hash, response_data)
+    except Exception as e:
+        logger.error(f"Failed to save assessment results for hash {user_hash}: {e}")
+        return {"error": "Gagal menyimpan hasil asesmen."}, 500
+
+    # Profil dan top_2 sudah diketahui: siapkan bagian laporan hasil di background
+    prefetch_report(user_hash, profile, final_analysis.get("top_2", []))
+    
+    return response_data, 200
+
+
+def _remember_final_analysis(job):
+    """Hook job: simpan hasil analisis ke sesi pemilik hash untuk feedback."""
+    result = job["result"]
+    if session.get("assessment_hash") == result.get("hash"):
+        session["final_analysis_for_feedback"] = result["results"]
+
+
+job_queue.register("assessment_submit", _build_assessment_result, on_complete=_remember_final_analysis)
+
+
+def _read_submission():
+    """
+    Mengambil data sesi dan jawaban yang dibutuhkan untuk memproses submit.
+
+    Returns:
+        tuple: (dict argumen untuk _build_assessment_result, None) jika valid,
+               atau (None, (response, status)) jika tidak
+    """
+    if "profile" not in session or "assessment_hash" not in session:
+        return None, (jsonify({"error": "Sesi tidak valid atau hash tidak ditemukan."}), 400)
+
+    data = request.json
+    session['assessment_answers'] = data.get('answers')
+
+    profession_names = session.get('profession_names_for_analysis', [])
+    if not profession_names:
+        return None, (jsonify({"error": "Data profesi tidak ditemukan di sesi."}), 400)
+
+    return {
+        "user_hash": session["assessment_hash"],
+        "profile": session["profile"],
+        "normalized_scores": session["normalized_scores"],
+        "profession_names": profession_names,
+        "answers": session["assessment_answers"]
+    }, None
+
+
 @assessment_blueprint.route("/submit", methods=["POST"])
 def submit_assessment():
     """
@@ -251,79 +376,55 @@ def submit_assessment():
                   type: string
                   example: "Tidak dapat menemukan data detail untuk profesi yang dipilih."
     """
-    if "profile" not in session or "assessment_hash" not in session:
-        return jsonify({"error": "Sesi tidak valid atau hash tidak ditemukan."}), 400
-    
-    user_hash = session["assessment_hash"]
-
-    data = request.json
-    session['assessment_answers'] = data.get('answers')
-    
-    selector = ProfessionSelector()
-    
-    profession_names = session.get('profession_names_for_analysis', [])
-    if not profession_names:
-        return jsonify({"error": "Data profesi tidak ditemukan di sesi."}), 400
-        
-    # --- PERBAIKAN UTAMA: Gunakan kolom 'reasoning_hc' untuk mencari data ---
-    professions_data = {}
-    for name in profession_names:
-        # Cari berdasarkan kolom 'reasoning_hc', bukan 'role'
-        result_df = selector.df[selector.df['reasoning_hc'] == name]
-        
-        if not result_df.empty:
-            professions_data[name] = result_df.to_dict('records')[0]
-        else:
-            logger.warning(f"Profession with reasoning_hc name '{name}' not found in the dataframe.")
-    
-    if not professions_data:
-        return jsonify({"error": "Tidak dapat menemukan data detail untuk profesi yang dipilih."}), 500
-    # --- END PERBAIKAN ---
+    submission, error = _read_submission()
+    if error:
+        return error
 
-    final_analysis = generate_final_analysis(professions_data, session["assessment_answers"])
-    if final_analysis.get("error"):
-        return jsonify({"error": final_analysis["error"]}), 500
-    
-    # top_profession_name sekarang sudah cocok dengan kolom 'reasoning_hc'
-    top_profession_name = final_analysis.get("top_2", [list(professions_data.keys())[0]])[0]
-    
-    try:
-        top_profession_df = selector.df[selector.df['reasoning_hc'] == top_profession_name]
-        # Pastikan kolom 'riasec_explanation' ada sebelum diakses
-        if 'riasec_explanation' in top_profession_df.columns:
-            vector_explanation_text = top_profession_df['riasec_explanation'].iloc[0]
-        else:
-            # Fallback jika kolom tidak ada
-            vector_explanation_text = top_profession_df['vector_explanation'].iloc[0]
+    response_data, status = _build_assessment_result(**submission)
+    if status == 200:
+        session["final_analysis_for_feedback"] = response_data["results"]
+    return jsonify(response_data), status
 
-    except (IndexError, KeyError):
-        vector_explanation_text = "Penjelasan tidak tersedia."
-        
-    riasec_explanations = generate_riasec_explanation(session["profile"], vector_explanation_text)
-    
-    chart_data = {
-        'labels': [RIASEC_MAP_FULL[key] for key in sorted(RIASEC_MAP_FULL.keys())],
-        'data': [session["normalized_scores"].get(RIASEC_MAP_FULL[key], 0) for key in sorted(RIASEC_MAP_FULL.keys())]
-    }
-
-    session["final_analysis_for_feedback"] = final_analysis
+@assessment_blueprint.route("/submit/async", methods=["POST"])
+def submit_assessment_async():
+    """
+    Mengirimkan jawaban assessment Ikigai secara asynchronous
+    ---
+    tags:
+      - Assessment
+    summary: Mengirimkan jawaban assessment Ikigai tanpa menunggu analisis
+    description: |
+      Versi asynchronous dari `POST /api/assessment/submit`. Body request dan
+      validasi sesi sama; respons langsung berisi `job_id` dan hasilnya diambil
+      dengan polling `GET /api/jobs/{job_id}` dari sesi yang sama (`result`
+      sama dengan respons endpoint sinkron).
+    responses:
+      202:
+        description: Job diterima dan masuk antrian
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                job_id:
+                  type: string
+                  example: "3f2c0c5e8e1a4a7c9b0d6f1e2a3b4c5d"
+                status:
+                  type: string
+                  example: "queued"
+                status_url:
+                  type: string
+                  example: "/api/jobs/3f2c0c5e8e1a4a7c9b0d6f1e2a3b4c5d"
+      400:
+        description: Sesi tidak valid atau data profesi tidak ditemukan
+      503:
+        description: Antrian job penuh, coba lagi setelah `Retry-After` detik
+    """
+    submission, error = _read_submission()
+    if error:
+        return error
 
-    response_data = {
-        "results": final_analysis,
-        "profile": session["profile"],
-        "riasec_explanations": riasec_explanations,
-        "riasec_map_full": RIASEC_MAP_FULL,
-        "chart_data": chart_data,
-        "hash": user_hash
-    }
-    
-    try:
-        save_assessment_results(user_hash, response_data)
-    except Exception as e:
-        logger.error(f"Failed to save assessment results for hash {user_hash}: {e}")
-        return jsonify({"error": "Gagal menyimpan hasil asesmen."}), 500
-    
-    return jsonify(response_data)
+    return enqueue_job("assessment_submit", **submission)
 
 @assessment_blueprint.route("/validate_hash", methods=["POST"])
 def validate_user_hash():
@@ -348,8 +449,9 @@ def get_result_by_hash(user_hash):
     Mengambil data hasil asesmen berdasarkan hash.
     """
     try:
-        db = connect_to_mongo()
-        assessment = db.assessments.find_one({"hash": user_hash})
+        with mongo_budget():
+            db = connect_to_mongo()
+            assessment = db.assessments.find_one({"hash": user_hash})
         if assessment and assessment.get("results"):
             # Return results and additional_data if exists
             response_data = assessment["results"]
@@ -362,6 +464,8 @@ def get_result_by_hash(user_hash):
             return jsonify({"error": "Hash tidak valid."}), 404
     except Exception as e:
         logger.error(f"Error retrieving assessment for hash {user_hash}: {e}")
+        if is_deadline_error(e):
+            return jsonify({"error": "Database tidak merespons sebelum batas waktu request. Silakan coba lagi."}), 504
         return jsonify({"error": "Terjadi kesalahan server."}), 500
 
 @assessment_blueprint.route("/result/<user_hash>/additional", methods=["POST"])
@@ -5,12 +5,82 @@ Rute API untuk menghasilkan penjelasan tipe dominan RIASEC.
 
 from flask import Blueprint, request, jsonify
 import json
-from src.services.llm import generate_dominant_type_explanation
+from src.services.explanation_table import explanation_table
+from src.services.llm import stream_dominant_type_explanation
+from src.web.sse import stream_llm_response
 
 # Create Blueprint
 dominant_type_bp = Blueprint('dominant_type', __name__)
 
 
+def _read_dominant_type():
+    """
+    Membaca dan memvalidasi field `dominant_type` dari body JSON.
+
+    Returns:
+        tuple: (dominant_type, None) jika valid, atau (None, (response, status)) jika tidak
+    """
+    # Validate request content type
+    if not request.is_json:
+        return None, (jsonify({"error": "Content-Type must be application/json"}), 400)
+    
+    # Get request data
+    data = request.get_json()
+    
+    # Validate required fields
+    if not data:
+        return None, (jsonify({"error": "Request body is required"}), 400)
+    
+    if 'dominant_type' not in data:
+        return None, (jsonify({"error": "Field 'dominant_type' is required"}), 400)
+    
+    dominant_type = data['dominant_type']
+    
+    # Validate dominant_type value
+    if not isinstance(dominant_type, str):
+        return None, (jsonify({"error": "Field 'dominant_type' must be a string"}), 400)
+    
+    # Strip whitespace and validate against valid letters
+    dominant_type = dominant_type.strip().upper()
+    valid_letters = set("RIASEC")
+    
+    if not dominant_type:
+        return None, (jsonify({"error": "Dominant type cannot be empty"}), 400)
+    
+    if not all(letter in valid_letters for letter in dominant_type):
+        return None, (jsonify({"error": "Invalid dominant_type. Must contain only letters R, I, A, S, E, C"}), 400)
+    
+    if len(dominant_type) > 6:
+        return None, (jsonify({"error": "Dominant type cannot be longer than 6 characters"}), 400)
+    
+    return dominant_type, None
+
+
+def build_dominant_type_explanation(dominant_type):
+    """
+    Menghasilkan penjelasan tipe dominan. Dipakai oleh endpoint ini dan `/api/report`.
+
+    Returns:
+        tuple: (body respons dict, kode HTTP)
+    """
+    # Serve from the pre-generated table, falling back to the LLM service on a miss
+    explanation = explanation_table.get_or_generate("dominant_type", dominant_type)
+    
+    # Check if the explanation is an error response
+    try:
+        error_check = json.loads(explanation)
+        if "error" in error_check:
+            return error_check, 500
+    except json.JSONDecodeError:
+        pass  # explanation is normal text, continue
+    
+    # Return successful response
+    return {
+        "explanation": explanation,
+        "dominant_type": dominant_type
+    }, 200
+
+
 @dominant_type_bp.route('/', methods=['POST'])
 def explain_dominant_type():
     """
@@ -103,54 +173,74 @@ def explain_dominant_type():
                       value: "Internal server error occurred"
     """
     try:
-        # Validate request content type
-        if not request.is_json:
-            return jsonify({"error": "Content-Type must be application/json"}), 400
-        
-        # Get request data
-        data = request.get_json()
-        
-        # Validate required fields
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
-        
-        if 'dominant_type' not in data:
-            return jsonify({"error": "Field 'dominant_type' is required"}), 400
-        
-        dominant_type = data['dominant_type']
-        
-        # Validate dominant_type value
-        if not isinstance(dominant_type, str):
-            return jsonify({"error": "Field 'dominant_type' must be a string"}), 400
-        
-        # Strip whitespace and validate against valid letters
-        dominant_type = dominant_type.strip().upper()
-        valid_letters = set("RIASEC")
-        
-        if not dominant_type:
-            return jsonify({"error": "Dominant type cannot be empty"}), 400
-        
-        if not all(letter in valid_letters for letter in dominant_type):
-            return jsonify({"error": "Invalid dominant_type. Must contain only letters R, I, A, S, E, C"}), 400
-        
-        if len(dominant_type) > 6:
-            return jsonify({"error": "Dominant type cannot be longer than 6 characters"}), 400        # Generate explanation using LLM service
-        explanation = generate_dominant_type_explanation(dominant_type)
-        
-        # Check if the explanation is an error response
-        try:
-            error_check = json.loads(explanation)
-            if "error" in error_check:
-                return jsonify(error_check), 500
-        except json.JSONDecodeError:
-            pass  # explanation is normal text, continue
-        
-        # Return successful response
-        return jsonify({
-            "explanation": explanation,
-            "dominant_type": dominant_type
-        }), 200
+        dominant_type, error = _read_dominant_type()
+        if error:
+            return error
+
+        result, status = build_dominant_type_explanation(dominant_type)
+        return jsonify(result), status
         
     except Exception as e:
         print(f"Error in explain_dominant_type endpoint: {str(e)}")
         return jsonify({"error": "Internal server error occurred"}), 500
+
+
+@dominant_type_bp.route('/stream', methods=['POST'])
+def stream_dominant_type():
+    """
+    Menghasilkan penjelasan tipe dominan RIASEC secara streaming (Server-Sent Events)
+    ---
+    tags:
+      - Dominant Type
+    summary: Penjelasan tipe dominan RIASEC via SSE
+    description: |
+      Varian streaming dari `POST /api/dominant-type/`. Token penjelasan diteruskan
+      begitu diterima dari LLM sehingga teks pertama muncul dalam hitungan ratusan
+      milidetik, bukan setelah seluruh completion selesai.
+
+      Event yang dikirim:
+      - `delta`: `{"text": "..."}` potongan teks penjelasan
+      - `done`: `{"explanation": "...", "dominant_type": "RIA"}` (sama dengan respons non-streaming)
+      - `error`: `{"error": "..."}` (pesan sama dengan respons non-streaming)
+
+      Penjelasan yang sudah dipregenerate atau tersimpan di cache dikirim sebagai satu event `delta`.
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            required:
+              - dominant_type
+            properties:
+              dominant_type:
+                type: string
+                pattern: '^[RIASEC]{1,6}$'
+                example: "RIA"
+    responses:
+      200:
+        description: Stream event SSE
+        content:
+          text/event-stream:
+            schema:
+              type: string
+              example: |
+                event: delta
+                data: {"text": "Sebagai mahasiswa dengan profil RIA, "}
+
+                event: done
+                data: {"explanation": "Sebagai mahasiswa dengan profil RIA, kamu memiliki...", "dominant_type": "RIA"}
+      400:
+        description: Request tidak valid (format error sama dengan endpoint non-streaming)
+    """
+    dominant_type, error = _read_dominant_type()
+    if error:
+        return error
+
+    pregenerated = explanation_table.lookup("dominant_type", dominant_type)
+    chunks = [pregenerated] if pregenerated is not None else stream_dominant_type_explanation(dominant_type)
+
+    def _finalize(explanation: str) -> dict:
+        return {"explanation": explanation.strip(), "dominant_type": dominant_type}
+
+    return stream_llm_response(chunks, _finalize)
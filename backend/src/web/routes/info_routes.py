@@ -103,6 +103,8 @@ def health_check():
               properties:
                 status:
                   type: string
+                  enum: ["healthy", "degraded"]
+                  description: "degraded jika ada circuit breaker model LLM yang tidak dalam state closed"
                   example: "healthy"
                 message:
                   type: string
@@ -111,10 +113,74 @@ def health_check():
                   type: string
                   format: date-time
                   example: "2024-01-01T12:00:00Z"
+                llm:
+                  type: object
+                  description: Statistik operasional LLM client
+                  properties:
+                    cache:
+                      type: object
+                      description: Counter hit/miss cache respons LLM (total dan per service)
+                    single_flight:
+                      type: object
+                      description: Jumlah request upstream (leaders) dan panggilan yang digabung (coalesced)
+                    rate_limiter:
+                      type: object
+                      description: Slot rate limiter client-side (granted, queued, rejected, timeout, cancelled) dan kedalaman antrian per jalur prioritas
+                    retry:
+                      type: object
+                      description: Jumlah retry ke upstream (total dan per service)
+                    circuit_breakers:
+                      type: object
+                      description: State circuit breaker per model (closed, open, half_open)
+                    hedging:
+                      type: object
+                      description: Berapa kali hedge ke model sekunder dikirim (fired) dan menang (won), per service
+                    routing:
+                      type: object
+                      description: Route aktif per service (model, max_tokens, temperature, timeout) beserta jumlah panggilan, error, latensi rata-rata, token, dan estimasi biaya
+                explanation_table:
+                  type: object
+                  description: Counter hit/miss/stale tabel penjelasan hasil pre-generation
+                profession_catalog:
+                  type: object
+                  description: Snapshot katalog profesi di worker ini (pid, versi, jumlah profesi, jumlah profil di tabel top-N, memory_bytes, sumber invalidasi, jumlah load/check)
+                assessment_prefetch:
+                  type: object
+                  description: Job spekulatif pertanyaan IKIGAI (started, ready, waited, inline, failed, in_flight)
+                speculative_explanation:
+                  type: object
+                  description: Penjelasan RIASEC spekulatif di submit assessment (started, used, inline, cancelled, wasted)
+                request_deadline:
+                  type: object
+                  description: Jumlah request ber-deadline, tahap yang gagal cepat per endpoint:tahap, dan pembatalan per endpoint:alasan
+                client_disconnect:
+                  type: object
+                  description: Pemantauan koneksi klien route LLM (watched, disconnected, unsupported, active)
+                jobs:
+                  type: object
+                  description: Antrian job background (submitted, completed, failed, rejected, interrupted, cancelled, pending, running)
     """
     from datetime import datetime
+    from src.services.llm.llm_client import llm_client
+    from src.services.explanation_table import explanation_table
+    from src.models.profession import profession_catalog
+    from src.services.assessment_prefetch import assessment_prefetcher
+    from src.services.job_queue import job_queue
+    from src.services.speculative_explanation import speculative_explainer
+    from src.services import request_deadline
+    from src.web.disconnect import disconnect_watcher
+    # Degraded (bukan down): API tetap melayani, tetapi panggilan ke model tertentu sedang di-fail-fast
+    llm_degraded = llm_client.circuit_breakers.any_open()
     return jsonify({
-        "status": "healthy",
-        "message": "API is running properly",
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "status": "degraded" if llm_degraded else "healthy",
+        "message": "LLM provider is degraded, some requests fail fast" if llm_degraded else "API is running properly",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "llm": llm_client.stats(),
+        "explanation_table": explanation_table.stats(),
+        "profession_catalog": profession_catalog.stats(),
+        "assessment_prefetch": assessment_prefetcher.stats(),
+        "speculative_explanation": speculative_explainer.stats(),
+        "jobs": job_queue.stats(),
+        "request_deadline": request_deadline.stats(),
+        "client_disconnect": disconnect_watcher.stats()
     })
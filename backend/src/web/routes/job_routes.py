@@ -0,0 +1,175 @@
+"""
+Job Routes
+Endpoint polling status dan hasil job background (lihat src/services/job_queue.py).
+
+Job terikat ke pengirimnya lewat token acak di session (`job_owner`); job
+milik session lain dilaporkan tidak ditemukan.
+"""
+
+import hmac
+import secrets
+from flask import Blueprint, jsonify, session
+from src.services.job_queue import job_queue, JobQueueFull, ACTIVE_STATUSES
+
+# Create Blueprint
+jobs_bp = Blueprint('jobs', __name__)
+
+# Saran interval polling (detik) untuk klien
+POLL_INTERVAL_SECONDS = 2
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _serialize(job: dict) -> dict:
+    data = {
+        "job_id": job["_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "created_at": job["created_at"].isoformat() + "Z",
+        "updated_at": job["updated_at"].isoformat() + "Z"
+    }
+    if job["status"] in ("completed", "failed"):
+        data["http_status"] = job.get("http_status")
+        data["result"] = job.get("result")
+    if job.get("cancel_requested") and job["status"] in ACTIVE_STATUSES:
+        data["cancel_requested"] = True
+    return data
+
+
+def _session_owner() -> str:
+    """Token pengirim job untuk session ini (dibuat saat job pertama dikirim)."""
+    if "job_owner" not in session:
+        session["job_owner"] = secrets.token_hex(16)
+    return session["job_owner"]
+
+
+def _owned_job(job_id: str):
+    """Dokumen job jika ada dan dikirim oleh session ini, selain itu None."""
+    job = job_queue.get(job_id)
+    owner = session.get("job_owner")
+    if job is None or not owner or not job.get("owner") or not hmac.compare_digest(job["owner"], owner):
+        return None
+    return job
+
+
+def enqueue_job(kind: str, **params):
+    """
+    Memasukkan job ke antrian dan membentuk respons 202 berisi `job_id`,
+    atau 503 jika antrian penuh.
+    """
+    try:
+        job = job_queue.submit(kind, owner=_session_owner(), **params)
+    except JobQueueFull:
+        response = jsonify({"error": "Server sedang sibuk. Silakan coba lagi beberapa saat lagi."})
+        response.headers["Retry-After"] = str(POLL_INTERVAL_SECONDS * 5)
+        return response, 503
+
+    data = _serialize(job)
+    data["status_url"] = f"/api/jobs/{job['_id']}"
+    response = jsonify(data)
+    response.headers["Location"] = data["status_url"]
+    response.headers["Retry-After"] = str(POLL_INTERVAL_SECONDS)
+    return response, 202
+
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Status dan hasil job background
+    ---
+    tags:
+      - Jobs
+    summary: Mengambil status dan hasil job
+    description: |
+      Poll endpoint ini setelah memanggil endpoint `.../async`
+      (`/api/assessment/submit/async`, `/api/skill-roadmap/async`,
+      `/api/campus-activities/async`). Status: `queued`, `running`,
+      `completed`, `failed`, atau `cancelled`. Setelah selesai, `result` berisi body yang
+      sama dengan endpoint sinkronnya dan `http_status` berisi kode HTTP-nya.
+      Hanya session yang mengirim job yang dapat melihatnya.
+    parameters:
+      - name: job_id
+        in: path
+        required: true
+        schema:
+          type: string
+    responses:
+      200:
+        description: Status job
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                job_id:
+                  type: string
+                  example: "3f2c0c5e8e1a4a7c9b0d6f1e2a3b4c5d"
+                kind:
+                  type: string
+                  example: "skill_roadmap"
+                status:
+                  type: string
+                  enum: [queued, running, completed, failed, cancelled]
+                http_status:
+                  type: integer
+                  example: 200
+                result:
+                  type: object
+                cancel_requested:
+                  type: boolean
+                  description: Pembatalan sudah diminta dan sedang diteruskan ke worker pemegang job
+      404:
+        description: Job tidak ditemukan, sudah kedaluwarsa, atau bukan milik session ini
+    """
+    job = _owned_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job tidak ditemukan atau sudah kedaluwarsa."}), 404
+
+    job_queue.on_complete(job)
+    response = jsonify(_serialize(job))
+    if job["status"] not in FINISHED_STATUSES:
+        response.headers["Retry-After"] = str(POLL_INTERVAL_SECONDS)
+    return response, 200
+
+
+@jobs_bp.route('/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """
+    Membatalkan job background
+    ---
+    tags:
+      - Jobs
+    summary: Membatalkan job yang hasilnya tidak lagi dibutuhkan
+    description: |
+      Dipanggil frontend saat pengguna meninggalkan halaman (misalnya
+      `fetch(url, {method: "DELETE", keepalive: true})`). Job yang masih antri
+      tidak dijalankan dan panggilan LLM job yang sedang berjalan diputus.
+      Job yang sudah selesai dikembalikan apa adanya. Jika job dijalankan
+      proses server lain, pembatalan diteruskan ke proses tersebut (202);
+      poll `GET /api/jobs/<job_id>` sampai statusnya `cancelled`.
+    parameters:
+      - name: job_id
+        in: path
+        required: true
+        schema:
+          type: string
+    responses:
+      200:
+        description: Status job setelah pembatalan
+      202:
+        description: Job dijalankan proses server lain; pembatalan sudah diminta (`cancel_requested`)
+      404:
+        description: Job tidak ditemukan, sudah kedaluwarsa, atau bukan milik session ini
+    """
+    if _owned_job(job_id) is None:
+        return jsonify({"error": "Job tidak ditemukan atau sudah kedaluwarsa."}), 404
+
+    # None: job proses lain sudah selesai (atau kedaluwarsa) sebelum sempat ditandai
+    job = job_queue.cancel(job_id) or job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job tidak ditemukan atau sudah kedaluwarsa."}), 404
+    response = jsonify(_serialize(job))
+    if job["status"] not in FINISHED_STATUSES:
+        response.headers["Retry-After"] = str(POLL_INTERVAL_SECONDS)
+        return response, 202
+    return response, 200
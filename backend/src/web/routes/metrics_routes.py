@@ -0,0 +1,74 @@
+"""
+Metrics Routes
+Endpoint metrik LLM dalam format teks Prometheus untuk di-scrape monitoring.
+"""
+
+from flask import Blueprint, Response
+from src.services.llm.llm_client import llm_client
+from src.services.llm.llm_metrics import render_counter, render_gauge
+from src.services import request_deadline
+from src.models.profession import profession_catalog
+
+# Create Blueprint
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics_bp.route('', methods=['GET'])
+def metrics():
+    """
+    Metrik LLM dalam format Prometheus
+    ---
+    tags:
+      - Info
+    summary: Metrik panggilan LLM per agent dan model
+    description: |
+      Counter dan histogram per `service` (agent) dan `model`:
+      - `llm_requests_total{status}`: panggilan upstream per status akhir (kode HTTP, error, circuit_open)
+      - `llm_retries_total`: jumlah retry
+      - `llm_tokens_total{type}`: prompt/completion token dari field `usage` API
+      - `llm_cost_usd_total`: estimasi biaya berdasarkan tabel harga routing
+      - `llm_cache_requests_total{outcome}`: hasil cache per invoke (hit, miss, coalesced, bypass)
+      - `llm_upstream_latency_seconds`, `llm_prompt_tokens`, `llm_completion_tokens`: histogram
+      - `llm_rate_limit_requests_total{model,lane,outcome}`, `llm_rate_limit_wait_seconds{model,lane}`:
+        hasil dan waktu tunggu antrian rate limiter client-side per jalur prioritas
+      - `llm_rate_limit_queue_depth{lane}`: jumlah panggilan yang sedang menunggu slot
+      - `request_deadline_exceeded_total{endpoint,stage}`: tahap yang gagal cepat karena anggaran waktu request habis
+      - `request_cancelled_total{endpoint,reason}`: request/job yang dibatalkan sebelum selesai (klien terputus, job dibatalkan)
+      - `profession_catalog_memory_bytes{pid}`: memori snapshot katalog profesi di worker yang di-scrape
+    responses:
+      200:
+        description: Metrik dalam format teks Prometheus
+        content:
+          text/plain:
+            schema:
+              type: string
+              example: |
+                # HELP llm_requests_total Panggilan upstream ke LLM per status akhir (kode HTTP, error, circuit_open).
+                # TYPE llm_requests_total counter
+                llm_requests_total{service="Final Analyzer",model="google/gemini-2.5-flash",status="200"} 12
+    """
+    deadline_metrics = render_counter(
+        "request_deadline_exceeded_total",
+        "Tahap (LLM, retry, MongoDB) yang dilewati karena anggaran waktu request habis.",
+        request_deadline.expired_samples()
+    )
+    cancel_metrics = render_counter(
+        "request_cancelled_total",
+        "Request/job yang dibatalkan sebelum selesai; panggilan LLM yang berjalan ikut diputus.",
+        request_deadline.cancelled_samples()
+    )
+    queue_metrics = render_gauge(
+        "llm_rate_limit_queue_depth",
+        "Panggilan LLM yang sedang menunggu slot rate limiter, per jalur prioritas.",
+        [((("lane", lane),), depth) for lane, depth in llm_client.scheduler.queue_depth().items()]
+    )
+    catalog = profession_catalog.stats()
+    catalog_metrics = render_gauge(
+        "profession_catalog_memory_bytes",
+        "Memori snapshot katalog profesi yang dimuat di worker ini.",
+        [((("pid", str(catalog["pid"])),), catalog["memory_bytes"])]
+    )
+    return Response(llm_client.metrics.render() + queue_metrics + deadline_metrics + cancel_metrics + catalog_metrics,
+                    content_type=PROMETHEUS_CONTENT_TYPE)
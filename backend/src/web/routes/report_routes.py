@@ -0,0 +1,211 @@
+"""
+Full Report Routes
+Rute API yang menjalankan keempat agent pasca-hasil (tipe dominan, kekuatan &
+kelemahan, roadmap skill, aktivitas kampus) secara bersamaan dan mengirim
+setiap bagian lewat Server-Sent Events begitu selesai. Laporan yang sama juga
+di-prefetch di background begitu asesmen selesai disimpan.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from src.config import REPORT_SECTION_WORKERS, REPORT_PREFETCH_ENABLED, REPORT_PREFETCH_WORKERS
+from src.database import save_assessment_additional_data, get_assessment_additional_data
+from src.web.sse import sse_event
+from src.web.routes._validation import read_riasec_jobs_request
+from src.services.request_deadline import cancel_request
+from src.services.llm import llm_priority
+from src.web.routes.dominant_type_routes import build_dominant_type_explanation
+from src.web.routes.strengths_weaknesses_routes import build_strengths_weaknesses_analysis
+from src.web.routes.skill_roadmap_routes import build_skill_roadmap
+from src.web.routes.campus_activities_routes import build_campus_activities_recommendations
+
+# Create Blueprint
+report_bp = Blueprint('report', __name__)
+
+REPORT_SECTIONS = ("dominant_type", "strengths_weaknesses", "skill_roadmap", "campus_activities")
+
+# Pool bersama untuk semua request report; saat klien terputus, bagian yang belum
+# mulai tidak dijalankan dan panggilan LLM yang sedang berjalan dibatalkan
+_section_pool = ThreadPoolExecutor(max_workers=REPORT_SECTION_WORKERS, thread_name_prefix="report-section")
+# Pool terpisah untuk prefetch: job prefetch menunggu bagian di _section_pool,
+# jadi tidak boleh memakai pool yang sama
+_prefetch_pool = ThreadPoolExecutor(max_workers=REPORT_PREFETCH_WORKERS, thread_name_prefix="report-prefetch")
+
+
+def _run_sections(riasec_code, target_jobs):
+    """
+    Menjalankan keempat bagian laporan secara bersamaan.
+
+    Yields:
+        tuple: (nama bagian, body respons dict, kode HTTP) sesuai urutan selesai
+    """
+    def _submit(fn, *args):
+        # Setiap bagian berjalan di salinan context pemanggil (membawa deadline request)
+        return _section_pool.submit(contextvars.copy_context().run, fn, *args)
+
+    futures = {
+        _submit(build_dominant_type_explanation, riasec_code): "dominant_type",
+        _submit(build_strengths_weaknesses_analysis, riasec_code): "strengths_weaknesses",
+        _submit(build_skill_roadmap, riasec_code, target_jobs): "skill_roadmap",
+        _submit(build_campus_activities_recommendations, riasec_code, target_jobs): "campus_activities"
+    }
+    try:
+        for future in as_completed(futures):
+            section = futures[future]
+            try:
+                data, status = future.result()
+            except Exception as e:
+                print(f"Error in report section {section}: {str(e)}")
+                data, status = {"error": "Internal server error occurred"}, 500
+            yield section, data, status
+    finally:
+        # Pemanggil berhenti membaca (klien terputus): bagian yang masih antri tidak dijalankan
+        for future in futures:
+            future.cancel()
+
+
+def report_inputs(riasec_code, target_jobs) -> dict:
+    """Input yang menentukan isi laporan; disimpan bersama laporan untuk dicocokkan saat dipakai ulang."""
+    return {"riasec_code": riasec_code, "target_jobs": list(target_jobs)}
+
+
+def _prefetch(user_hash, riasec_code, target_jobs):
+    report = {}
+    # Prefetch berjalan di jalur prioritas background; request interaktif didahulukan
+    with llm_priority("background"):
+        for section, data, status in _run_sections(riasec_code, target_jobs):
+            if status != 200:
+                print(f"Report prefetch for hash {user_hash} stopped: section {section} failed")
+                return
+            report[section] = data
+    save_assessment_additional_data(user_hash, report, report_inputs(riasec_code, target_jobs))
+
+
+def prefetch_report(user_hash, riasec_code, target_jobs):
+    """
+    Menjadwalkan pembuatan laporan lengkap di background lalu menyimpannya
+    sebagai `additional_data` asesmen, sehingga `/result/<hash>` langsung
+    menyajikannya tanpa panggilan LLM baru. Tidak memblokir.
+    """
+    if not REPORT_PREFETCH_ENABLED or not user_hash or not target_jobs:
+        return
+    _prefetch_pool.submit(_prefetch, user_hash, riasec_code, list(target_jobs))
+
+
+def _read_report_request():
+    """
+    Membaca dan memvalidasi field `riasec_code`, `target_jobs`, dan `hash` (opsional) dari body JSON.
+
+    Returns:
+        tuple: ((riasec_code, target_jobs, hash), None) jika valid, atau (None, (response, status)) jika tidak
+    """
+    request_data, error = read_riasec_jobs_request()
+    if error:
+        return None, error
+    riasec_code, target_jobs = request_data
+
+    user_hash = request.get_json().get('hash')
+    if user_hash is not None and not isinstance(user_hash, str):
+        return None, (jsonify({"error": "Field 'hash' must be a string"}), 400)
+
+    return (riasec_code, target_jobs, user_hash), None
+
+
+@report_bp.route('', methods=['POST'])
+def generate_report():
+    """
+    Menghasilkan laporan lengkap pasca-hasil secara streaming (Server-Sent Events)
+    ---
+    tags:
+      - Report
+    summary: Menjalankan keempat agent pasca-hasil sekaligus
+    description: |
+      Pengganti empat POST terpisah (`/api/dominant-type/`, `/api/strengths-weaknesses/`,
+      `/api/skill-roadmap/`, `/api/campus-activities/`). Keempat bagian dijalankan
+      bersamaan dan dikirim sebagai event SSE sesuai urutan selesainya:
+      - `section`: {"section": nama, "status": kode HTTP, "data": body yang sama dengan endpoint terpisahnya}
+      - `done`: {"report": {nama: data}, "saved": bool}
+
+      Nama bagian sama dengan key `additional_data` di dokumen asesmen:
+      `dominant_type`, `strengths_weaknesses`, `skill_roadmap`, `campus_activities`.
+      Jika `hash` diberikan dan semua bagian berhasil, laporan disimpan sebagai
+      `additional_data` asesmen tersebut. Laporan yang sudah tersimpan (misalnya
+      hasil prefetch saat asesmen selesai) untuk `riasec_code` dan `target_jobs`
+      yang sama langsung dikirim tanpa panggilan LLM.
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            required:
+              - riasec_code
+              - target_jobs
+            properties:
+              riasec_code:
+                type: string
+                example: "RIA"
+              target_jobs:
+                type: array
+                items:
+                  type: string
+                example: ["Software Engineer", "Data Scientist"]
+              hash:
+                type: string
+                description: Hash asesmen untuk menyimpan laporan (opsional)
+    responses:
+      200:
+        description: Stream event SSE
+        content:
+          text/event-stream:
+            schema:
+              type: string
+              example: |
+                event: section
+                data: {"section": "dominant_type", "status": 200, "data": {"explanation": "...", "dominant_type": "RIA"}}
+
+                event: done
+                data: {"report": {"dominant_type": {...}, "strengths_weaknesses": {...}, "skill_roadmap": {...}, "campus_activities": {...}}, "saved": true}
+      400:
+        description: Request tidak valid (validasi sama dengan endpoint roadmap skill)
+    """
+    request_data, error = _read_report_request()
+    if error:
+        return error
+    riasec_code, target_jobs, user_hash = request_data
+
+    # Laporan yang sudah di-prefetch saat asesmen selesai disajikan langsung,
+    # hanya jika dibuat untuk riasec_code dan target_jobs yang sama
+    inputs = report_inputs(riasec_code, target_jobs)
+    stored = get_assessment_additional_data(user_hash, inputs) if user_hash else None
+    from_store = bool(stored) and all(section in stored for section in REPORT_SECTIONS)
+    if from_store:
+        sections = ((section, stored[section], 200) for section in REPORT_SECTIONS)
+    else:
+        sections = _run_sections(riasec_code, target_jobs)
+
+    def _events():
+        report = {}
+        failed = False
+        try:
+            for section, data, status in sections:
+                report[section] = data
+                failed = failed or status != 200
+                yield sse_event("section", {"section": section, "status": status, "data": data})
+        except GeneratorExit:
+            # Klien sudah pergi: bagian yang masih berjalan dibatalkan
+            cancel_request("client_disconnected")
+            raise
+
+        # Laporan yang belum lengkap tidak disimpan agar frontend mencoba lagi
+        saved = bool(user_hash) and not failed
+        if saved and not from_store:
+            save_assessment_additional_data(user_hash, report, inputs)
+        yield sse_event("done", {"report": report, "saved": saved})
+
+    return Response(
+        stream_with_context(_events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from src.models.riasec import RiasecTest
+from src.services.assessment_prefetch import assessment_prefetcher
 import logging
 
 # Set up logging
@@ -166,6 +167,9 @@ def submit_riasec_answers():
     session['profile'] = profile
     session['normalized_scores'] = normalized_scores
 
+    # Mulai pemilihan profesi + pertanyaan IKIGAI selagi pengguna membaca hasil profilnya
+    assessment_prefetcher.start(profile)
+
     return jsonify({
         "profile": profile,
         "normalized_scores": normalized_scores
@@ -3,14 +3,44 @@ Skill Development Roadmap Routes
 Rute API untuk menghasilkan roadmap pengembangan skill berdasarkan RIASEC dan target pekerjaan.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify
 import json
 from src.services.llm import generate_skill_development_roadmap
+from src.services.job_queue import job_queue
+from src.web.routes.job_routes import enqueue_job
+from src.web.routes._validation import read_riasec_jobs_request
 
 # Create Blueprint
 skill_roadmap_bp = Blueprint('skill_roadmap', __name__)
 
 
+def build_skill_roadmap(riasec_code, target_jobs):
+    """
+    Menghasilkan roadmap lewat LLM. Dipakai oleh endpoint sinkron,
+    job background, dan `/api/report`.
+
+    Returns:
+        tuple: (body respons dict, kode HTTP)
+    """
+    # Generate roadmap using LLM service
+    roadmap_result = generate_skill_development_roadmap(riasec_code, target_jobs)
+    
+    # Parse the result to check for errors
+    try:
+        parsed_result = json.loads(roadmap_result)
+        if "error" in parsed_result:
+            return parsed_result, 500
+        
+        # Return successful response
+        return parsed_result, 200
+        
+    except json.JSONDecodeError:
+        return {"error": "Invalid response format from roadmap service"}, 500
+
+
+job_queue.register("skill_roadmap", build_skill_roadmap)
+
+
 @skill_roadmap_bp.route('/', methods=['POST'])
 def generate_roadmap():
     """
@@ -157,80 +187,60 @@ def generate_roadmap():
                   example: "Internal server error occurred"
     """
     try:
-        # Validate request content type
-        if not request.is_json:
-            return jsonify({"error": "Content-Type must be application/json"}), 400
-        
-        # Get request data
-        data = request.get_json()
+        request_data, error = read_riasec_jobs_request()
+        if error:
+            return error
         
-        # Validate required fields
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
+        parsed_result, status = build_skill_roadmap(*request_data)
+        return jsonify(parsed_result), status
         
-        if 'riasec_code' not in data:
-            return jsonify({"error": "Field 'riasec_code' is required"}), 400
-            
-        if 'target_jobs' not in data:
-            return jsonify({"error": "Field 'target_jobs' is required"}), 400
-        
-        riasec_code = data['riasec_code']
-        target_jobs = data['target_jobs']
-        
-        # Validate riasec_code value
-        if not isinstance(riasec_code, str):
-            return jsonify({"error": "Field 'riasec_code' must be a string"}), 400
-        
-        # Strip whitespace and validate against valid letters
-        riasec_code = riasec_code.strip().upper()
-        valid_letters = set("RIASEC")
-        
-        if not riasec_code:
-            return jsonify({"error": "RIASEC code cannot be empty"}), 400
-        
-        if not all(letter in valid_letters for letter in riasec_code):
-            return jsonify({"error": "Invalid RIASEC code. Must contain only letters R, I, A, S, E, C"}), 400
-        
-        if len(riasec_code) > 6:
-            return jsonify({"error": "RIASEC code cannot be longer than 6 characters"}), 400
-        
-        # Validate target_jobs
-        if not isinstance(target_jobs, list):
-            return jsonify({"error": "Target jobs must be a list"}), 400
-            
-        if not target_jobs:
-            return jsonify({"error": "Target jobs list cannot be empty"}), 400
-            
-        if len(target_jobs) > 10:
-            return jsonify({"error": "Too many target jobs. Maximum 10 jobs allowed"}), 400
-        
-        # Filter and validate job names
-        filtered_jobs = []
-        for job in target_jobs:
-            if not isinstance(job, str):
-                return jsonify({"error": "All job names must be strings"}), 400
-            job = job.strip()
-            if job:  # Only add non-empty jobs
-                filtered_jobs.append(job)
-        
-        if not filtered_jobs:
-            return jsonify({"error": "Target jobs list cannot be empty after filtering"}), 400
-        
-        # Generate roadmap using LLM service
-        roadmap_result = generate_skill_development_roadmap(riasec_code, filtered_jobs)
+    except Exception as e:
+        print(f"Error in generate_roadmap endpoint: {str(e)}")
+        return jsonify({"error": "Internal server error occurred"}), 500
+
+
+@skill_roadmap_bp.route('/async', methods=['POST'])
+def generate_roadmap_async():
+    """
+    Menghasilkan roadmap pengembangan skill secara asynchronous
+    ---
+    tags:
+      - Skill Development Roadmap
+    summary: Menghasilkan roadmap pengembangan skill secara asynchronous
+    description: |
+      Versi asynchronous dari `POST /api/skill-roadmap/`. Body request sama;
+      respons langsung berisi `job_id` dan hasilnya diambil dengan polling
+      `GET /api/jobs/{job_id}` (field `result` sama dengan respons endpoint sinkron).
+    responses:
+      202:
+        description: Job diterima dan masuk antrian
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                job_id:
+                  type: string
+                  example: "3f2c0c5e8e1a4a7c9b0d6f1e2a3b4c5d"
+                status:
+                  type: string
+                  example: "queued"
+                status_url:
+                  type: string
+                  example: "/api/jobs/3f2c0c5e8e1a4a7c9b0d6f1e2a3b4c5d"
+      400:
+        description: Request tidak valid (validasi sama dengan endpoint sinkron)
+      503:
+        description: Antrian job penuh, coba lagi setelah `Retry-After` detik
+    """
+    try:
+        request_data, error = read_riasec_jobs_request()
+        if error:
+            return error
         
-        # Parse the result to check for errors
-        try:
-            parsed_result = json.loads(roadmap_result)
-            if "error" in parsed_result:
-                return jsonify(parsed_result), 500
-            
-            # Return successful response
-            return jsonify(parsed_result), 200
-            
-        except json.JSONDecodeError:
-            return jsonify({"error": "Invalid response format from roadmap service"}), 500
+        riasec_code, target_jobs = request_data
+        return enqueue_job("skill_roadmap", riasec_code=riasec_code, target_jobs=target_jobs)
         
     except Exception as e:
-        print(f"Error in generate_roadmap endpoint: {str(e)}")
+        print(f"Error in generate_roadmap_async endpoint: {str(e)}")
         return jsonify({"error": "Internal server error occurred"}), 500
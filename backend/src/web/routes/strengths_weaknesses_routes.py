@@ -5,12 +5,82 @@ Rute API untuk menganalisis kekuatan dan area pengembangan berdasarkan RIASEC.
 
 from flask import Blueprint, request, jsonify
 import json
-from src.services.llm import generate_strengths_weaknesses_analysis
+from src.services.explanation_table import explanation_table
+from src.services.llm import stream_strengths_weaknesses_analysis
+from src.services.llm.llm_client import llm_client
+from src.services.llm.strengths_weaknesses_analyzer import build_strengths_weaknesses_prompt
+from src.web.sse import stream_llm_response
 
 # Create Blueprint
 strengths_weaknesses_bp = Blueprint('strengths_weaknesses', __name__)
 
 
+def _read_riasec_code():
+    """
+    Membaca dan memvalidasi field `riasec_code` dari body JSON.
+
+    Returns:
+        tuple: (riasec_code, None) jika valid, atau (None, (response, status)) jika tidak
+    """
+    # Validate request content type
+    if not request.is_json:
+        return None, (jsonify({"error": "Content-Type must be application/json"}), 400)
+    
+    # Get request data
+    data = request.get_json()
+    
+    # Validate required fields
+    if not data:
+        return None, (jsonify({"error": "Request body is required"}), 400)
+    
+    if 'riasec_code' not in data:
+        return None, (jsonify({"error": "Field 'riasec_code' is required"}), 400)
+    
+    riasec_code = data['riasec_code']
+    
+    # Validate riasec_code value
+    if not isinstance(riasec_code, str):
+        return None, (jsonify({"error": "Field 'riasec_code' must be a string"}), 400)
+    
+    # Strip whitespace and validate against valid letters
+    riasec_code = riasec_code.strip().upper()
+    valid_letters = set("RIASEC")
+    
+    if not riasec_code:
+        return None, (jsonify({"error": "RIASEC code cannot be empty"}), 400)
+    
+    if not all(letter in valid_letters for letter in riasec_code):
+        return None, (jsonify({"error": "Invalid RIASEC code. Must contain only letters R, I, A, S, E, C"}), 400)
+    
+    if len(riasec_code) > 6:
+        return None, (jsonify({"error": "RIASEC code cannot be longer than 6 characters"}), 400)
+    
+    return riasec_code, None
+
+
+def build_strengths_weaknesses_analysis(riasec_code):
+    """
+    Menghasilkan analisis kekuatan dan kelemahan. Dipakai oleh endpoint ini dan `/api/report`.
+
+    Returns:
+        tuple: (body respons dict, kode HTTP)
+    """
+    # Serve from the pre-generated table, falling back to the LLM service on a miss
+    analysis_result = explanation_table.get_or_generate("strengths_weaknesses", riasec_code)
+    
+    # Parse the result to check for errors
+    try:
+        parsed_result = json.loads(analysis_result)
+        if "error" in parsed_result:
+            return parsed_result, 500
+        
+        # Return successful response
+        return parsed_result, 200
+        
+    except json.JSONDecodeError:
+        return {"error": "Invalid response format from analysis service"}, 500
+
+
 @strengths_weaknesses_bp.route('/', methods=['POST'])
 def analyze_strengths_weaknesses():
     """
@@ -124,54 +194,74 @@ def analyze_strengths_weaknesses():
                       value: "Internal server error occurred"
     """
     try:
-        # Validate request content type
-        if not request.is_json:
-            return jsonify({"error": "Content-Type must be application/json"}), 400
-        
-        # Get request data
-        data = request.get_json()
-        
-        # Validate required fields
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
-        
-        if 'riasec_code' not in data:
-            return jsonify({"error": "Field 'riasec_code' is required"}), 400
-        
-        riasec_code = data['riasec_code']
-        
-        # Validate riasec_code value
-        if not isinstance(riasec_code, str):
-            return jsonify({"error": "Field 'riasec_code' must be a string"}), 400
-        
-        # Strip whitespace and validate against valid letters
-        riasec_code = riasec_code.strip().upper()
-        valid_letters = set("RIASEC")
-        
-        if not riasec_code:
-            return jsonify({"error": "RIASEC code cannot be empty"}), 400
-        
-        if not all(letter in valid_letters for letter in riasec_code):
-            return jsonify({"error": "Invalid RIASEC code. Must contain only letters R, I, A, S, E, C"}), 400
-        
-        if len(riasec_code) > 6:
-            return jsonify({"error": "RIASEC code cannot be longer than 6 characters"}), 400
-        
-        # Generate analysis using LLM service
-        analysis_result = generate_strengths_weaknesses_analysis(riasec_code)
-        
-        # Parse the result to check for errors
-        try:
-            parsed_result = json.loads(analysis_result)
-            if "error" in parsed_result:
-                return jsonify(parsed_result), 500
-            
-            # Return successful response
-            return jsonify(parsed_result), 200
-            
-        except json.JSONDecodeError:
-            return jsonify({"error": "Invalid response format from analysis service"}), 500
+        riasec_code, error = _read_riasec_code()
+        if error:
+            return error
+
+        parsed_result, status = build_strengths_weaknesses_analysis(riasec_code)
+        return jsonify(parsed_result), status
         
     except Exception as e:
         print(f"Error in analyze_strengths_weaknesses endpoint: {str(e)}")
         return jsonify({"error": "Internal server error occurred"}), 500
+
+
+@strengths_weaknesses_bp.route('/stream', methods=['POST'])
+def stream_strengths_weaknesses():
+    """
+    Menganalisis kekuatan dan area pengembangan secara streaming (Server-Sent Events)
+    ---
+    tags:
+      - Strengths & Weaknesses
+    summary: Analisis kekuatan dan area pengembangan via SSE
+    description: |
+      Varian streaming dari `POST /api/strengths-weaknesses/`. Potongan mentah JSON
+      analisis diteruskan begitu diterima dari LLM; hasil yang sudah diparsing
+      dikirim di event terakhir.
+
+      Event yang dikirim:
+      - `delta`: `{"text": "..."}` potongan mentah output LLM
+      - `done`: objek analisis `{"riasec_code", "strengths", "weaknesses"}` (sama dengan respons non-streaming)
+      - `error`: `{"error": "..."}` (pesan sama dengan respons non-streaming)
+
+      Analisis yang sudah dipregenerate atau tersimpan di cache dikirim sebagai satu event `delta`.
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            required:
+              - riasec_code
+            properties:
+              riasec_code:
+                type: string
+                pattern: '^[RIASEC]{1,6}$'
+                example: "RIA"
+    responses:
+      200:
+        description: Stream event SSE
+        content:
+          text/event-stream:
+            schema:
+              type: string
+      400:
+        description: Request tidak valid (format error sama dengan endpoint non-streaming)
+    """
+    riasec_code, error = _read_riasec_code()
+    if error:
+        return error
+
+    pregenerated = explanation_table.lookup("strengths_weaknesses", riasec_code)
+    if pregenerated is not None:
+        chunks, cache_key = [pregenerated], None
+    else:
+        chunks = stream_strengths_weaknesses_analysis(riasec_code)
+        cache_key = llm_client.cache_key_for(
+            build_strengths_weaknesses_prompt(riasec_code), service_name="Strengths & Weaknesses Analyzer"
+        )
+
+    def _finalize(raw_output: str) -> dict:
+        return llm_client.parse_json_response(raw_output, cache_key=cache_key)
+
+    return stream_llm_response(chunks, _finalize)
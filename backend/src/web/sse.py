@@ -0,0 +1,71 @@
+# src/web/sse.py
+"""
+Helper Server-Sent Events untuk route yang meneruskan token LLM secara streaming.
+"""
+
+import json
+from flask import Response, stream_with_context
+from src.services.request_deadline import cancel_request
+
+STREAM_ERROR = {"error": "Failed to communicate with the LLM service."}
+
+
+def sse_event(event: str, data) -> str:
+    """Memformat satu event SSE dengan payload JSON."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _error_payload(text: str):
+    """Mengembalikan dict error jika `text` adalah JSON error dari LLMClient, selain itu None."""
+    stripped = text.strip()
+    if not stripped.startswith("{"):
+        return None
+    try:
+        parsed = json.loads(stripped)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) and "error" in parsed else None
+
+
+def stream_llm_response(chunks, finalize) -> Response:
+    """
+    Mengubah generator potongan teks LLM menjadi response SSE.
+
+    Event yang dikirim:
+    - `delta`: {"text": potongan} untuk setiap potongan yang diterima
+    - `done`: hasil akhir dari `finalize(teks_lengkap)` (bentuknya sama dengan route non-streaming)
+    - `error`: {"error": ...} jika LLM gagal (format sama dengan route non-streaming)
+
+    Args:
+        chunks: Generator potongan teks (misalnya dari `llm_client.invoke_stream`)
+        finalize: Fungsi teks lengkap -> dict hasil; dict dengan kunci "error" dikirim sebagai event error
+    """
+    def _events():
+        parts = []
+        try:
+            for chunk in chunks:
+                # Kegagalan sebelum token pertama datang sebagai satu potongan JSON error
+                if not parts:
+                    error = _error_payload(chunk)
+                    if error is not None:
+                        yield sse_event("error", error)
+                        return
+                parts.append(chunk)
+                yield sse_event("delta", {"text": chunk})
+        except GeneratorExit:
+            # Server menutup stream karena klien sudah pergi: putus koneksi upstream
+            cancel_request("client_disconnected")
+            raise
+        except Exception as e:
+            print(f"Error while streaming LLM response: {e}")
+            yield sse_event("error", STREAM_ERROR)
+            return
+
+        result = finalize("".join(parts))
+        yield sse_event("error" if "error" in result else "done", result)
+
+    return Response(
+        stream_with_context(_events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )